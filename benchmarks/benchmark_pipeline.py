@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de extremo a extremo del pipeline de consulta
+
+Ejecuta ConsultaProcesosOrchestrator completo (leer Excel -> consultar ->
+procesar -> escribir reportes) contra el servidor simulado de la API y
+guarda en JSON radicados/s, peticiones/s, percentiles de latencia por
+radicado, memoria máxima y tiempo por etapa. Cada tamaño corre en un
+proceso aparte para que la memoria máxima sea la de ese tamaño.
+
+Uso:
+    python benchmarks/benchmark_pipeline.py --tamanos 1000,10000 --concurrencia 8
+    python benchmarks/benchmark_pipeline.py --comparar benchmarks/resultados/anterior.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ / "src"))
+sys.path.insert(0, str(RAIZ))
+
+import pandas as pd
+
+from config import APIConfig, FileConfig, JournalConfig
+from fake_server import EscenarioSimulado, ServidorSimulado
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+DIRECTORIO_RESULTADOS = Path(__file__).resolve().parent / "resultados"
+
+
+def percentil(valores: List[float], p: float) -> Optional[float]:
+    """Percentil por rango más cercano (None si no hay valores)"""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    return ordenados[max(1, math.ceil(p / 100 * len(ordenados))) - 1]
+
+
+def memoria_maxima_mb() -> Optional[float]:
+    """Memoria residente máxima del proceso en MB (None si no se puede medir)"""
+    if resource is not None:
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa KB y macOS bytes
+        return round(maximo / (1024 * 1024) if sys.platform == "darwin" else maximo / 1024, 1)
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except (ImportError, AttributeError):
+        return None
+
+
+def commit_actual() -> Optional[str]:
+    """Hash del commit actual (None fuera de un repositorio git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Cronometro:
+    """Acumula el tiempo de las llamadas a un método, de forma segura entre hilos"""
+    
+    def __init__(self):
+        self.total = 0.0
+        self.duraciones: List[float] = []
+        self._lock = threading.Lock()
+    
+    def envolver(self, funcion):
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                duracion = time.perf_counter() - inicio
+                with self._lock:
+                    self.total += duracion
+                    self.duraciones.append(duracion)
+        return medida
+
+
+def ejecutar_tamano(tamano: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Ejecuta el pipeline completo con un número de radicados
+    
+    Args:
+        tamano: Radicados en el Excel de entrada
+        args: Opciones del benchmark
+        
+    Returns:
+        Métricas de la ejecución
+    """
+    from main import ConsultaProcesosOrchestrator
+    
+    escenario = EscenarioSimulado(latencia_mediana=args.latencia, tasa_429=args.tasa_429,
+                                  tasa_500=args.tasa_500, proporcion_privados=args.privados,
+                                  proporcion_no_encontrados=args.no_encontrados, semilla=args.semilla)
+    
+    with tempfile.TemporaryDirectory(prefix="benchmark_consulta_") as directorio, \
+            ServidorSimulado(escenario) as servidor:
+        directorio = Path(directorio)
+        excel = directorio / "data" / "PROCESOS.xlsx"
+        excel.parent.mkdir()
+        radicados = [f"11001310300{numero:012d}" for numero in range(tamano)]
+        pd.DataFrame({"RADICADO": radicados}).to_excel(excel, index=False)
+        
+        FileConfig.PROJECT_ROOT = directorio
+        FileConfig.EXCEL_INPUT_FILE = excel
+        FileConfig.OUTPUT_DIR = directorio / "output"
+        FileConfig.BACKUP_DIR = directorio / "backups"
+        FileConfig.LOG_DIR = directorio / "logs"
+        JournalConfig.DIRECTORIO = directorio / "journal"
+        FileConfig.MAX_FILE_SIZE_MB = 1024
+        APIConfig.BASE_URL = servidor.base_url
+        APIConfig.MIN_REQUEST_INTERVAL = 0
+        APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE = args.rpm or APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
+        
+        orquestador = ConsultaProcesosOrchestrator(usar_rate_limiting=bool(args.rpm),
+                                                   concurrencia=args.concurrencia, confirmar=False)
+        
+        # Las etapas corren a la vez: cada tiempo es la suma de lo que ocuparon sus hilos
+        etapas = {nombre: Cronometro() for nombre in ("lectura", "pipeline", "procesamiento", "escritura")}
+        por_radicado = Cronometro()
+        orquestador.leer_radicados = etapas["lectura"].envolver(orquestador.leer_radicados)
+        orquestador.consultar_procesos = etapas["pipeline"].envolver(orquestador.consultar_procesos)
+        orquestador._escribir_resultado = etapas["escritura"].envolver(orquestador._escribir_resultado)
+        orquestador.processor.procesar_datos_proceso = etapas["procesamiento"].envolver(
+            orquestador.processor.procesar_datos_proceso)
+        
+        inicializar = orquestador.inicializar_cliente_api
+        
+        def inicializar_con_medicion():
+            inicializar()
+            cliente = getattr(orquestador.api_client, 'cliente', orquestador.api_client)
+            cliente.consultar_proceso_completo = por_radicado.envolver(cliente.consultar_proceso_completo)
+        
+        orquestador.inicializar_cliente_api = inicializar_con_medicion
+        
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            exito = orquestador.ejecutar_consulta_completa()
+        duracion = time.perf_counter() - inicio
+    
+    estadisticas = orquestador.processor.estadisticas
+    peticiones = sum(servidor.peticiones.values())
+    tiempos_etapa = {nombre: round(cronometro.total, 3) for nombre, cronometro in etapas.items()}
+    tiempos_etapa["consulta"] = round(por_radicado.total, 3)
+    consulta = etapas["pipeline"].total or duracion
+    
+    return {
+        "radicados": tamano,
+        "exito": exito,
+        "duracion_total_s": round(duracion, 3),
+        "radicados_por_segundo": round(tamano / duracion, 2),
+        "peticiones": peticiones,
+        "peticiones_por_segundo": round(peticiones / consulta, 2),
+        "errores_inyectados": servidor.errores_inyectados,
+        "latencia_radicado_s": {
+            f"p{p}": round(percentil(por_radicado.duraciones, p) or 0.0, 4) for p in (50, 95, 99)
+        },
+        "memoria_maxima_mb": memoria_maxima_mb(),
+        "etapas_s": tiempos_etapa,
+        "estados": {
+            "exitosos": estadisticas.exitosos,
+            "privados": estadisticas.privados,
+            "no_encontrados": estadisticas.no_encontrados,
+            "fallidos": estadisticas.fallidos,
+        },
+    }
+
+
+def ejecutar_en_subproceso(tamano: int, argv: List[str]) -> Dict[str, Any]:
+    """Ejecuta un tamaño en un proceso aparte y devuelve sus métricas"""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as archivo:
+        salida = Path(archivo.name)
+    try:
+        subprocess.run([sys.executable, __file__, *argv, "--tamano-unico", str(tamano),
+                        "--salida-tamano", str(salida)], check=True)
+        return json.loads(salida.read_text(encoding="utf-8"))
+    finally:
+        salida.unlink(missing_ok=True)
+
+
+def comparar(actual: Dict[str, Any], anterior: Dict[str, Any]):
+    """Imprime la variación de las métricas principales frente a una ejecución anterior"""
+    previos = {resultado["radicados"]: resultado for resultado in anterior.get("resultados", [])}
+    print(f"\nComparación con {anterior.get('commit')} ({anterior.get('fecha')}):")
+    for resultado in actual["resultados"]:
+        previo = previos.get(resultado["radicados"])
+        if not previo:
+            continue
+        for metrica in ("radicados_por_segundo", "peticiones_por_segundo", "memoria_maxima_mb"):
+            antes, ahora = previo.get(metrica), resultado.get(metrica)
+            if antes and ahora:
+                print(f"  {resultado['radicados']:>7} {metrica}: {antes} -> {ahora} "
+                      f"({(ahora - antes) / antes * 100:+.1f}%)")
+        antes, ahora = previo["latencia_radicado_s"]["p95"], resultado["latencia_radicado_s"]["p95"]
+        if antes:
+            print(f"  {resultado['radicados']:>7} latencia p95: {antes}s -> {ahora}s "
+                  f"({(ahora - antes) / antes * 100:+.1f}%)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline contra la API simulada")
+    parser.add_argument("--tamanos", default="1000,10000,100000", help="Radicados por ejecución, separados por coma")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--rpm", type=int, default=0, help="Rate limit en peticiones/min (0 = sin límite)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latencia mediana simulada (s)")
+    parser.add_argument("--tasa-429", type=float, default=0.0)
+    parser.add_argument("--tasa-500", type=float, default=0.0)
+    parser.add_argument("--privados", type=float, default=0.05)
+    parser.add_argument("--no-encontrados", type=float, default=0.05)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", type=Path, help="Archivo JSON de resultados "
+                                                    "(default: benchmarks/resultados/<commit>_<fecha>.json)")
+    parser.add_argument("--comparar", type=Path, help="Resultados anteriores con los que comparar")
+    parser.add_argument("--tamano-unico", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--salida-tamano", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.tamano_unico:
+        resultado = ejecutar_tamano(args.tamano_unico, args)
+        args.salida_tamano.write_text(json.dumps(resultado), encoding="utf-8")
+        return 0
+    
+    argv = sys.argv[1:]
+    resultados = []
+    for tamano in (int(valor) for valor in args.tamanos.split(",") if valor.strip()):
+        print(f"Ejecutando {tamano} radicados...", flush=True)
+        resultado = ejecutar_en_subproceso(tamano, argv)
+        print(f"  {resultado['radicados_por_segundo']} radicados/s, "
+              f"{resultado['peticiones_por_segundo']} peticiones/s, "
+              f"p95 {resultado['latencia_radicado_s']['p95']}s, "
+              f"memoria {resultado['memoria_maxima_mb']} MB, etapas {resultado['etapas_s']}")
+        resultados.append(resultado)
+    
+    commit = commit_actual()
+    informe = {
+        "commit": commit,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": {clave: valor for clave, valor in vars(args).items()
+                       if clave not in ("salida", "comparar", "tamano_unico", "salida_tamano")},
+        "resultados": resultados,
+    }
+    
+    salida = args.salida or DIRECTORIO_RESULTADOS / f"{commit or 'sin_commit'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados guardados en {salida}")
+    
+    if args.comparar:
+        comparar(informe, json.loads(args.comparar.read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
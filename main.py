@@ -12,20 +12,30 @@ Este script orquesta todo el proceso de consulta:
 """
 
 import sys
+import json
 import time
 import logging
+import sqlite3
+import tempfile
+import threading
+from dataclasses import asdict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
 # Agregar src al path para imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 # Imports locales (ahora desde src/)
 try:
-    from config import APIConfig, FileConfig, ProcessConfig, UIConfig, validate_config
-    from api_client import RamaJudicialClient, RateLimitedClient
-    from data_processor import ProcesosProcessor, ProcesoInfo
-    from file_manager import FileManager, BackupManager, LogFileManager, verificar_espacio_disco
+    from config import (APIConfig, CacheConfig, FileConfig, JournalConfig, ProcessConfig, StateConfig, UIConfig,
+                        validate_config)
+    from api_client import RamaJudicialClient, RateLimitedClient, CircuitoAbiertoError
+    from data_processor import EstadisticasProcesamiento, ProcesosProcessor, ProcesoInfo
+    from file_manager import EscritorExcel, FileManager, BackupManager, LogFileManager, verificar_espacio_disco
+    from pipeline import Etapa, Pipeline, Reintento
+    from priority import PriorizadorRadicados
+    from run_journal import RunJournal, limpiar_journals_antiguos, listar_ejecuciones, ultimo_journal
+    from state_store import ProcessStateStore
 except ImportError as e:
     print("❌ Error importando módulos:")
     print(f"   {e}")
@@ -41,18 +51,112 @@ except ImportError as e:
 logger = logging.getLogger(__name__)
 
 
+class SalidaOrdenada:
+    """
+    Filas del Excel de resultados en el orden de la entrada
+    
+    Recibe un resultado por radicado único en cualquier orden (el de
+    consulta) y lo guarda en un SQLite temporal, así que la memoria no crece
+    con el tamaño del lote ni con los resultados que llegan antes que uno
+    pendiente. Al cerrar escribe el Excel en el orden de la entrada,
+    copiando el resultado de los repetidos a cada una de sus filas.
+    """
+    
+    def __init__(self, radicados: List[str], escritor: EscritorExcel, estadisticas: EstadisticasProcesamiento):
+        """
+        Args:
+            radicados: Radicados de la entrada, con repetidos
+            escritor: Excel de resultados
+            estadisticas: Estadísticas a actualizar con cada fila
+        """
+        self.radicados = radicados
+        self.escritor = escritor
+        self.estadisticas = estadisticas
+        self.departamentos: Dict[str, int] = {}
+        self.recibidos = 0
+        self._directorio = tempfile.TemporaryDirectory(prefix="consulta_procesos_salida_")
+        self._conexion = sqlite3.connect(str(Path(self._directorio.name) / "resultados.sqlite3"))
+        self._conexion.execute("CREATE TABLE resultados (radicado TEXT PRIMARY KEY, proceso TEXT NOT NULL)")
+    
+    @property
+    def filas(self) -> int:
+        """Filas escritas"""
+        return self.escritor.filas
+    
+    def agregar(self, proceso: ProcesoInfo):
+        """
+        Guarda un resultado hasta escribir el Excel
+        
+        Args:
+            proceso: Resultado de un radicado único
+        """
+        self._conexion.execute("INSERT OR REPLACE INTO resultados (radicado, proceso) VALUES (?, ?)",
+                               (proceso.radicado, json.dumps(asdict(proceso), ensure_ascii=False)))
+        self.recibidos += 1
+    
+    def cerrar(self) -> Path:
+        """
+        Escribe las filas en el orden de la entrada y guarda el Excel
+        
+        Si la consulta se interrumpió se omiten las filas de los radicados
+        que no llegaron a consultarse.
+        
+        Returns:
+            Ruta del Excel de resultados
+        """
+        try:
+            for radicado in self.radicados:
+                fila = self._conexion.execute("SELECT proceso FROM resultados WHERE radicado = ?",
+                                              (radicado,)).fetchone()
+                if fila is not None:
+                    self._escribir(ProcesoInfo(**json.loads(fila[0])))
+        finally:
+            self._conexion.close()
+            self._directorio.cleanup()
+        return self.escritor.cerrar()
+    
+    def _escribir(self, proceso: ProcesoInfo):
+        self.escritor.agregar(proceso)
+        self.estadisticas.incrementar(proceso.status)
+        
+        departamento = proceso.departamento
+        if departamento == ProcessConfig.NO_DATA_PLACEHOLDER:
+            departamento = "Sin departamento"
+        self.departamentos[departamento] = self.departamentos.get(departamento, 0) + 1
+
+
 class ConsultaProcesosOrchestrator:
     """Orquestador principal para la consulta de procesos"""
     
-    def __init__(self, usar_rate_limiting: bool = True):
+    def __init__(self, usar_rate_limiting: bool = True, concurrencia: int = 1,
+                 detalle_paralelo: bool = False, confirmar: bool = True, reanudar: Optional[str] = None):
         """
         Inicializa el orquestador
         
         Args:
             usar_rate_limiting: Si usar rate limiting automático
+            concurrencia: Consultas simultáneas (1 = modo secuencial)
+            detalle_paralelo: Si pedir detalle y actuaciones a la vez
+            confirmar: Si pedir confirmación antes de empezar la consulta
+            reanudar: Run-id de una ejecución anterior cuyo journal se continúa
         """
         self.usar_rate_limiting = usar_rate_limiting
+        self.concurrencia = max(1, concurrencia)
+        self.detalle_paralelo = detalle_paralelo
+        self.confirmar = confirmar
         self.api_client = None
+        self.pausa_por_circuito = 0.0  # Segundos esperados con la API caída
+        self._pausa_circuito_hasta = 0.0  # Fin (monotónico) de la pausa en curso
+        self._lock_circuito = threading.Lock()
+        self._cancelado = threading.Event()  # Cancelación del pipeline en curso
+        self._total_unicos = 0
+        self.resumen_departamentos: Dict[str, int] = {}
+        self.reanudar = reanudar
+        self.journal = None
+        self.completados_previos: Dict[str, ProcesoInfo] = {}  # Del journal reanudado
+        # Resultado de los radicados consultados según el intento en que se resolvieron
+        self.resultado_intentos = {'primera_pasada': 0, 'tras_reintento': 0, 'fallidos_tras_reintento': 0}
+        self.reintentos_diferidos = 0
         self.processor = ProcesosProcessor()
         self.file_manager = FileManager()
         self.backup_manager = BackupManager()
@@ -108,13 +212,21 @@ class ConsultaProcesosOrchestrator:
     def inicializar_cliente_api(self):
         """Inicializa el cliente API apropiado"""
         if self.usar_rate_limiting:
-            self.api_client = RateLimitedClient(requests_per_minute=15)
+            self.api_client = RateLimitedClient(
+                requests_per_minute=APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE,
+                detalle_paralelo=self.detalle_paralelo
+            )
             print(f"{UIConfig.CHECK_ICON} Cliente API con rate limiting inicializado")
         else:
-            self.api_client = RamaJudicialClient()
+            self.api_client = RamaJudicialClient(detalle_paralelo=self.detalle_paralelo)
             print(f"{UIConfig.CHECK_ICON} Cliente API estándar inicializado")
         
-        logger.info(f"Cliente API inicializado (rate limiting: {self.usar_rate_limiting})")
+        if self.concurrencia > 1:
+            self.api_client.limitar_peticiones_en_vuelo(self.concurrencia)
+            print(f"{UIConfig.CHECK_ICON} Consultas concurrentes: {self.concurrencia} simultáneas")
+        
+        logger.info(f"Cliente API inicializado (rate limiting: {self.usar_rate_limiting}, "
+                    f"concurrencia: {self.concurrencia})")
     
     def leer_radicados(self) -> List[str]:
         """
@@ -150,98 +262,340 @@ class ConsultaProcesosOrchestrator:
             logger.error(f"Error al leer radicados: {e}")
             return []
     
-    def consultar_procesos(self, radicados: List[str]) -> List[ProcesoInfo]:
+    def preparar_journal(self, radicados: List[str]) -> bool:
         """
-        Consulta todos los procesos de la lista
+        Abre el journal de la ejecución; al reanudar carga lo ya terminado
+        
+        Los radicados que fallaron en la ejecución anterior se vuelven a
+        consultar; el resto se toma del journal.
+        
+        Args:
+            radicados: Radicados de la entrada
+            
+        Returns:
+            True si se puede continuar
+        """
+        if not (JournalConfig.ENABLED or self.reanudar):
+            return True
+        
+        try:
+            self.journal = RunJournal(self.reanudar)
+        except ValueError as e:
+            print(f"{UIConfig.ERROR_ICON} {e}")
+            return False
+        
+        if self.reanudar:
+            if not self.journal.existe():
+                print(f"{UIConfig.ERROR_ICON} No existe el journal de la ejecución {self.reanudar}: "
+                      f"{self.journal.ruta}")
+                disponibles = listar_ejecuciones()
+                if disponibles:
+                    print(f"   Ejecuciones recientes: {', '.join(disponibles)}")
+                else:
+                    print(f"   No hay journals en {JournalConfig.DIRECTORIO}")
+                return False
+            
+            registrados = self.journal.cargar()
+            self.completados_previos = {radicado: proceso for radicado, proceso in registrados.items()
+                                        if proceso.status != ProcessConfig.Status.FAILED}
+            pendientes = len(set(radicados) - set(self.completados_previos))
+            print(f"{UIConfig.CHECK_ICON} Reanudando la ejecución {self.reanudar}: "
+                  f"{len(self.completados_previos)} radicados ya terminados, {pendientes} por consultar")
+            
+            entrada_anterior = (self.journal.cabecera or {}).get('archivo_entrada')
+            if entrada_anterior and entrada_anterior != str(FileConfig.EXCEL_INPUT_FILE):
+                print(f"{UIConfig.WARNING_ICON} La ejecución anterior leyó otro archivo: {entrada_anterior}")
+        
+        self.journal.abrir(FileConfig.EXCEL_INPUT_FILE, len(radicados))
+        print(f"{UIConfig.CHECK_ICON} Journal de la ejecución: {self.journal.ruta}")
+        return True
+    
+    def _mostrar_como_reanudar(self):
+        """Indica cómo continuar una ejecución que no terminó"""
+        if self.journal and self.journal.existe():
+            print(f"{UIConfig.LOADING_ICON} Para continuar sin repetir lo ya consultado: "
+                  f"python main.py --resume {self.journal.run_id}")
+    
+    def consultar_procesos(self, radicados: List[str]) -> Optional[Path]:
+        """
+        Consulta todos los procesos y escribe cada resultado al terminar
+        
+        Consulta (self.concurrencia hilos), procesamiento y escritura corren
+        a la vez, conectadas por colas acotadas (ver src/pipeline.py). Cada
+        resultado se entrega al terminar y SalidaOrdenada lo guarda en disco
+        hasta escribir el Excel, en el orden de la entrada, al final.
+        
+        Los radicados que fallan por un error transitorio vuelven a la cola
+        de consulta con una espera creciente (ProcessConfig.DEFERRED_RETRIES
+        veces como máximo) mientras se consultan los demás: como la entrega
+        no espera el orden, un reintento diferido no detiene la lectura ni
+        retiene los resultados posteriores.
+        
+        Con ProcessConfig.PRIORITY_SCHEDULING los radicados se consultan en
+        orden de prioridad; el Excel conserva el orden de la entrada.
+        
+        Al terminar, los privados viejos servidos de la caché se revisan en
+        un carril final (ver _revalidar_privados).
         
         Args:
             radicados: Lista de radicados a consultar
             
         Returns:
-            Lista de ProcesoInfo con los resultados
+            Ruta del Excel de resultados, o None si no se escribió ningún proceso
         """
         if not radicados:
-            return []
+            return None
         
         print(f"\n{UIConfig.SEPARATOR_MAJOR}")
         print("INICIANDO CONSULTA DE PROCESOS")
         print(f"{UIConfig.SEPARATOR_MAJOR}")
         
-        resultados = []
+        # Los repetidos se consultan una vez y el resultado se copia a cada fila
+        unicos = list(dict.fromkeys(radicados))
+        if len(unicos) < len(radicados):
+            print(f"{UIConfig.WARNING_ICON} {len(radicados) - len(unicos)} radicados repetidos: "
+                  f"se consultarán {len(unicos)} únicos")
+            logger.info(f"Radicados repetidos omitidos: {len(radicados) - len(unicos)}")
+        
+        # Cada radicado conserva su posición en la entrada aunque se consulte en otro orden
+        posiciones = {radicado: i for i, radicado in enumerate(unicos, 1)}
+        orden_consulta = self.priorizar(unicos) if ProcessConfig.PRIORITY_SCHEDULING else unicos
+        
+        self._total_unicos = len(unicos)
+        salida = SalidaOrdenada(radicados, self.file_manager.result_writer.crear_escritor_excel(),
+                                self.processor.estadisticas)
+        pipeline = Pipeline([
+            Etapa("consulta", self._consultar, self.concurrencia),
+            Etapa("procesamiento", self._procesar_resultado, ProcessConfig.PIPELINE_PROCESS_WORKERS),
+        ], ordenado=False)
+        self._cancelado = pipeline.cancelado
+        
+        completo = pipeline.ejecutar(((posiciones[radicado], radicado, 1) for radicado in orden_consulta),
+                                     lambda resultado: self._escribir_resultado(salida, resultado))
+        self.reintentos_diferidos = pipeline.reintentos["consulta"]
+        if completo:
+            self._revalidar_privados(salida)
+        else:
+            print(f"\n{UIConfig.WARNING_ICON} Consulta interrumpida por el usuario")
+            self._mostrar_como_reanudar()
+        
+        archivo_excel = salida.cerrar()
+        self.resumen_departamentos = salida.departamentos
+        if salida.filas == 0:
+            archivo_excel.unlink(missing_ok=True)
+            return None
+        return archivo_excel
+    
+    def _revalidar_privados(self, salida: SalidaOrdenada):
+        """
+        Carril final: vuelve a consultar los privados viejos de la caché
+        
+        Corre después de la consulta principal para no competir con ella por
+        el rate limit; cada resultado reemplaza en la salida al privado que
+        se sirvió de la caché.
+        
+        Args:
+            salida: Excel de resultados aún sin cerrar
+        """
+        revalidados = 0
+        for radicado, datos in self.api_client.revalidar_privados():
+            _, proceso_info, _ = self._procesar_resultado((0, radicado, datos, 1))
+            salida.agregar(proceso_info)
+            revalidados += 1
+        
+        if revalidados:
+            print(f"{UIConfig.CHECK_ICON} Privados de la caché revalidados: {revalidados}")
+            logger.info(f"Privados revalidados al final de la consulta: {revalidados}")
+    
+    def priorizar(self, unicos: List[str]) -> List[str]:
+        """
+        Ordena los radicados para consultar primero los más valiosos
+        
+        Usa los fallidos de la ejecución anterior (o de la reanudada), la
+        columna de prioridad del Excel y, si existe, el estado por radicado
+        (ver src/priority.py).
+        
+        Args:
+            unicos: Radicados únicos en el orden de la entrada
+            
+        Returns:
+            Radicados en orden de consulta
+        """
+        estado = getattr(self.api_client, 'estado', None)
+        propio = None
+        if estado is None and StateConfig.RUTA.exists():
+            estado = propio = ProcessStateStore()
+        
+        try:
+            if self.reanudar:
+                anterior = self.journal
+            else:
+                anterior = ultimo_journal(excluir=self.journal.run_id if self.journal else None)
+            fallidos = anterior.fallidos() if anterior else set()
+            
+            priorizador = PriorizadorRadicados(estado, self.file_manager.excel_reader.prioridades, fallidos)
+            ordenados = priorizador.ordenar(unicos)
+        finally:
+            if propio:
+                propio.close()
+        
+        resumen = priorizador.resumen
+        print(f"{UIConfig.CHECK_ICON} Consulta por prioridad: {resumen['fallidos_anteriores']} fallidos antes, "
+              f"{resumen['con_prioridad_explicita']} con prioridad explícita, "
+              f"{resumen['sin_actualizacion_previa']} sin actualización previa")
+        return ordenados
+    
+    def _consultar(self, entrada: Tuple[int, str, int]) -> Union[Tuple[int, str, Optional[dict], int], Reintento]:
+        """
+        Etapa de consulta del pipeline
+        
+        Args:
+            entrada: Tupla (posición 1-based entre los únicos, radicado, intento)
+            
+        Returns:
+            Tupla (posición, radicado, datos del cliente API o None si falló,
+            intento), o Reintento si el fallo fue transitorio y quedan intentos
+        """
+        i, radicado, intento = entrada
+        if radicado in self.completados_previos:
+            return i, radicado, None, intento
+        
+        try:
+            datos = self._consultar_esperando_circuito(radicado)
+        except Exception as e:
+            logger.error(f"Error inesperado consultando {radicado}: {e}")
+            return i, radicado, None, intento
+        
+        if datos is None and intento <= ProcessConfig.DEFERRED_RETRIES and self.api_client.fallo_transitorio():
+            espera = ProcessConfig.DEFERRED_RETRY_DELAY * 2 ** (intento - 1)
+            print(f"{UIConfig.LOADING_ICON} Fallo transitorio en {radicado}: reintento "
+                  f"{intento}/{ProcessConfig.DEFERRED_RETRIES} en {espera:.0f} segundos")
+            logger.warning(f"Reintento diferido {intento} de {radicado} en {espera:.0f}s")
+            return Reintento((i, radicado, intento + 1), espera)
+        return i, radicado, datos, intento
+    
+    def _consultar_esperando_circuito(self, radicado: str) -> dict:
+        """
+        Consulta un radicado pausando mientras el circuito de la API esté abierto
+        
+        Los hilos de consulta comparten la pausa: solo el primero que
+        encuentra el circuito abierto la cuenta contra la pausa máxima. La
+        pausa termina en cuanto se cancela el pipeline.
         
-        for i, radicado in enumerate(radicados, 1):
+        Args:
+            radicado: Radicado a consultar
+            
+        Returns:
+            Datos del proceso, o None si falla, se agotó la pausa máxima o se
+            canceló la consulta
+        """
+        while not self._cancelado.is_set():
             try:
-                print(f"\n{UIConfig.SEPARATOR_MINOR}")
-                print(f"PROCESANDO {i}/{len(radicados)}: {radicado}")
-                print(f"{UIConfig.SEPARATOR_MINOR}")
-                
-                # Consulta API
-                datos_proceso = self.api_client.consultar_proceso_completo(radicado)
-                
-                if datos_proceso:
-                    # Procesar datos
-                    proceso_info = self.processor.procesar_datos_proceso(datos_proceso)
-                    resultados.append(proceso_info)
-                    
-                    # Mostrar resultado formateado
-                    resultado_formateado = self.processor.formatear_resultado_proceso(proceso_info)
-                    print(resultado_formateado)
-                    
-                    # Mostrar status
-                    if proceso_info.es_privado:
-                        print(f"{UIConfig.PRIVATE_ICON} Proceso {i} - PRIVADO")
+                return self.api_client.consultar_proceso_completo(radicado)
+            except CircuitoAbiertoError as e:
+                with self._lock_circuito:
+                    ahora = time.monotonic()
+                    if ahora < self._pausa_circuito_hasta:
+                        espera = self._pausa_circuito_hasta - ahora
                     else:
-                        print(f"{UIConfig.SUCCESS_ICON} Proceso {i} - COMPLETADO")
-                else:
-                    print(f"{UIConfig.ERROR_ICON} No se pudo consultar el proceso: {radicado}")
-                    
-                    # Crear proceso con error
-                    proceso_error = ProcesoInfo(radicado=radicado, status=ProcessConfig.Status.FAILED)
-                    resultados.append(proceso_error)
-                
-                # Actualizar estadísticas
-                if resultados:
-                    self.processor.estadisticas.incrementar(resultados[-1].status)
-                
-                # Pausa entre consultas
-                if i < len(radicados):
-                    print(f"{UIConfig.LOADING_ICON} Esperando {APIConfig.DELAY_BETWEEN_PROCESSES} segundos...")
-                    time.sleep(APIConfig.DELAY_BETWEEN_PROCESSES)
-                
-            except KeyboardInterrupt:
-                print(f"\n{UIConfig.WARNING_ICON} Consulta interrumpida por el usuario")
-                break
-                
+                        espera = max(e.espera, 1.0)
+                        if self.pausa_por_circuito + espera > APIConfig.CIRCUIT_MAX_TOTAL_PAUSE:
+                            print(f"{UIConfig.ERROR_ICON} API no disponible y pausa máxima agotada: {radicado}")
+                            logger.error(f"Pausa máxima por circuito abierto agotada: {radicado}")
+                            return None
+                        
+                        print(f"{UIConfig.WARNING_ICON} API no disponible ({e}). Pausa de {espera:.0f} segundos...")
+                        self.pausa_por_circuito += espera
+                        self._pausa_circuito_hasta = ahora + espera
+                if self._cancelado.wait(espera):
+                    logger.info(f"Pausa por circuito abierto cancelada: {radicado}")
+        return None
+    
+    def _procesar_resultado(self, consulta: Tuple[int, str, Optional[dict], int]) -> Tuple[int, ProcesoInfo, int]:
+        """
+        Etapa de procesamiento del pipeline
+        
+        Args:
+            consulta: Tupla (posición, radicado, datos del cliente API o None, intento)
+            
+        Returns:
+            Tupla (posición, ProcesoInfo con el resultado, intento)
+        """
+        i, radicado, datos_proceso, intento = consulta
+        previo = self.completados_previos.get(radicado)
+        if previo is not None:
+            return i, previo, intento
+        
+        if not datos_proceso:
+            proceso_info = ProcesoInfo(radicado=radicado, status=ProcessConfig.Status.FAILED)
+        else:
+            try:
+                proceso_info = self.processor.procesar_datos_proceso(datos_proceso)
             except Exception as e:
-                print(f"{UIConfig.ERROR_ICON} Error inesperado procesando {radicado}: {e}")
                 logger.error(f"Error inesperado procesando {radicado}: {e}")
-                
-                # Crear proceso con error
-                proceso_error = ProcesoInfo(radicado=radicado, status=ProcessConfig.Status.FAILED)
-                resultados.append(proceso_error)
-                self.processor.estadisticas.incrementar(ProcessConfig.Status.FAILED)
-                continue
+                proceso_info = ProcesoInfo(radicado=radicado, status=ProcessConfig.Status.FAILED)
         
-        return resultados
+        if self.journal:
+            self.journal.registrar(proceso_info)
+        return i, proceso_info, intento
     
-    def generar_reportes(self, procesos: List[ProcesoInfo]) -> dict:
+    def _escribir_resultado(self, salida: 'SalidaOrdenada', resultado: Tuple[int, ProcesoInfo, int]):
         """
-        Genera todos los reportes y archivos de salida
+        Etapa de escritura del pipeline: muestra el resultado y lo escribe
         
         Args:
-            procesos: Lista de procesos procesados
+            salida: Excel de resultados, que se escribe en el orden de la entrada al cerrar
+            resultado: Tupla (posición, ProcesoInfo, intento en que se resolvió)
+        """
+        i, proceso_info, intento = resultado
+        if self.completados_previos.get(proceso_info.radicado) is proceso_info:
+            # Ya se mostró en la ejecución reanudada
+            salida.agregar(proceso_info)
+            return
+        
+        fallido = proceso_info.status == ProcessConfig.Status.FAILED
+        if intento == 1:
+            self.resultado_intentos['primera_pasada'] += not fallido
+        elif fallido:
+            self.resultado_intentos['fallidos_tras_reintento'] += 1
+        else:
+            self.resultado_intentos['tras_reintento'] += 1
+        
+        print(f"\n{UIConfig.SEPARATOR_MINOR}")
+        print(f"COMPLETADO {salida.recibidos + 1}/{self._total_unicos}: {proceso_info.radicado}")
+        print(f"{UIConfig.SEPARATOR_MINOR}")
+        
+        if proceso_info.status == ProcessConfig.Status.FAILED:
+            print(f"{UIConfig.ERROR_ICON} No se pudo consultar el proceso: {proceso_info.radicado}")
+        else:
+            print(self.processor.formatear_resultado_proceso(proceso_info))
+            
+            if proceso_info.status == ProcessConfig.Status.NOT_FOUND:
+                print(f"{UIConfig.WARNING_ICON} Proceso {i} - NO ENCONTRADO")
+            elif proceso_info.es_privado:
+                print(f"{UIConfig.PRIVATE_ICON} Proceso {i} - PRIVADO")
+            else:
+                print(f"{UIConfig.SUCCESS_ICON} Proceso {i} - COMPLETADO")
+        
+        salida.agregar(proceso_info)
+    
+    def generar_reportes(self, archivo_excel: Path) -> dict:
+        """
+        Resume los archivos de salida generados
+        
+        Args:
+            archivo_excel: Excel de resultados escrito durante la consulta
             
         Returns:
             Diccionario con información de archivos generados
         """
         try:
             print(f"\n{UIConfig.SEPARATOR_MAJOR}")
-            print("GENERANDO REPORTES")
+            print("REPORTES GENERADOS")
             print(f"{UIConfig.SEPARATOR_MAJOR}")
             
-            # Procesar archivo completo
-            resultado_archivos = self.file_manager.procesar_archivo_completo(
-                procesos, self.processor.estadisticas
+            resultado_archivos = self.file_manager.resumir_procesamiento(
+                archivo_excel, self.processor.estadisticas
             )
             
             print(f"\n{UIConfig.SUCCESS_ICON} Archivos generados:")
@@ -255,13 +609,8 @@ class ConsultaProcesosOrchestrator:
             logger.error(f"Error al generar reportes: {e}")
             return {}
     
-    def mostrar_resumen_final(self, procesos: List[ProcesoInfo]):
-        """
-        Muestra el resumen final de la ejecución
-        
-        Args:
-            procesos: Lista de procesos procesados
-        """
+    def mostrar_resumen_final(self):
+        """Muestra el resumen final de la ejecución"""
         print(f"\n{UIConfig.SEPARATOR_MAJOR}")
         print("RESUMEN FINAL")
         print(f"{UIConfig.SEPARATOR_MAJOR}")
@@ -275,15 +624,44 @@ class ConsultaProcesosOrchestrator:
         print(f"Consultas fallidas: {stats.fallidos}")
         print(f"Tasa de éxito: {stats.tasa_exito:.1f}%")
         
+        if self.reintentos_diferidos:
+            print(f"\nReintentos diferidos ({self.reintentos_diferidos} programados):")
+            print(f"  Resueltos en la primera pasada: {self.resultado_intentos['primera_pasada']}")
+            print(f"  Resueltos tras reintentar: {self.resultado_intentos['tras_reintento']}")
+            print(f"  Fallidos tras agotar los reintentos: {self.resultado_intentos['fallidos_tras_reintento']}")
+            logger.info(f"Reintentos diferidos: {self.reintentos_diferidos}, resultado: {self.resultado_intentos}")
+        
         # Análisis adicional
-        if procesos:
-            resumen_dept = self.processor.obtener_resumen_por_departamento(procesos)
+        if self.resumen_departamentos:
+            resumen_dept = dict(sorted(self.resumen_departamentos.items(), key=lambda x: x[1], reverse=True))
             print(f"\nProcesos por departamento:")
             for dept, cantidad in list(resumen_dept.items())[:5]:  # Top 5
                 print(f"  {dept}: {cantidad}")
             
             if len(resumen_dept) > 5:
                 print(f"  ... y {len(resumen_dept) - 5} departamentos más")
+        
+        # Estadísticas del cliente API (rate limiting, etc.)
+        if self.api_client:
+            self.mostrar_estadisticas_cliente(self.api_client.obtener_estadisticas())
+    
+    def mostrar_estadisticas_cliente(self, estadisticas: dict):
+        """
+        Muestra las estadísticas de ejecución del cliente API
+        
+        Args:
+            estadisticas: Diccionario con una sección por componente
+        """
+        for seccion, valores in estadisticas.items():
+            print(f"\n{seccion.replace('_', ' ').capitalize()}:")
+            for clave, valor in valores.items():
+                if isinstance(valor, list):
+                    print(f"  {clave}: {len(valor)} registradas")
+                    for item in valor[-5:]:
+                        print(f"    - {item}")
+                else:
+                    print(f"  {clave}: {valor}")
+            logger.info(f"Estadísticas {seccion}: {valores}")
     
     def ejecutar_consulta_completa(self) -> bool:
         """
@@ -326,29 +704,36 @@ class ConsultaProcesosOrchestrator:
             print(f"\n{UIConfig.WARNING_ICON} Se procesarán {len(radicados)} radicados")
             print("Esto puede tomar varios minutos...")
             
-            respuesta = input("¿Continuar? (s/N): ").strip().lower()
-            if respuesta not in ['s', 'si', 'sí', 'y', 'yes']:
-                print("Operación cancelada por el usuario")
+            if self.confirmar:
+                respuesta = input("¿Continuar? (s/N): ").strip().lower()
+                if respuesta not in ['s', 'si', 'sí', 'y', 'yes']:
+                    print("Operación cancelada por el usuario")
+                    return False
+            
+            # Journal para poder reanudar si la ejecución se interrumpe
+            if not self.preparar_journal(radicados):
                 return False
             
-            # Consultar procesos
+            # Consultar procesos (el Excel se escribe a medida que llegan)
             with self.api_client:  # Context manager para cerrar sesión
-                procesos = self.consultar_procesos(radicados)
+                self.api_client.precalentar()
+                archivo_excel = self.consultar_procesos(radicados)
             
-            if not procesos:
+            if not archivo_excel:
                 print(f"{UIConfig.ERROR_ICON} No se procesaron procesos")
                 return False
             
             # Generar reportes
-            self.generar_reportes(procesos)
+            self.generar_reportes(archivo_excel)
             
             # Mostrar resumen final
-            self.mostrar_resumen_final(procesos)
+            self.mostrar_resumen_final()
             
             # Limpiar archivos antiguos
             try:
                 backups_eliminados = self.backup_manager.limpiar_backups_antiguos(30)
                 logs_eliminados = self.log_manager.limpiar_logs_antiguos(7)
+                limpiar_journals_antiguos()
                 
                 if backups_eliminados > 0 or logs_eliminados > 0:
                     print(f"\n{UIConfig.CHECK_ICON} Limpieza: {backups_eliminados} backups y {logs_eliminados} logs antiguos eliminados")
@@ -361,12 +746,15 @@ class ConsultaProcesosOrchestrator:
         except Exception as e:
             print(f"\n{UIConfig.ERROR_ICON} Error fatal en ejecución: {e}")
             logger.error(f"Error fatal en ejecución: {e}")
+            self._mostrar_como_reanudar()
             return False
         
         finally:
             # Cerrar cliente API si existe
             if self.api_client:
                 self.api_client.close()
+            if self.journal:
+                self.journal.cerrar()
 
 
 def mostrar_ayuda():
@@ -380,6 +768,36 @@ USO:
 OPCIONES:
     -h, --help          Mostrar esta ayuda
     --no-rate-limit     Deshabilitar rate limiting automático
+    --concurrencia N    Consultar N radicados simultáneamente (default: 1)
+    --detalle-paralelo  Pedir detalle y actuaciones de cada proceso a la vez
+    --rate-limit-compartido
+                        Compartir el presupuesto de peticiones con los demás
+                        procesos del equipo (shards, script_base/script.py)
+    --rate-adaptativo   Ajustar la tasa según 429, errores 5xx y latencia
+                        (no se combina con --rate-limit-compartido)
+    --todas-las-actuaciones
+                        Recorrer todas las páginas de actuaciones de cada proceso
+                        (con --incremental, solo hasta las ya guardadas)
+    --cache             Reutilizar respuestas guardadas en la caché local
+    --cache-only        Usar solo la caché, sin consultar la API
+    --refresh           Ignorar la caché y guardar respuestas nuevas
+    --incremental       Reutilizar detalle y actuaciones de la última ejecución
+                        si la fecha de última actuación no cambió
+    --indice            Recordar el idProceso de cada radicado para no
+                        consultarlo de nuevo por número de radicación
+    --http2             Usar HTTP/2 (requiere: pip install httpx[http2])
+    --presupuesto-completo
+                        Sin piso de cortesía entre peticiones: el rate limit
+                        es el único límite de ritmo
+    --cobertura         Enviar una copia de las peticiones que tardan más que
+                        el p95 de su endpoint y usar la primera respuesta
+    --priorizar         Consultar primero los fallidos de la ejecución anterior,
+                        los de mayor prioridad en el Excel y los que más
+                        actuaciones nuevas se esperan (el Excel conserva el
+                        orden de la entrada)
+    -y, --yes           No pedir confirmación antes de consultar
+    --resume RUN_ID     Continuar una ejecución interrumpida: omite los radicados
+                        ya terminados en su journal y regenera la salida completa
     --config-info       Mostrar información de configuración
     --test-config       Solo validar configuración sin ejecutar
 
@@ -400,6 +818,9 @@ DESCRIPCIÓN:
 EJEMPLOS:
     python main.py                    # Ejecución normal
     python main.py --no-rate-limit    # Sin límite de velocidad
+    python main.py --concurrencia 4   # 4 consultas simultáneas
+    python main.py --cache            # Reutilizar respuestas recientes
+    python main.py --incremental      # Solo re-consultar procesos con novedades
     python main.py --config-info      # Ver configuración
 """)
 
@@ -439,6 +860,24 @@ def mostrar_info_configuracion():
         print("🔧 Asegúrate de completar todos los módulos en src/")
 
 
+def obtener_valor_argumento(nombre: str, defecto=None):
+    """
+    Obtiene el valor que sigue a una opción de línea de comandos
+    
+    Args:
+        nombre: Nombre de la opción (ej: --concurrencia)
+        defecto: Valor si la opción no está presente
+        
+    Returns:
+        Valor de la opción o el valor por defecto
+    """
+    if nombre in sys.argv:
+        posicion = sys.argv.index(nombre)
+        if posicion + 1 < len(sys.argv):
+            return sys.argv[posicion + 1]
+    return defecto
+
+
 def main():
     """Función principal"""
     
@@ -479,9 +918,58 @@ def main():
     # Determinar opciones
     usar_rate_limiting = '--no-rate-limit' not in sys.argv
     
+    if '--rate-limit-compartido' in sys.argv:
+        APIConfig.RATE_LIMITER = "shared_token_bucket"
+    
+    if '--rate-adaptativo' in sys.argv:
+        APIConfig.RATE_LIMIT_ADAPTIVE = True
+    
+    if '--todas-las-actuaciones' in sys.argv:
+        APIConfig.ACTUACIONES_TODAS_LAS_PAGINAS = True
+    
+    if '--incremental' in sys.argv:
+        StateConfig.INCREMENTAL = True
+    
+    if '--indice' in sys.argv:
+        StateConfig.INDICE_PROCESOS = True
+    
+    if '--http2' in sys.argv:
+        APIConfig.HTTP2 = True
+    
+    if '--presupuesto-completo' in sys.argv:
+        APIConfig.SCHEDULER_MODE = "presupuesto_completo"
+    
+    if '--cobertura' in sys.argv:
+        APIConfig.HEDGED_REQUESTS = True
+    
+    if '--priorizar' in sys.argv:
+        ProcessConfig.PRIORITY_SCHEDULING = True
+    
+    if '--cache' in sys.argv:
+        CacheConfig.ENABLED = True
+    
+    if '--cache-only' in sys.argv:
+        CacheConfig.ENABLED = True
+        CacheConfig.MODO = CacheConfig.Modo.SOLO_CACHE
+    elif '--refresh' in sys.argv:
+        CacheConfig.ENABLED = True
+        CacheConfig.MODO = CacheConfig.Modo.REFRESCAR
+    
+    try:
+        concurrencia = int(obtener_valor_argumento('--concurrencia', 1))
+    except ValueError:
+        print(f"{UIConfig.ERROR_ICON} --concurrencia debe ser un número entero")
+        return 1
+    
     # Ejecutar consulta
     try:
-        orquestador = ConsultaProcesosOrchestrator(usar_rate_limiting=usar_rate_limiting)
+        orquestador = ConsultaProcesosOrchestrator(
+            usar_rate_limiting=usar_rate_limiting,
+            concurrencia=concurrencia,
+            detalle_paralelo='--detalle-paralelo' in sys.argv,
+            confirmar=not ('--yes' in sys.argv or '-y' in sys.argv),
+            reanudar=obtener_valor_argumento('--resume')
+        )
         exito = orquestador.ejecutar_consulta_completa()
         return 0 if exito else 1
         
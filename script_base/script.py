@@ -12,6 +12,16 @@ from datetime import datetime
 import time
 import pandas as pd
 import os
+import sys
+
+# Presupuesto de peticiones compartido con main.py (ver src/rate_limiter.py).
+# Si los módulos de src/ no están disponibles se conserva el comportamiento original.
+try:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+    from rate_limiter import crear_limitador
+    limitador_compartido = crear_limitador("shared_token_bucket", adaptativo=False)
+except ImportError:
+    limitador_compartido = None
 
 class ConsultorProcesosJudiciales:
     def __init__(self):
@@ -26,6 +36,13 @@ class ConsultorProcesosJudiciales:
             'Connection': 'keep-alive',
         })
     
+    def esperar_turno(self):
+        """
+        Espera turno en el presupuesto de peticiones compartido del equipo
+        """
+        if limitador_compartido:
+            limitador_compartido.adquirir()
+    
     def consultar_por_radicacion(self, numero_radicacion):
         """
         Consulta inicial por número de radicación para obtener el idProceso
@@ -38,6 +55,7 @@ class ConsultorProcesosJudiciales:
         }
         
         try:
+            self.esperar_turno()
             response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
@@ -62,6 +80,7 @@ class ConsultorProcesosJudiciales:
         url = f"{self.base_url}/Proceso/Detalle/{id_proceso}"
         
         try:
+            self.esperar_turno()
             response = self.session.get(url, timeout=30)
             
             if response.status_code == 404:
@@ -89,6 +108,7 @@ class ConsultorProcesosJudiciales:
         params = {'pagina': 1}
         
         try:
+            self.esperar_turno()
             response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
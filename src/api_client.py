@@ -7,17 +7,42 @@ Cliente API para consultas a la Rama Judicial de Colombia
 import requests
 import json
 import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, List, Tuple
 from dataclasses import dataclass
 
 try:
-    from config import APIConfig, ProcessConfig
+    from config import APIConfig, CacheConfig, ProcessConfig, StateConfig
+    from rate_limiter import RateLimiter, crear_limitador
+    from scheduler import RequestScheduler
+    from retry import RetryPolicy, crear_politicas_reintento, parsear_retry_after
+    from response_cache import ResponseCache
+    from state_store import ProcessIndex, ProcessStateStore
+    from single_flight import SingleFlight
+    from circuit_breaker import CircuitBreaker
+    from latency import LatencyTracker
+    from transport import crear_transporte
+    from json_decoder import PROYECCIONES, crear_decodificador
 except ModuleNotFoundError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from config import APIConfig, ProcessConfig
+    from config import APIConfig, CacheConfig, ProcessConfig, StateConfig
+    from rate_limiter import RateLimiter, crear_limitador
+    from scheduler import RequestScheduler
+    from retry import RetryPolicy, crear_politicas_reintento, parsear_retry_after
+    from response_cache import ResponseCache
+    from state_store import ProcessIndex, ProcessStateStore
+    from single_flight import SingleFlight
+    from circuit_breaker import CircuitBreaker
+    from latency import LatencyTracker
+    from transport import crear_transporte
+    from json_decoder import PROYECCIONES, crear_decodificador
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +55,11 @@ class APIResponse:
     data: Optional[Dict[Any, Any]] = None
     error: Optional[str] = None
     status_code: Optional[int] = None
+    transitorio: bool = False  # Timeout, error de red, 429 o 5xx: puede reintentarse
+    retry_after: Optional[float] = None  # Segundos indicados por el servidor
+    intentos: int = 1
+    desde_cache: bool = False
+    incompleta: bool = False  # Actuaciones de varias páginas a las que les falta alguna
 
 
 class RamaJudicialAPIError(Exception):
@@ -37,35 +67,465 @@ class RamaJudicialAPIError(Exception):
     pass
 
 
+class CircuitoAbiertoError(RamaJudicialAPIError):
+    """El circuito del endpoint está abierto: la API se considera caída"""
+    
+    def __init__(self, endpoint: str, espera: float):
+        super().__init__(f"Circuito '{endpoint}' abierto, reintentar en {espera:.0f}s")
+        self.endpoint = endpoint
+        self.espera = espera
+
+
+def detener_antes_de(fecha: str) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Condición de parada: actuaciones anteriores a una fecha
+    
+    Args:
+        fecha: Fecha límite en formato ISO (YYYY-MM-DD)
+        
+    Returns:
+        Función que indica si una actuación es anterior a la fecha
+    """
+    def condicion(actuacion: Dict[str, Any]) -> bool:
+        fecha_actuacion = (actuacion.get('fechaActuacion') or '')[:10]
+        return bool(fecha_actuacion) and fecha_actuacion < fecha[:10]
+    return condicion
+
+
+def detener_en_conocidas(ids_conocidos: Iterable[Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Condición de parada: actuaciones ya almacenadas
+    
+    Args:
+        ids_conocidos: idRegActuacion de las actuaciones ya guardadas
+        
+    Returns:
+        Función que indica si una actuación ya es conocida
+    """
+    conocidos = set(ids_conocidos)
+    
+    def condicion(actuacion: Dict[str, Any]) -> bool:
+        return actuacion.get('idRegActuacion') in conocidos
+    return condicion
+
+
 class RamaJudicialClient:
     """Cliente para la API de consulta de procesos de la Rama Judicial"""
     
-    def __init__(self):
-        """Inicializa el cliente API"""
-        self.session = requests.Session()
-        self.session.headers.update(APIConfig.HEADERS)
+    def __init__(self, detalle_paralelo: Optional[bool] = None,
+                 politicas_reintento: Optional[Dict[str, RetryPolicy]] = None,
+                 todas_las_actuaciones: Optional[bool] = None,
+                 cache: Optional[ResponseCache] = None,
+                 estado: Optional[ProcessStateStore] = None,
+                 indice: Optional[ProcessIndex] = None,
+                 cobertura: Optional[bool] = None):
+        """
+        Inicializa el cliente API
+        
+        Args:
+            detalle_paralelo: Si pedir detalle y actuaciones a la vez
+                (default: APIConfig.PARALLEL_DETAIL_FETCH)
+            politicas_reintento: Política de reintentos por endpoint
+                (default: según APIConfig.RETRY_POLICIES)
+            todas_las_actuaciones: Si la consulta completa recorre todas las
+                páginas de actuaciones (default: APIConfig.ACTUACIONES_TODAS_LAS_PAGINAS)
+            cache: Caché persistente de respuestas (default: una nueva si
+                CacheConfig.ENABLED, si no ninguna)
+            estado: Estado por radicado para la sincronización incremental
+                (default: uno nuevo si StateConfig.INCREMENTAL, si no ninguno)
+            indice: Índice radicado -> idProceso (default: uno nuevo si
+                StateConfig.INDICE_PROCESOS, si no ninguno)
+            cobertura: Si enviar peticiones de cobertura a los GET lentos
+                (default: APIConfig.HEDGED_REQUESTS)
+        """
+        self.session = crear_transporte()
+        self.decodificar = crear_decodificador()
+        self.proyectar_respuestas = APIConfig.PROJECT_RESPONSES
         self.base_url = APIConfig.BASE_URL
+        self.detalle_paralelo = (APIConfig.PARALLEL_DETAIL_FETCH
+                                 if detalle_paralelo is None else detalle_paralelo)
+        self.todas_las_actuaciones = (APIConfig.ACTUACIONES_TODAS_LAS_PAGINAS
+                                      if todas_las_actuaciones is None else todas_las_actuaciones)
+        self.politicas_reintento = politicas_reintento or crear_politicas_reintento()
+        self.cache = cache or (ResponseCache() if CacheConfig.ENABLED else None)
+        self.estado = estado or (ProcessStateStore() if StateConfig.INCREMENTAL else None)
+        self.indice = indice or (ProcessIndex() if StateConfig.INDICE_PROCESOS else None)
+        self.procesos_sin_cambios = 0
+        self.procesos_actualizados = 0
+        self.reintentos_realizados = 0
+        self.recuperados_con_reintento = 0
+        self._semaforo_en_vuelo = None
+        self._pool_paralelo = None
+        self._pool_paginas = None
+        self._pool_lock = threading.Lock()
+        self._lock_estadisticas = threading.Lock()
+        self._peticiones_en_vuelo = SingleFlight()
+        # Radicado -> registro básico guardado de los privados viejos servidos de la caché
+        self._privados_por_revalidar: Dict[str, Dict[str, Any]] = {}
+        # Único punto de espera antes de cada envío (RateLimitedClient le agrega el limitador)
+        self.planificador = RequestScheduler()
+        # Instante de envío del último intento de cada hilo, ya pasado su turno
+        self._envio = threading.local()
+        # Revalidar los privados viejos durante la consulta en vez de en el carril final
+        self.revalidar_privados_en_linea = False
+        self.circuitos = {
+            endpoint: CircuitBreaker(endpoint)
+            for endpoint in (APIConfig.Endpoint.RADICACION, APIConfig.Endpoint.DETALLE,
+                             APIConfig.Endpoint.ACTUACIONES)
+        }
+        self.privados_revalidados = 0
+        self.latencias = LatencyTracker()
+        self.plazos_agotados = 0
+        # Límite de tiempo (monotónico) de la consulta en curso en cada hilo
+        self._plazo = threading.local()
+        # Si la última consulta completa de cada hilo falló por un error transitorio
+        self._fallo = threading.local()
+        self.cobertura = APIConfig.HEDGED_REQUESTS if cobertura is None else cobertura
+        self._pool_originales = None
+        self._pool_coberturas = None
+        self._consultas_simultaneas = 1
+        self.peticiones_cubribles = 0
+        self.coberturas_enviadas = 0
+        self.coberturas_ganadoras = 0
         logger.info("Cliente API inicializado")
     
-    def _make_request(self, method: str, url: str, **kwargs) -> APIResponse:
+    def limitar_peticiones_en_vuelo(self, max_en_vuelo: int):
+        """
+        Limita el número de peticiones HTTP simultáneas del cliente
+        
+        También ajusta el pool de conexiones de la sesión para que cada
+        petición en vuelo pueda reutilizar una conexión abierta.
+        
+        Args:
+            max_en_vuelo: Máximo de peticiones simultáneas permitidas
+        """
+        if max_en_vuelo < 1:
+            raise ValueError("max_en_vuelo debe ser al menos 1")
+        
+        self._semaforo_en_vuelo = threading.BoundedSemaphore(max_en_vuelo)
+        self._consultas_simultaneas = max_en_vuelo
+        self.session.ajustar_pool(max(max_en_vuelo, APIConfig.HTTP_POOL_SIZE))
+        logger.info(f"Peticiones simultáneas limitadas a {max_en_vuelo}")
+    
+    def precalentar(self, conexiones: Optional[int] = None) -> int:
+        """
+        Abre conexiones con la API antes de empezar un lote
+        
+        Args:
+            conexiones: Conexiones a abrir (default: APIConfig.HTTP_WARMUP_CONNECTIONS)
+            
+        Returns:
+            Conexiones abiertas con éxito
+        """
+        if self.cache and self.cache.solo_cache:
+            return 0
+        if conexiones is None:
+            conexiones = APIConfig.HTTP_WARMUP_CONNECTIONS
+        return self.session.precalentar(self.base_url, conexiones)
+    
+    def _enviar(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+        """Envía la petición en su turno del planificador, respetando el límite en vuelo, y registra su latencia"""
+        inicio_espera = time.monotonic()
+        self.planificador.esperar_turno()
+        if self._semaforo_en_vuelo is not None:
+            self._semaforo_en_vuelo.acquire()
+        
+        try:
+            # La espera del turno no consume el plazo del radicado: el timeout se calcula ya con turno
+            self._extender_plazo(time.monotonic() - inicio_espera)
+            kwargs.setdefault('timeout', self._calcular_timeout(endpoint))
+            al_enviar = getattr(self._envio, 'al_enviar', None)
+            if al_enviar:
+                al_enviar()
+            inicio = self._envio.inicio = time.monotonic()
+            try:
+                response = self.session.request(method=method, url=url, **kwargs)
+            except requests.exceptions.ReadTimeout:
+                # Sin esta muestra el p99 solo vería las respuestas rápidas y el
+                # timeout adaptativo no crecería aunque el servidor se vuelva lento
+                if endpoint:
+                    timeout = kwargs['timeout']
+                    self.latencias.registrar(endpoint, timeout[1] if isinstance(timeout, tuple) else timeout)
+                raise
+            finally:
+                self.planificador.registrar_peticion(time.monotonic() - inicio)
+        finally:
+            if self._semaforo_en_vuelo is not None:
+                self._semaforo_en_vuelo.release()
+        
+        if endpoint:
+            self.latencias.registrar(endpoint, time.monotonic() - inicio)
+        return response
+    
+    def _calcular_timeout(self, endpoint: Optional[str]) -> Tuple[float, float]:
+        """
+        Timeouts (conexión, lectura) para una petición al endpoint
+        
+        La conexión usa un límite corto fijo; la lectura se adapta a la
+        latencia observada del endpoint y nunca supera lo que le queda al
+        plazo de la consulta en curso.
+        
+        Args:
+            endpoint: Nombre lógico del endpoint (APIConfig.Endpoint)
+            
+        Returns:
+            Tupla (timeout de conexión, timeout de lectura) en segundos
+        """
+        conexion = APIConfig.CONNECT_TIMEOUT
+        lectura = (self.latencias.timeout_lectura(endpoint) if APIConfig.ADAPTIVE_READ_TIMEOUT
+                   else APIConfig.REQUEST_TIMEOUT)
+        
+        restante = self._tiempo_restante()
+        if restante is not None:
+            conexion = max(0.1, min(conexion, restante))
+            lectura = max(0.1, min(lectura, restante))
+        return conexion, lectura
+    
+    def _tiempo_restante(self) -> Optional[float]:
+        """Segundos que le quedan al plazo de la consulta en curso (None si no tiene)"""
+        limite = getattr(self._plazo, 'limite', None)
+        if limite is None:
+            return None
+        return limite - time.monotonic()
+    
+    def _extender_plazo(self, segundos: float):
+        """Corre el plazo de la consulta en curso (si tiene) por un tiempo que no debe contar"""
+        limite = getattr(self._plazo, 'limite', None)
+        if limite is not None and segundos > 0:
+            self._plazo.limite = limite + segundos
+    
+    def _con_plazo_actual(self, funcion: Callable, *args, **kwargs) -> Callable[[], Any]:
+        """
+        Envuelve una llamada para ejecutarla en otro hilo con el plazo del actual
+        
+        Args:
+            funcion: Función a ejecutar
+            *args, **kwargs: Argumentos de la función
+            
+        Returns:
+            Función sin argumentos para enviar al pool
+        """
+        limite = getattr(self._plazo, 'limite', None)
+        
+        def ejecutar():
+            self._plazo.limite = limite
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self._plazo.limite = None
+        
+        return ejecutar
+    
+    def _make_request(self, method: str, url: str, endpoint: Optional[str] = None,
+                      **kwargs) -> APIResponse:
         """
-        Realiza una petición HTTP con manejo de errores
+        Realiza una petición HTTP con reintentos y manejo de errores
+        
+        Los fallos transitorios (timeout, conexión, 429, 5xx) se reintentan
+        según la política del endpoint con backoff exponencial y jitter.
+        Si hay caché, las respuestas vigentes se sirven sin tocar la red ni
+        el rate limit. Los GET idénticos en vuelo a la vez se coalescen.
         
         Args:
             method: Método HTTP (GET, POST, etc.)
             url: URL completa para la petición
+            endpoint: Nombre lógico del endpoint (APIConfig.Endpoint)
             **kwargs: Argumentos adicionales para requests
             
         Returns:
             APIResponse con el resultado de la petición
+            
+        Raises:
+            CircuitoAbiertoError: Si el circuito del endpoint está abierto
+        """
+        if method.upper() != 'GET':
+            return self._make_request_con_reintentos(method, url, endpoint, **kwargs)
+        
+        clave = ResponseCache.generar_clave(method, url, kwargs.get('params'))
+        if self.cache:
+            datos_cache = self.cache.obtener(clave)
+            if datos_cache is not None:
+                return APIResponse(success=True, data=datos_cache, status_code=200, desde_cache=True)
+            if self.cache.solo_cache:
+                return APIResponse(success=False, error="No disponible en caché (modo solo caché)")
+        
+        # Peticiones idénticas simultáneas (p. ej. el mismo idProceso desde
+        # dos radicados) comparten una sola llamada HTTP
+        response, compartida = self._peticiones_en_vuelo.ejecutar(
+            clave, partial(self._make_request_con_reintentos, method, url, endpoint, **kwargs)
+        )
+        
+        if self.cache and response.success and not compartida:
+            self.cache.guardar(clave, endpoint, response.data)
+        return response
+    
+    def _make_request_con_reintentos(self, method: str, url: str, endpoint: Optional[str],
+                                     **kwargs) -> APIResponse:
+        """
+        Ejecuta la petición reintentando los fallos transitorios
+        
+        Raises:
+            CircuitoAbiertoError: Si el circuito del endpoint está abierto
+        """
+        politica = self.politicas_reintento.get(endpoint) or RetryPolicy(max_reintentos=0)
+        circuito = self.circuitos.get(endpoint)
+        intento = 0
+        
+        while True:
+            restante = self._tiempo_restante()
+            if restante is not None and restante <= 0:
+                with self._lock_estadisticas:
+                    self.plazos_agotados += 1
+                logger.error(f"Plazo de la consulta agotado antes de pedir: {url}")
+                return APIResponse(success=False, error="Plazo de la consulta agotado",
+                                   transitorio=True, intentos=intento)
+            
+            if circuito and not circuito.permitir():
+                raise CircuitoAbiertoError(endpoint, circuito.segundos_para_reintentar())
+            
+            response = self._intento_con_cobertura(method, url, endpoint, **kwargs)
+            response.intentos = intento + 1
+            if circuito:
+                circuito.registrar_resultado(response)
+            
+            if not politica.debe_reintentar(response, intento):
+                if response.success and intento > 0:
+                    with self._lock_estadisticas:
+                        self.recuperados_con_reintento += 1
+                return response
+            
+            espera = politica.calcular_espera(intento, response.retry_after)
+            restante = self._tiempo_restante()
+            if restante is not None and espera >= restante:
+                logger.warning(f"Sin reintento: la espera de {espera:.1f}s supera el plazo restante "
+                               f"de la consulta ({max(restante, 0):.1f}s): {url}")
+                return response
+            
+            intento += 1
+            with self._lock_estadisticas:
+                self.reintentos_realizados += 1
+            logger.warning(f"Reintento {intento}/{politica.max_reintentos} en {espera:.1f}s "
+                           f"({response.error}): {url}")
+            self.planificador.esperar(espera, 'reintento')
+    
+    def _intento_con_cobertura(self, method: str, url: str, endpoint: Optional[str],
+                               **kwargs) -> APIResponse:
+        """
+        Intento con petición de cobertura (hedging) si tarda demasiado
+        
+        Si un GET no responde dentro del percentil APIConfig.HEDGE_PERCENTILE
+        de su endpoint se envía una copia y se usa la primera respuesta. La
+        copia pasa por _ejecutar_intento, así que también cuenta para el rate
+        limit, y las copias no superan APIConfig.HEDGE_BUDGET_PERCENT de las
+        peticiones. El umbral cuenta desde que la original sale, no mientras
+        espera su turno del planificador. La petición perdedora no se puede
+        interrumpir una vez enviada: se descarta su respuesta.
+        
+        Args:
+            method: Método HTTP
+            url: URL completa para la petición
+            endpoint: Nombre lógico del endpoint
+            **kwargs: Argumentos adicionales para requests
+            
+        Returns:
+            APIResponse de la primera petición en responder
+        """
+        umbral = None
+        if self.cobertura and endpoint and method.upper() == 'GET':
+            umbral = self.latencias.percentil(endpoint, APIConfig.HEDGE_PERCENTILE)
+        if umbral is None:
+            return self._ejecutar_intento(method, url, endpoint=endpoint, **kwargs)
+        
+        with self._lock_estadisticas:
+            self.peticiones_cubribles += 1
+        
+        intento = partial(self._ejecutar_intento, method, url, endpoint=endpoint, **kwargs)
+        enviada = threading.Event()
+        original = self._obtener_pool_originales().submit(
+            self._con_plazo_actual(self._intento_avisando_envio, intento, enviada))
+        pendientes = {original}
+        
+        enviada.wait()
+        listos, _ = wait(pendientes, timeout=umbral)
+        if not listos and self._reservar_cobertura():
+            logger.info(f"Sin respuesta tras {umbral:.2f}s, se envía petición de cobertura: {url}")
+            pendientes.add(self._obtener_pool_coberturas().submit(self._con_plazo_actual(intento)))
+        
+        while True:
+            listos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                response = futuro.result()
+                # Un fallo transitorio de una copia no decide si la otra sigue en vuelo
+                if response.transitorio and pendientes:
+                    continue
+                if futuro is not original:
+                    with self._lock_estadisticas:
+                        self.coberturas_ganadoras += 1
+                for perdedora in pendientes:
+                    perdedora.cancel()
+                return response
+    
+    def _intento_avisando_envio(self, intento: Callable[[], APIResponse],
+                                enviada: threading.Event) -> APIResponse:
+        """Ejecuta el intento original marcando el evento al salir la petición (o al terminar sin salir)"""
+        self._envio.al_enviar = enviada.set
+        try:
+            return intento()
+        finally:
+            self._envio.al_enviar = None
+            enviada.set()
+    
+    def _reservar_cobertura(self) -> bool:
+        """Cuenta una petición de cobertura si cabe en el presupuesto"""
+        with self._lock_estadisticas:
+            limite = self.peticiones_cubribles * APIConfig.HEDGE_BUDGET_PERCENT / 100
+            if self.coberturas_enviadas + 1 > limite:
+                return False
+            self.coberturas_enviadas += 1
+            return True
+    
+    def _obtener_pool_originales(self) -> ThreadPoolExecutor:
+        """
+        Pool de hilos para las peticiones originales con cobertura (se crea al primer uso)
+        
+        Tiene un hilo por cada hilo que puede pedir a la vez (consultas
+        simultáneas, detalle paralelo y páginas por adelantado), así que las
+        originales no hacen cola ni limitan la concurrencia.
+        """
+        with self._pool_lock:
+            if self._pool_originales is None:
+                self._pool_originales = ThreadPoolExecutor(
+                    max_workers=self._consultas_simultaneas + 2 * APIConfig.MAX_CONCURRENT_REQUESTS,
+                    thread_name_prefix="rama-judicial-original"
+                )
+            return self._pool_originales
+    
+    def _obtener_pool_coberturas(self) -> ThreadPoolExecutor:
+        """Pool de hilos para las copias de cobertura, aparte para no esperar detrás de las originales"""
+        with self._pool_lock:
+            if self._pool_coberturas is None:
+                self._pool_coberturas = ThreadPoolExecutor(
+                    max_workers=APIConfig.MAX_CONCURRENT_REQUESTS * 2,
+                    thread_name_prefix="rama-judicial-cobertura"
+                )
+            return self._pool_coberturas
+    
+    def _ejecutar_intento(self, method: str, url: str, endpoint: Optional[str] = None,
+                          **kwargs) -> APIResponse:
+        """
+        Realiza un único intento de petición HTTP
+        
+        Args:
+            method: Método HTTP (GET, POST, etc.)
+            url: URL completa para la petición
+            endpoint: Nombre lógico del endpoint (para timeouts y latencias)
+            **kwargs: Argumentos adicionales para requests
+            
+        Returns:
+            APIResponse con el resultado del intento
         """
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                timeout=APIConfig.REQUEST_TIMEOUT,
-                **kwargs
-            )
+            response = self._enviar(method, url, endpoint, **kwargs)
             
             # Manejar códigos de estado específicos
             if response.status_code == 404:
@@ -81,7 +541,19 @@ class RamaJudicialClient:
                 return APIResponse(
                     success=False,
                     error="Error interno del servidor",
-                    status_code=500
+                    status_code=500,
+                    transitorio=True,
+                    retry_after=parsear_retry_after(response.headers.get('Retry-After'))
+                )
+            
+            elif response.status_code > 500:
+                logger.error(f"Error del servidor ({response.status_code}): {url}")
+                return APIResponse(
+                    success=False,
+                    error=f"Servidor no disponible ({response.status_code})",
+                    status_code=response.status_code,
+                    transitorio=True,
+                    retry_after=parsear_retry_after(response.headers.get('Retry-After'))
                 )
             
             elif response.status_code == 429:
@@ -89,7 +561,9 @@ class RamaJudicialClient:
                 return APIResponse(
                     success=False,
                     error="Demasiadas peticiones - Rate limit alcanzado",
-                    status_code=429
+                    status_code=429,
+                    transitorio=True,
+                    retry_after=parsear_retry_after(response.headers.get('Retry-After'))
                 )
             
             # Verificar si la respuesta es exitosa
@@ -97,7 +571,9 @@ class RamaJudicialClient:
             
             # Intentar parsear JSON
             try:
-                data = response.json()
+                data = self.decodificar(response.content)
+                if self.proyectar_respuestas and endpoint in PROYECCIONES:
+                    data = PROYECCIONES[endpoint](data)
                 return APIResponse(success=True, data=data, status_code=response.status_code)
             except json.JSONDecodeError as e:
                 logger.error(f"Error al decodificar JSON: {e}")
@@ -109,11 +585,11 @@ class RamaJudicialClient:
                 
         except requests.exceptions.Timeout:
             logger.error(f"Timeout en petición a: {url}")
-            return APIResponse(success=False, error="Timeout en la petición")
+            return APIResponse(success=False, error="Timeout en la petición", transitorio=True)
             
         except requests.exceptions.ConnectionError:
             logger.error(f"Error de conexión a: {url}")
-            return APIResponse(success=False, error="Error de conexión")
+            return APIResponse(success=False, error="Error de conexión", transitorio=True)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Error en petición a {url}: {e}")
@@ -127,7 +603,8 @@ class RamaJudicialClient:
             numero_radicacion: Número de radicación del proceso
             
         Returns:
-            APIResponse con los datos del proceso o error
+            APIResponse con los datos del proceso o error (status_code 404
+            si la API no tiene procesos con ese número)
         """
         url = f"{self.base_url}{APIConfig.CONSULTA_RADICACION}"
         params = {
@@ -137,7 +614,7 @@ class RamaJudicialClient:
         }
         
         logger.debug(f"Consultando radicación: {numero_radicacion}")
-        response = self._make_request('GET', url, params=params)
+        response = self._make_request('GET', url, endpoint=APIConfig.Endpoint.RADICACION, params=params)
         
         if response.success and response.data:
             procesos = response.data.get('procesos', [])
@@ -146,7 +623,7 @@ class RamaJudicialClient:
                 return APIResponse(success=True, data=procesos[0])
             else:
                 logger.warning(f"No se encontraron procesos para: {numero_radicacion}")
-                return APIResponse(success=False, error="No se encontraron procesos")
+                return APIResponse(success=False, error="No se encontraron procesos", status_code=404)
         
         return response
     
@@ -163,7 +640,7 @@ class RamaJudicialClient:
         url = f"{self.base_url}{APIConfig.DETALLE_PROCESO}/{id_proceso}"
         
         logger.debug(f"Obteniendo detalles del proceso ID: {id_proceso}")
-        response = self._make_request('GET', url)
+        response = self._make_request('GET', url, endpoint=APIConfig.Endpoint.DETALLE)
         
         if response.success:
             logger.info(f"Detalles obtenidos para proceso ID: {id_proceso}")
@@ -187,7 +664,7 @@ class RamaJudicialClient:
         params = {'pagina': pagina}
         
         logger.debug(f"Obteniendo actuaciones del proceso ID: {id_proceso}")
-        response = self._make_request('GET', url, params=params)
+        response = self._make_request('GET', url, endpoint=APIConfig.Endpoint.ACTUACIONES, params=params)
         
         if response.success:
             logger.info(f"Actuaciones obtenidas para proceso ID: {id_proceso}")
@@ -196,62 +673,357 @@ class RamaJudicialClient:
         
         return response
     
-    def consultar_proceso_completo(self, numero_radicacion: str) -> Dict[str, Any]:
+    def _obtener_detalle_y_actuaciones(self, id_proceso: int,
+                                       conocidas: Optional[List[Dict[str, Any]]] = None
+                                       ) -> Tuple[APIResponse, APIResponse]:
+        """
+        Pide detalle y actuaciones simultáneamente
+        
+        Las actuaciones se piden en un hilo auxiliar mientras el detalle se
+        pide en el hilo actual. Ambas peticiones pasan por _make_request, así
+        que las dos cuentan para el rate limiting.
+        
+        Args:
+            id_proceso: ID del proceso
+            conocidas: Actuaciones ya guardadas (ver _obtener_actuaciones)
+            
+        Returns:
+            Tupla con (respuesta de detalle, respuesta de actuaciones)
+        """
+        futuro_actuaciones = self._obtener_pool().submit(
+            self._con_plazo_actual(self._obtener_actuaciones, id_proceso, conocidas=conocidas))
+        response_detalle = self.obtener_detalle_proceso(id_proceso)
+        return response_detalle, futuro_actuaciones.result()
+    
+    def _obtener_pool(self) -> ThreadPoolExecutor:
+        """Pool de hilos auxiliar para peticiones simultáneas (se crea al primer uso)"""
+        with self._pool_lock:
+            if self._pool_paralelo is None:
+                self._pool_paralelo = ThreadPoolExecutor(
+                    max_workers=APIConfig.MAX_CONCURRENT_REQUESTS,
+                    thread_name_prefix="rama-judicial-actuaciones"
+                )
+            return self._pool_paralelo
+    
+    def _obtener_pool_paginas(self) -> ThreadPoolExecutor:
+        """
+        Pool de hilos para las páginas de actuaciones pedidas por adelantado
+        
+        Es distinto de _obtener_pool: allí corre _obtener_actuaciones, que
+        espera estas páginas, y compartir el pool lo bloquearía con todos sus
+        hilos esperando páginas encoladas detrás de ellos.
+        """
+        with self._pool_lock:
+            if self._pool_paginas is None:
+                self._pool_paginas = ThreadPoolExecutor(
+                    max_workers=APIConfig.MAX_CONCURRENT_REQUESTS,
+                    thread_name_prefix="rama-judicial-paginas"
+                )
+            return self._pool_paginas
+    
+    def _iterar_paginas_actuaciones(self, id_proceso: int, prefetch: int,
+                                    max_paginas: int) -> Iterator[APIResponse]:
+        """
+        Recorre las páginas de actuaciones pidiendo por adelantado las siguientes
+        
+        El prefetch solo se usa cuando la respuesta informa el total de
+        páginas, para no pedir páginas que no existen. Se detiene tras la
+        primera página fallida (que también se entrega) o vacía.
+        
+        Args:
+            id_proceso: ID del proceso
+            prefetch: Páginas a pedir por adelantado
+            max_paginas: Máximo de páginas a recorrer
+            
+        Yields:
+            APIResponse de cada página en orden
+        """
+        pendientes = {}
+        total_paginas = None
+        pagina = 1
+        
+        try:
+            while pagina <= max_paginas and (total_paginas is None or pagina <= total_paginas):
+                futuro = pendientes.pop(pagina, None)
+                response = futuro.result() if futuro else self.obtener_actuaciones_proceso(id_proceso, pagina)
+                yield response
+                
+                if not response.success or not (response.data or {}).get('actuaciones'):
+                    return
+                
+                paginacion = response.data.get('paginacion') or {}
+                if paginacion.get('cantidadPaginas'):
+                    total_paginas = paginacion['cantidadPaginas']
+                
+                pagina += 1
+                if total_paginas is not None and prefetch > 0:
+                    ultima = min(pagina + prefetch - 1, total_paginas, max_paginas)
+                    for siguiente in range(pagina, ultima + 1):
+                        if siguiente not in pendientes:
+                            pendientes[siguiente] = self._obtener_pool_paginas().submit(self._con_plazo_actual(
+                                self.obtener_actuaciones_proceso, id_proceso, siguiente
+                            ))
+        finally:
+            # Las páginas ya enviadas no se pueden recuperar; solo se evita esperar las que no empezaron
+            for futuro in pendientes.values():
+                futuro.cancel()
+    
+    def iterar_actuaciones(self, id_proceso: int,
+                           detener_si: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                           prefetch: Optional[int] = None,
+                           max_paginas: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre perezosamente todas las actuaciones de un proceso, página a página
+        
+        Las páginas se piden solo a medida que se consumen, de modo que
+        cortar la iteración (o la condición de parada) ahorra las peticiones
+        restantes.
+        
+        Args:
+            id_proceso: ID del proceso
+            detener_si: Condición que detiene el recorrido al cumplirse para una
+                actuación (ver detener_antes_de y detener_en_conocidas); esa
+                actuación no se entrega
+            prefetch: Páginas a pedir por adelantado (default: APIConfig.ACTUACIONES_PREFETCH)
+            max_paginas: Máximo de páginas (default: APIConfig.ACTUACIONES_MAX_PAGINAS)
+            
+        Yields:
+            Cada actuación, de la más reciente a la más antigua
+        """
+        prefetch = APIConfig.ACTUACIONES_PREFETCH if prefetch is None else prefetch
+        max_paginas = max_paginas or APIConfig.ACTUACIONES_MAX_PAGINAS
+        
+        paginas = self._iterar_paginas_actuaciones(id_proceso, prefetch, max_paginas)
+        try:
+            for response in paginas:
+                if not response.success:
+                    logger.warning(f"Recorrido de actuaciones interrumpido para ID {id_proceso}: {response.error}")
+                    return
+                
+                for actuacion in response.data.get('actuaciones', []):
+                    if detener_si and detener_si(actuacion):
+                        logger.debug(f"Condición de parada alcanzada para ID {id_proceso}")
+                        return
+                    yield actuacion
+        finally:
+            paginas.close()
+    
+    def _obtener_actuaciones(self, id_proceso: int,
+                             detener_si: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                             conocidas: Optional[List[Dict[str, Any]]] = None) -> APIResponse:
+        """
+        Obtiene las actuaciones para la consulta completa
+        
+        Sin todas_las_actuaciones solo se pide la primera página; con ella
+        se recorren todas y se devuelven en una sola respuesta con el mismo
+        formato de la API. Con actuaciones conocidas el recorrido se detiene
+        en la primera ya guardada y se completa con las guardadas, sin pedir
+        las páginas restantes.
+        
+        Args:
+            id_proceso: ID del proceso
+            detener_si: Condición de parada del recorrido (opcional)
+            conocidas: Lista completa de actuaciones guardadas del proceso,
+                de la más reciente a la más antigua (opcional)
+            
+        Returns:
+            APIResponse con las actuaciones del proceso o error de la primera página
+        """
+        if not self.todas_las_actuaciones:
+            return self.obtener_actuaciones_proceso(id_proceso)
+        
+        posicion_conocida = {actuacion['idRegActuacion']: posicion
+                             for posicion, actuacion in enumerate(conocidas or [])
+                             if actuacion.get('idRegActuacion') is not None}
+        if posicion_conocida:
+            detener_si = detener_en_conocidas(posicion_conocida)
+        
+        actuaciones: List[Dict[str, Any]] = []
+        paginacion = None
+        paginas = self._iterar_paginas_actuaciones(
+            id_proceso, APIConfig.ACTUACIONES_PREFETCH, APIConfig.ACTUACIONES_MAX_PAGINAS
+        )
+        try:
+            for numero, response in enumerate(paginas, 1):
+                if not response.success:
+                    if numero == 1:
+                        return response
+                    logger.warning(f"Actuaciones incompletas para ID {id_proceso} (página {numero}): {response.error}")
+                    return APIResponse(success=True, data={'actuaciones': actuaciones, 'paginacion': paginacion},
+                                       incompleta=True)
+                
+                paginacion = paginacion or response.data.get('paginacion')
+                for actuacion in response.data.get('actuaciones', []):
+                    if detener_si and detener_si(actuacion):
+                        if posicion_conocida:
+                            logger.debug(f"Actuaciones nuevas de ID {id_proceso}: {len(actuaciones)}, "
+                                         f"el resto se toma del estado guardado")
+                            actuaciones.extend(conocidas[posicion_conocida[actuacion['idRegActuacion']]:])
+                        return APIResponse(success=True, data={'actuaciones': actuaciones, 'paginacion': paginacion})
+                    actuaciones.append(actuacion)
+        finally:
+            paginas.close()
+        
+        return APIResponse(success=True, data={'actuaciones': actuaciones, 'paginacion': paginacion})
+    
+    def consultar_proceso_completo(self, numero_radicacion: str,
+                                   paralelo: Optional[bool] = None) -> Dict[str, Any]:
         """
         Realiza una consulta completa de un proceso (radicación + detalles + actuaciones)
         
+        Con estado incremental, si fechaUltimaActuacion coincide con la de la
+        última consulta se reutilizan el detalle y las actuaciones guardados
+        y solo se hace la petición de radicación. Con índice, los radicados
+        con idProceso conocido van directo a detalle y actuaciones; si ese
+        ID responde 404 se descarta y se vuelve a consultar por radicación.
+        
         Args:
             numero_radicacion: Número de radicación del proceso
+            paralelo: Si pedir detalle y actuaciones a la vez, sin la pausa
+                entre requests (default: self.detalle_paralelo)
             
         Returns:
-            Diccionario con toda la información del proceso o None si falla
+            Diccionario con toda la información del proceso (status NOT_FOUND
+            si el radicado no existe) o None si falla
+            
+        Raises:
+            CircuitoAbiertoError: Si la API se considera caída; el radicado
+                debe reintentarse más tarde
+        """
+        return self._con_plazo(self._consultar_proceso_completo, numero_radicacion, paralelo)
+    
+    def _con_plazo(self, consulta: Callable[..., Any], *args) -> Any:
+        """Ejecuta una consulta completa dentro del plazo del radicado"""
+        # Plazo total del radicado: ningún reintento ni timeout lo extiende
+        anidada = getattr(self._plazo, 'limite', None) is not None
+        if not anidada:
+            self._fallo.transitorio = False
+        if APIConfig.RADICADO_TIME_BUDGET and not anidada:
+            self._plazo.limite = time.monotonic() + APIConfig.RADICADO_TIME_BUDGET
+        try:
+            return consulta(*args)
+        finally:
+            if not anidada:
+                self._plazo.limite = None
+    
+    def fallo_transitorio(self) -> bool:
+        """
+        Indica si la última consulta completa de este hilo falló por un error
+        transitorio (timeout, conexión, 429 o 5xx) y vale la pena repetirla más tarde
+        
+        Returns:
+            True si consultar_proceso_completo devolvió None por un error transitorio
+        """
+        return getattr(self._fallo, 'transitorio', False)
+    
+    def _consultar_proceso_completo(self, numero_radicacion: str, paralelo: Optional[bool],
+                                    omitir_privado: bool = False) -> Dict[str, Any]:
+        """
+        Consulta completa sin el control del plazo (ver consultar_proceso_completo)
+        
+        Con omitir_privado no se sirve el privado de la caché: es la
+        consulta que lo revalida.
         """
         logger.info(f"Iniciando consulta completa para: {numero_radicacion}")
         
-        # Paso 1: Consultar por radicación
-        response_basico = self.consultar_por_radicacion(numero_radicacion)
-        if not response_basico.success:
-            logger.error(f"Error en consulta básica para {numero_radicacion}: {response_basico.error}")
-            return None
+        if self.cache and self.cache.es_no_encontrado(numero_radicacion):
+            logger.info(f"Radicado no encontrado en una consulta reciente, se omite: {numero_radicacion}")
+            return self._resultado_no_encontrado(numero_radicacion)
         
-        proceso_basico = response_basico.data
-        
-        # Verificar si es proceso privado
-        es_privado = proceso_basico.get('esPrivado', False)
-        if es_privado:
-            logger.info(f"Proceso privado detectado: {numero_radicacion}")
-            return {
-                'radicado': numero_radicacion,
-                'es_privado': True,
-                'proceso_basico': proceso_basico,
-                'detalle': None,
-                'actuaciones': None,
-                'status': ProcessConfig.Status.PRIVATE
-            }
+        privado = self.cache.obtener_privado(numero_radicacion) if self.cache and not omitir_privado else None
+        if privado:
+            proceso_basico, revalidar = privado
+            if revalidar and self._revalidar_privado_en_linea(numero_radicacion):
+                try:
+                    return self._revalidar_privado(numero_radicacion, proceso_basico, paralelo)
+                except CircuitoAbiertoError as e:
+                    logger.warning(f"Revalidación de {numero_radicacion} omitida: {e}")
+            
+            logger.info(f"Proceso privado reutilizado de la caché: {numero_radicacion}")
+            if revalidar:
+                with self._lock_estadisticas:
+                    self._privados_por_revalidar.setdefault(numero_radicacion, proceso_basico)
+            return self._resultado_privado(numero_radicacion, proceso_basico)
         
-        # Obtener ID del proceso
-        id_proceso = proceso_basico.get('idProceso')
-        if not id_proceso:
-            logger.error(f"No se pudo obtener ID del proceso para: {numero_radicacion}")
-            return None
+        if paralelo is None:
+            paralelo = self.detalle_paralelo
         
-        logger.debug(f"ID del proceso obtenido: {id_proceso}")
+        anterior = self.estado.obtener(numero_radicacion) if self.estado else None
         
-        # Pausa entre requests
-        time.sleep(APIConfig.DELAY_BETWEEN_REQUESTS)
+        # Con idProceso conocido se salta la consulta por radicación, salvo en
+        # modo incremental con estado guardado: ahí esa consulta es la que
+        # permite no pedir detalle ni actuaciones
+        indexado = self.indice.buscar(numero_radicacion) if self.indice and not anterior else None
+        if indexado:
+            id_proceso = indexado['id_proceso']
+            proceso_basico = indexado['proceso_basico']
+            logger.debug(f"ID del proceso tomado del índice: {id_proceso}")
+            
+            response_detalle, response_actuaciones = self._consultar_detalle_y_actuaciones(id_proceso, paralelo)
+            if response_detalle.status_code == 404:
+                logger.warning(f"ID {id_proceso} del índice ya no existe, se revalida: {numero_radicacion}")
+                self.indice.invalidar(numero_radicacion)
+                indexado = None
+        
+        if not indexado:
+            # Paso 1: Consultar por radicación
+            response_basico = self.consultar_por_radicacion(numero_radicacion)
+            if response_basico.status_code == 404:
+                logger.warning(f"Radicado no encontrado: {numero_radicacion}")
+                if self.cache:
+                    self.cache.registrar_no_encontrado(numero_radicacion)
+                return self._resultado_no_encontrado(numero_radicacion)
+            
+            if not response_basico.success:
+                logger.error(f"Error en consulta básica para {numero_radicacion}: {response_basico.error}")
+                self._fallo.transitorio = response_basico.transitorio
+                return None
+            
+            proceso_basico = response_basico.data
+            
+            # Verificar si es proceso privado
+            es_privado = proceso_basico.get('esPrivado', False)
+            if es_privado:
+                logger.info(f"Proceso privado detectado: {numero_radicacion}")
+                if self.cache:
+                    self.cache.guardar_privado(numero_radicacion, proceso_basico)
+                return self._resultado_privado(numero_radicacion, proceso_basico)
+            
+            # Obtener ID del proceso
+            id_proceso = proceso_basico.get('idProceso')
+            if not id_proceso:
+                logger.error(f"No se pudo obtener ID del proceso para: {numero_radicacion}")
+                return None
+            
+            logger.debug(f"ID del proceso obtenido: {id_proceso}")
+            if self.indice:
+                self.indice.guardar(numero_radicacion, id_proceso, proceso_basico)
+            
+            if anterior and self._sin_cambios(anterior, id_proceso, proceso_basico):
+                logger.info(f"Sin actuaciones nuevas, se reutiliza el estado guardado: {numero_radicacion}")
+                self.estado.marcar_vigente(numero_radicacion)
+                with self._lock_estadisticas:
+                    self.procesos_sin_cambios += 1
+                return dict(anterior['resultado'], proceso_basico=proceso_basico, sin_cambios=True)
+            
+            response_detalle, response_actuaciones = self._consultar_detalle_y_actuaciones(
+                id_proceso, paralelo, self._actuaciones_conocidas(anterior, id_proceso)
+            )
         
-        # Paso 2: Obtener detalles
-        response_detalle = self.obtener_detalle_proceso(id_proceso)
         if not response_detalle.success:
             logger.error(f"Error al obtener detalles para ID {id_proceso}: {response_detalle.error}")
+            self._fallo.transitorio = response_detalle.transitorio
             return None
         
-        # Paso 3: Obtener actuaciones (opcional)
-        response_actuaciones = self.obtener_actuaciones_proceso(id_proceso)
         actuaciones = response_actuaciones.data if response_actuaciones.success else None
         
         if not response_actuaciones.success:
             logger.warning(f"No se pudieron obtener actuaciones para ID {id_proceso}, continuando...")
+        elif indexado:
+            # El proceso_basico del índice puede ser viejo: la fecha sale de las actuaciones
+            lista = actuaciones.get('actuaciones') or []
+            if lista and lista[0].get('fechaActuacion'):
+                proceso_basico['fechaUltimaActuacion'] = lista[0]['fechaActuacion']
         
         resultado = {
             'radicado': numero_radicacion,
@@ -260,14 +1032,273 @@ class RamaJudicialClient:
             'proceso_basico': proceso_basico,
             'detalle': response_detalle.data,
             'actuaciones': actuaciones,
+            # Con todas las páginas, la próxima consulta puede detenerse en las ya guardadas
+            'actuaciones_completas': (self.todas_las_actuaciones and response_actuaciones.success
+                                      and not response_actuaciones.incompleta),
             'status': ProcessConfig.Status.SUCCESS
         }
         
+        # Solo se guarda un resultado completo para no reutilizar datos a medias
+        if self.estado and response_actuaciones.success:
+            self.estado.guardar(numero_radicacion, resultado)
+            with self._lock_estadisticas:
+                self.procesos_actualizados += 1
+        
         logger.info(f"Consulta completa exitosa para: {numero_radicacion}")
         return resultado
     
+    def _consultar_detalle_y_actuaciones(self, id_proceso: int, paralelo: bool,
+                                         conocidas: Optional[List[Dict[str, Any]]] = None
+                                         ) -> Tuple[APIResponse, Optional[APIResponse]]:
+        """
+        Pasos 2 y 3 de la consulta completa
+        
+        Args:
+            id_proceso: ID del proceso
+            paralelo: Si pedir ambos a la vez
+            conocidas: Actuaciones ya guardadas (ver _obtener_actuaciones)
+            
+        Returns:
+            Tupla (detalle, actuaciones); en modo secuencial las actuaciones
+            son None si el detalle falló
+        """
+        if paralelo:
+            # Pasos 2 y 3 a la vez: no dependen entre sí
+            return self._obtener_detalle_y_actuaciones(id_proceso, conocidas)
+        
+        # Paso 2: Obtener detalles
+        response_detalle = self.obtener_detalle_proceso(id_proceso)
+        if not response_detalle.success:
+            return response_detalle, None
+        
+        # Paso 3: Obtener actuaciones (opcional)
+        return response_detalle, self._obtener_actuaciones(id_proceso, conocidas=conocidas)
+    
+    def _actuaciones_conocidas(self, anterior: Optional[Dict[str, Any]],
+                               id_proceso: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Actuaciones guardadas en las que puede detenerse el recorrido de páginas
+        
+        Args:
+            anterior: Estado guardado del radicado (ver ProcessStateStore.obtener)
+            id_proceso: ID del proceso en la consulta actual
+            
+        Returns:
+            Lista completa de actuaciones guardadas, o None si no hay una
+            lista completa del mismo proceso
+        """
+        if not (self.todas_las_actuaciones and anterior and anterior['id_proceso'] == id_proceso):
+            return None
+        resultado = anterior['resultado']
+        if not resultado.get('actuaciones_completas'):
+            return None
+        return (resultado.get('actuaciones') or {}).get('actuaciones')
+    
+    @staticmethod
+    def _resultado_privado(numero_radicacion: str, proceso_basico: Dict[str, Any]) -> Dict[str, Any]:
+        """Resultado de un proceso privado: solo el registro básico"""
+        return {
+            'radicado': numero_radicacion,
+            'es_privado': True,
+            'proceso_basico': proceso_basico,
+            'detalle': None,
+            'actuaciones': None,
+            'status': ProcessConfig.Status.PRIVATE
+        }
+    
+    @staticmethod
+    def _resultado_no_encontrado(numero_radicacion: str) -> Dict[str, Any]:
+        """Resultado de un radicado que la API no tiene"""
+        return {
+            'radicado': numero_radicacion,
+            'es_privado': False,
+            'proceso_basico': None,
+            'detalle': None,
+            'actuaciones': None,
+            'status': ProcessConfig.Status.NOT_FOUND
+        }
+    
+    @staticmethod
+    def _sin_cambios(anterior: Dict[str, Any], id_proceso: int, proceso_basico: Dict[str, Any]) -> bool:
+        """
+        Indica si el proceso no cambió desde el estado guardado
+        
+        Args:
+            anterior: Estado guardado (ver ProcessStateStore.obtener)
+            id_proceso: ID del proceso en la consulta actual
+            proceso_basico: Datos de la consulta por radicación actual
+            
+        Returns:
+            True si el estado guardado sigue vigente
+        """
+        fecha_actual = proceso_basico.get('fechaUltimaActuacion')
+        return (bool(fecha_actual)
+                and anterior['ultimo_status'] == ProcessConfig.Status.SUCCESS
+                and anterior['id_proceso'] == id_proceso
+                and anterior['fecha_ultima_actuacion'] == fecha_actual)
+    
+    def _revalidar_privado_en_linea(self, numero_radicacion: str) -> bool:
+        """
+        Indica si un privado viejo de la caché se revalida en este momento
+        
+        Solo con revalidar_privados_en_linea y mientras no se haya alcanzado
+        CacheConfig.PRIVATE_REVALIDATE_PER_RUN; si no, el privado se sirve de
+        la caché y queda en cola para revalidar_privados.
+        
+        Args:
+            numero_radicacion: Radicado privado con entrada vieja
+            
+        Returns:
+            True si la consulta debe seguir contra la API
+        """
+        if not self.revalidar_privados_en_linea or self.cache.solo_cache:
+            return False
+        
+        with self._lock_estadisticas:
+            if self.privados_revalidados >= CacheConfig.PRIVATE_REVALIDATE_PER_RUN:
+                return False
+            self.privados_revalidados += 1
+        return True
+    
+    def _revalidar_privado(self, numero_radicacion: str, proceso_basico: Dict[str, Any],
+                           paralelo: Optional[bool]) -> Dict[str, Any]:
+        """
+        Vuelve a consultar un privado de la caché sin descartarlo antes
+        
+        La entrada solo cambia con una respuesta de la API: se reemplaza si
+        sigue siendo privado y se elimina si no. Si la consulta falla se
+        devuelve el privado guardado en lugar de un fallo.
+        
+        Args:
+            numero_radicacion: Radicado privado con entrada vieja
+            proceso_basico: Registro básico guardado en la caché
+            paralelo: Ver consultar_proceso_completo
+            
+        Returns:
+            Resultado de la consulta, o el del privado guardado si falló
+            
+        Raises:
+            CircuitoAbiertoError: Si la API se considera caída (la entrada se conserva)
+        """
+        logger.info(f"Revalidando proceso privado: {numero_radicacion}")
+        resultado = self._consultar_proceso_completo(numero_radicacion, paralelo, omitir_privado=True)
+        if resultado is None:
+            logger.warning(f"Revalidación fallida, se conserva el privado de la caché: {numero_radicacion}")
+            self._fallo.transitorio = False
+            return self._resultado_privado(numero_radicacion, proceso_basico)
+        
+        if not resultado.get('es_privado'):
+            self.cache.invalidar_privado(numero_radicacion)
+        return resultado
+    
+    def revalidar_privados(self, limite: Optional[int] = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Carril de baja prioridad: vuelve a consultar privados de la caché
+        
+        Los privados cuya entrada superó CacheConfig.PRIVATE_REVALIDATE_AFTER
+        se sirven de la caché durante la ejecución y quedan en cola; esta
+        revisión se hace al final, cuando ya no compite con la consulta
+        principal por el rate limit.
+        
+        Args:
+            limite: Máximo de privados a revisar (default: lo que queda de
+                CacheConfig.PRIVATE_REVALIDATE_PER_RUN); el resto espera otra ejecución
+            
+        Yields:
+            Tuplas (radicado, resultado de la consulta o el del privado
+            guardado si la consulta falló)
+        """
+        if not self.cache or self.cache.solo_cache:
+            return
+        
+        with self._lock_estadisticas:
+            if limite is None:
+                limite = max(CacheConfig.PRIVATE_REVALIDATE_PER_RUN - self.privados_revalidados, 0)
+            pendientes = list(self._privados_por_revalidar.items())[:limite]
+            for radicado, _ in pendientes:
+                del self._privados_por_revalidar[radicado]
+        
+        for radicado, proceso_basico in pendientes:
+            try:
+                resultado = self._con_plazo(self._revalidar_privado, radicado, proceso_basico, None)
+            except CircuitoAbiertoError as e:
+                logger.warning(f"Revalidación de privados suspendida: {e}")
+                return
+            
+            with self._lock_estadisticas:
+                self.privados_revalidados += 1
+            yield radicado, resultado
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de ejecución del cliente para el resumen final
+        
+        Returns:
+            Diccionario con una sección por componente del cliente
+        """
+        estadisticas = {
+            'planificador': self.planificador.obtener_estadisticas(),
+            'reintentos': {
+                'reintentos_realizados': self.reintentos_realizados,
+                'peticiones_recuperadas': self.recuperados_con_reintento
+            },
+            'coalescencia': {
+                'peticiones_compartidas': self._peticiones_en_vuelo.compartidas
+            },
+            'circuitos': {
+                endpoint: circuito.obtener_estadisticas() for endpoint, circuito in self.circuitos.items()
+            }
+        }
+        latencias = self.latencias.obtener_estadisticas()
+        if self.plazos_agotados:
+            latencias['plazos_agotados'] = self.plazos_agotados
+        if latencias:
+            estadisticas['latencias'] = latencias
+        if self.cobertura:
+            estadisticas['coberturas'] = {
+                'peticiones_cubribles': self.peticiones_cubribles,
+                'coberturas_enviadas': self.coberturas_enviadas,
+                'coberturas_ganadoras': self.coberturas_ganadoras
+            }
+        if self.cache:
+            estadisticas['cache'] = self.cache.obtener_estadisticas()
+            estadisticas['cache']['privados_revalidados'] = self.privados_revalidados
+        if self.estado:
+            estadisticas['sincronizacion'] = {
+                'procesos_sin_cambios': self.procesos_sin_cambios,
+                'procesos_actualizados': self.procesos_actualizados
+            }
+        if self.indice:
+            estadisticas['indice_procesos'] = self.indice.obtener_estadisticas()
+        return estadisticas
+    
     def close(self):
         """Cierra la sesión HTTP"""
+        if self._pool_paralelo:
+            self._pool_paralelo.shutdown(wait=True)
+            self._pool_paralelo = None
+        
+        if self._pool_paginas:
+            self._pool_paginas.shutdown(wait=True)
+            self._pool_paginas = None
+        
+        if self._pool_originales:
+            self._pool_originales.shutdown(wait=True)
+            self._pool_originales = None
+        
+        if self._pool_coberturas:
+            self._pool_coberturas.shutdown(wait=True)
+            self._pool_coberturas = None
+        
+        if self.cache:
+            self.cache.close()
+        
+        if self.estado:
+            self.estado.close()
+        
+        if self.indice:
+            self.indice.close()
+        
         if self.session:
             self.session.close()
             logger.info("Sesión API cerrada")
@@ -284,36 +1315,237 @@ class RamaJudicialClient:
 class RateLimitedClient(RamaJudicialClient):
     """Cliente con control de rate limiting automático"""
     
-    def __init__(self, requests_per_minute: int = 20):
+    def __init__(self, requests_per_minute: int = 20, limiter: Optional[RateLimiter] = None, **kwargs):
         """
         Args:
             requests_per_minute: Máximo número de requests por minuto
+            limiter: Limitador a usar (default: según APIConfig.RATE_LIMITER)
+            **kwargs: Opciones adicionales para RamaJudicialClient
         """
-        super().__init__()
+        super().__init__(**kwargs)
         self.requests_per_minute = requests_per_minute
-        self.request_times = []
-        logger.info(f"Cliente con rate limiting inicializado: {requests_per_minute} requests/min")
-    
-    def _enforce_rate_limit(self):
-        """Enforza el límite de peticiones por minuto"""
-        now = time.time()
-        
-        # Limpiar requests antiguos (más de 1 minuto)
-        self.request_times = [t for t in self.request_times if now - t < 60]
-        
-        # Si hemos alcanzado el límite, esperar
-        if len(self.request_times) >= self.requests_per_minute:
-            sleep_time = 60 - (now - self.request_times[0])
-            if sleep_time > 0:
-                logger.info(f"Rate limit alcanzado, esperando {sleep_time:.1f} segundos")
-                time.sleep(sleep_time)
-                # Limpiar lista después de esperar
-                self.request_times = []
-        
-        # Registrar este request
-        self.request_times.append(now)
-    
-    def _make_request(self, method: str, url: str, **kwargs) -> APIResponse:
-        """Override para incluir rate limiting"""
-        self._enforce_rate_limit()
-        return super()._make_request(method, url, **kwargs)
\ No newline at end of file
+        self.limiter = limiter or crear_limitador(requests_per_minute=requests_per_minute)
+        self.planificador = RequestScheduler(self.limiter)
+        logger.info(f"Cliente con rate limiting inicializado: {requests_per_minute} requests/min "
+                    f"({type(self.limiter).__name__})")
+    
+    def _ejecutar_intento(self, method: str, url: str, **kwargs) -> APIResponse:
+        """
+        Override para informar cada respuesta al limitador
+        
+        El turno de cada intento (reintentos incluidos) lo da el planificador,
+        que espera al limitador antes de enviar.
+        """
+        self._envio.inicio = None
+        response = super()._ejecutar_intento(method, url, **kwargs)
+        
+        # Retroalimentación para limitadores adaptativos (sin contar la espera del turno)
+        inicio = self._envio.inicio
+        self.limiter.registrar_respuesta(response.status_code, time.monotonic() - inicio if inicio else 0.0)
+        return response
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Agrega las estadísticas del limitador"""
+        estadisticas = super().obtener_estadisticas()
+        estadisticas_limiter = self.limiter.obtener_estadisticas()
+        if estadisticas_limiter:
+            estadisticas['rate_limit'] = estadisticas_limiter
+        return estadisticas
+
+
+class AsyncRamaJudicialClient:
+    """
+    Cliente asíncrono con concurrencia acotada
+    
+    Envuelve un cliente síncrono y ejecuta sus llamadas en un pool de hilos,
+    de modo que rate limiting y manejo de errores son los mismos del cliente
+    bloqueante mientras varias peticiones esperan la red a la vez.
+    """
+    
+    def __init__(self, max_concurrencia: int = APIConfig.MAX_CONCURRENT_REQUESTS,
+                 cliente: Optional[RamaJudicialClient] = None):
+        """
+        Args:
+            max_concurrencia: Máximo número de peticiones en vuelo
+            cliente: Cliente síncrono a envolver (default: RateLimitedClient)
+        """
+        if max_concurrencia < 1:
+            raise ValueError("max_concurrencia debe ser al menos 1")
+        
+        self.max_concurrencia = max_concurrencia
+        self.cliente = cliente or RateLimitedClient(
+            requests_per_minute=APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
+        )
+        self.cliente.limitar_peticiones_en_vuelo(max_concurrencia)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrencia,
+            thread_name_prefix="rama-judicial"
+        )
+        self._consultas_en_vuelo: Dict[str, asyncio.Future] = {}
+        self.consultas_compartidas = 0
+        logger.info(f"Cliente asíncrono inicializado: {max_concurrencia} peticiones simultáneas")
+    
+    async def _ejecutar(self, funcion, *args, **kwargs):
+        """Ejecuta una llamada bloqueante del cliente en el pool de hilos"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(funcion, *args, **kwargs))
+    
+    async def consultar_por_radicacion(self, numero_radicacion: str) -> APIResponse:
+        """Versión asíncrona de RamaJudicialClient.consultar_por_radicacion"""
+        return await self._ejecutar(self.cliente.consultar_por_radicacion, numero_radicacion)
+    
+    async def obtener_detalle_proceso(self, id_proceso: int) -> APIResponse:
+        """Versión asíncrona de RamaJudicialClient.obtener_detalle_proceso"""
+        return await self._ejecutar(self.cliente.obtener_detalle_proceso, id_proceso)
+    
+    async def obtener_actuaciones_proceso(self, id_proceso: int, pagina: int = 1) -> APIResponse:
+        """Versión asíncrona de RamaJudicialClient.obtener_actuaciones_proceso"""
+        return await self._ejecutar(self.cliente.obtener_actuaciones_proceso, id_proceso, pagina)
+    
+    async def iterar_actuaciones(self, id_proceso: int,
+                                 detener_si: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                                 prefetch: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Versión asíncrona de RamaJudicialClient.iterar_actuaciones"""
+        iterador = self.cliente.iterar_actuaciones(id_proceso, detener_si, prefetch)
+        fin = object()
+        try:
+            while True:
+                actuacion = await self._ejecutar(next, iterador, fin)
+                if actuacion is fin:
+                    return
+                yield actuacion
+        finally:
+            iterador.close()
+    
+    async def consultar_proceso_completo(self, numero_radicacion: str,
+                                         paralelo: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Versión asíncrona de RamaJudicialClient.consultar_proceso_completo
+        
+        Si el mismo radicado ya se está consultando se espera esa consulta
+        en lugar de lanzar otra.
+        """
+        en_vuelo = self._consultas_en_vuelo.get(numero_radicacion)
+        if en_vuelo is not None:
+            self.consultas_compartidas += 1
+            return await asyncio.shield(en_vuelo)
+        
+        futuro = asyncio.ensure_future(self._ejecutar(
+            self.cliente.consultar_proceso_completo, numero_radicacion, paralelo=paralelo
+        ))
+        self._consultas_en_vuelo[numero_radicacion] = futuro
+        try:
+            return await asyncio.shield(futuro)
+        finally:
+            if self._consultas_en_vuelo.get(numero_radicacion) is futuro:
+                del self._consultas_en_vuelo[numero_radicacion]
+    
+    async def consultar_lote(self, radicados: Iterable[str], max_pausa_total: Optional[float] = None
+                             ) -> AsyncIterator[Tuple[int, str, Optional[Dict[str, Any]]]]:
+        """
+        Consulta un lote de radicados entregando cada resultado al terminar
+        
+        Solo mantiene max_concurrencia consultas activas, por lo que el lote
+        puede ser arbitrariamente grande sin crear una tarea por radicado.
+        Si un circuito se abre, los radicados afectados vuelven a la cola y
+        el lote se pausa hasta la petición de prueba en lugar de fallar.
+        
+        Args:
+            radicados: Radicados a consultar
+            max_pausa_total: Segundos máximos de pausa acumulada por circuitos
+                abiertos; después se entregan como fallidos
+                (default: APIConfig.CIRCUIT_MAX_TOTAL_PAUSE)
+            
+        Yields:
+            Tuplas (índice en la entrada, radicado, resultado o None si falla)
+        """
+        if max_pausa_total is None:
+            max_pausa_total = APIConfig.CIRCUIT_MAX_TOTAL_PAUSE
+        
+        pendientes = {}
+        reencolados = deque()
+        entrada = iter(enumerate(radicados))
+        pausa_total = 0.0
+        
+        def lanzar_siguiente() -> bool:
+            siguiente = reencolados.popleft() if reencolados else next(entrada, None)
+            if siguiente is None:
+                return False
+            indice, radicado = siguiente
+            tarea = asyncio.ensure_future(self.consultar_proceso_completo(radicado))
+            pendientes[tarea] = (indice, radicado)
+            return True
+        
+        for _ in range(self.max_concurrencia):
+            if not lanzar_siguiente():
+                break
+        
+        try:
+            while pendientes:
+                terminadas, _ = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+                pausa = 0.0
+                for tarea in terminadas:
+                    indice, radicado = pendientes.pop(tarea)
+                    try:
+                        resultado = tarea.result()
+                    except CircuitoAbiertoError as e:
+                        if pausa_total < max_pausa_total:
+                            logger.warning(f"{e}: {radicado} vuelve a la cola")
+                            reencolados.append((indice, radicado))
+                            pausa = max(pausa, e.espera, 1.0)
+                            continue
+                        logger.error(f"API no disponible, se agotó la pausa máxima: {radicado}")
+                        resultado = None
+                    except Exception as e:
+                        logger.error(f"Error inesperado consultando {radicado}: {e}")
+                        resultado = None
+                    
+                    lanzar_siguiente()
+                    yield indice, radicado, resultado
+                
+                if pausa:
+                    logger.warning(f"Lote en pausa {pausa:.0f}s por circuito abierto")
+                    pausa_total += pausa
+                    await asyncio.sleep(pausa)
+                
+                while len(pendientes) < self.max_concurrencia and lanzar_siguiente():
+                    pass
+        finally:
+            # Las llamadas ya en el pool terminan solas; solo se cancelan las esperas
+            for tarea in pendientes:
+                tarea.cancel()
+    
+    def precalentar(self, conexiones: Optional[int] = None) -> int:
+        """Abre conexiones del cliente envuelto antes del lote"""
+        return self.cliente.precalentar(conexiones)
+    
+    def revalidar_privados(self, limite: Optional[int] = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Carril de revalidación de privados del cliente envuelto (secuencial)"""
+        return self.cliente.revalidar_privados(limite)
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Estadísticas del cliente envuelto más las consultas coalescidas"""
+        estadisticas = self.cliente.obtener_estadisticas()
+        estadisticas.setdefault('coalescencia', {})['consultas_compartidas'] = self.consultas_compartidas
+        return estadisticas
+    
+    def close(self):
+        """Detiene el pool de hilos y cierra el cliente envuelto"""
+        self._executor.shutdown(wait=True)
+        self.cliente.close()
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        self.close()
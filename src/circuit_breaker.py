@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Circuit breaker por endpoint para la API de la Rama Judicial
+
+Tras varios fallos transitorios seguidos el circuito se abre y las
+peticiones se rechazan al instante durante el enfriamiento, en lugar de
+esperar el timeout completo contra un portal caído. Pasado el enfriamiento
+se deja pasar una petición de prueba (semiabierto) que decide si cerrar
+o volver a abrir.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Circuito cerrado / abierto / semiabierto para un endpoint"""
+    
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+    
+    def __init__(self, nombre: str, umbral_fallos: Optional[int] = None,
+                 enfriamiento: Optional[float] = None, reloj: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            nombre: Endpoint protegido (para logs y estadísticas)
+            umbral_fallos: Fallos transitorios seguidos que abren el circuito
+                (default: APIConfig.CIRCUIT_FAILURE_THRESHOLD)
+            enfriamiento: Segundos abierto antes de la petición de prueba
+                (default: APIConfig.CIRCUIT_COOLDOWN)
+            reloj: Función monotónica de tiempo
+        """
+        self.nombre = nombre
+        self.umbral_fallos = umbral_fallos or APIConfig.CIRCUIT_FAILURE_THRESHOLD
+        self.enfriamiento = APIConfig.CIRCUIT_COOLDOWN if enfriamiento is None else enfriamiento
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        
+        self.estado = self.CERRADO
+        self.fallos_consecutivos = 0
+        self.aperturas = 0
+        self.rechazadas = 0
+        self._abierto_desde = 0.0
+        self._prueba_en_curso = False
+    
+    def permitir(self) -> bool:
+        """
+        Indica si una petición puede salir
+        
+        Returns:
+            False si el circuito está abierto (o ya hay una prueba en curso)
+        """
+        with self._lock:
+            if self.estado == self.CERRADO:
+                return True
+            
+            if self.estado == self.ABIERTO:
+                if self._reloj() - self._abierto_desde < self.enfriamiento:
+                    self.rechazadas += 1
+                    return False
+                logger.info(f"Circuito '{self.nombre}' semiabierto: petición de prueba")
+                self.estado = self.SEMIABIERTO
+            
+            if self._prueba_en_curso:
+                self.rechazadas += 1
+                return False
+            
+            self._prueba_en_curso = True
+            return True
+    
+    def registrar_resultado(self, response) -> None:
+        """
+        Actualiza el circuito con el resultado de una petición
+        
+        Solo cuentan como fallo los transitorios (timeout, conexión, 5xx);
+        un 404 o un 429 indican que el servidor responde.
+        
+        Args:
+            response: APIResponse del intento
+        """
+        fallo = response.transitorio and response.status_code != 429
+        
+        with self._lock:
+            self._prueba_en_curso = False
+            
+            if not fallo:
+                if self.estado != self.CERRADO:
+                    logger.info(f"Circuito '{self.nombre}' cerrado: el servidor responde")
+                self.estado = self.CERRADO
+                self.fallos_consecutivos = 0
+                return
+            
+            self.fallos_consecutivos += 1
+            if self.estado == self.SEMIABIERTO or self.fallos_consecutivos >= self.umbral_fallos:
+                if self.estado != self.ABIERTO:
+                    self.aperturas += 1
+                    logger.warning(f"Circuito '{self.nombre}' abierto tras {self.fallos_consecutivos} "
+                                   f"fallos seguidos; pausa de {self.enfriamiento:.0f}s")
+                self.estado = self.ABIERTO
+                self._abierto_desde = self._reloj()
+    
+    def segundos_para_reintentar(self) -> float:
+        """Segundos hasta que el circuito admita una petición de prueba"""
+        with self._lock:
+            if self.estado != self.ABIERTO:
+                return 0.0
+            return max(0.0, self.enfriamiento - (self._reloj() - self._abierto_desde))
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene el estado del circuito
+        
+        Returns:
+            Diccionario con estado, aperturas y peticiones rechazadas
+        """
+        return {
+            'estado': self.estado,
+            'aperturas': self.aperturas,
+            'rechazadas': self.rechazadas
+        }
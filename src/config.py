@@ -6,6 +6,8 @@ Configuraciones y constantes para el sistema de consulta de procesos judiciales
 
 import os
 import logging
+import tempfile
+import configparser
 from pathlib import Path
 from typing import Dict, Any
 
@@ -13,6 +15,12 @@ from typing import Dict, Any
 class APIConfig:
     """Configuración para la API de la Rama Judicial"""
     
+    class Endpoint:
+        """Nombres lógicos de los endpoints (políticas por endpoint)"""
+        RADICACION = "radicacion"
+        DETALLE = "detalle"
+        ACTUACIONES = "actuaciones"
+    
     # URLs de la API
     BASE_URL = "https://consultaprocesos.ramajudicial.gov.co:448/api/v2"
     CONSULTA_RADICACION = "/Procesos/Consulta/NumeroRadicacion"
@@ -29,13 +37,72 @@ class APIConfig:
     }
     
     # Timeouts y delays
-    REQUEST_TIMEOUT = 30
-    DELAY_BETWEEN_REQUESTS = 1  # segundos
-    DELAY_BETWEEN_PROCESSES = 3  # segundos
+    REQUEST_TIMEOUT = 30  # Timeout de lectura máximo
+    CONNECT_TIMEOUT = 5  # Conexiones atascadas fallan rápido
+    ADAPTIVE_READ_TIMEOUT = True  # Timeout de lectura según latencias observadas
+    READ_TIMEOUT_P99_FACTOR = 3  # Timeout = factor × p99 del endpoint...
+    READ_TIMEOUT_MIN = 5  # ...con este mínimo y REQUEST_TIMEOUT como máximo
+    LATENCY_WINDOW = 200  # Latencias recientes por endpoint
+    LATENCY_MIN_SAMPLES = 20  # Muestras antes de adaptar el timeout
+    RADICADO_TIME_BUDGET = 120  # Segundos máximos por consulta completa (0 = sin límite)
+    
+    # Transporte HTTP
+    HTTP_POOL_SIZE = 10  # Conexiones persistentes por host
+    HTTP_TCP_KEEPALIVE = True  # Detectar conexiones muertas del pool
+    HTTP2 = False  # Usar httpx con HTTP/2 (requiere: pip install httpx[http2])
+    HTTP_WARMUP_CONNECTIONS = 2  # Conexiones abiertas antes del lote (0 = sin precalentar)
+    
+    # Decodificación de respuestas
+    JSON_DECODER = "auto"  # auto (orjson si está instalado) | orjson | json
+    PROJECT_RESPONSES = False  # Conservar solo los campos de actuaciones que se procesan
+    
+    # Peticiones de cobertura (hedging) para las colas de latencia
+    HEDGED_REQUESTS = False
+    HEDGE_PERCENTILE = 95  # Sin respuesta tras este percentil del endpoint se envía una copia
+    HEDGE_BUDGET_PERCENT = 5  # Copias máximas como porcentaje de las peticiones
+    
+    # Ritmo de las peticiones (ver src/scheduler.py)
+    SCHEDULER_MODE = "cortesia"  # cortesia | presupuesto_completo (solo el rate limit)
+    MIN_REQUEST_INTERVAL = 1  # Piso de cortesía: segundos mínimos entre dos peticiones
     
     # Rate limiting
     RATE_LIMIT_REQUESTS_PER_MINUTE = 15
+    RATE_LIMITER = "sliding_window"  # sliding_window | token_bucket | shared_token_bucket
+    RATE_LIMIT_BURST = 3  # Ráfaga máxima del token bucket
+    # Estado del presupuesto compartido entre procesos del mismo host
+    RATE_LIMIT_SHARED_FILE = Path(tempfile.gettempdir()) / "consulta_procesos_rate_limit.json"
+    
+    # Rate limiting adaptativo (AIMD)
+    RATE_LIMIT_ADAPTIVE = False
+    RATE_LIMIT_MIN_PER_MINUTE = 5  # Piso
+    RATE_LIMIT_MAX_PER_MINUTE = 60  # Techo
+    AIMD_INCREMENT = 1  # req/min sumadas tras un minuto sin congestión
+    AIMD_DECREASE_FACTOR = 0.5  # Multiplicador ante 429, 5xx o timeouts
+    AIMD_LATENCY_FACTOR = 2.0  # Latencia reciente / línea base que indica congestión
+    AIMD_COOLDOWN = 30  # Segundos mínimos entre reducciones
     MAX_RETRIES = 3
+    
+    # Reintentos (backoff exponencial con full jitter)
+    RETRY_BACKOFF_BASE = 1  # segundos
+    RETRY_BACKOFF_MAX = 30  # segundos
+    # Sobrescrituras por endpoint: max_reintentos, espera_base, espera_maxima, reintentar_429
+    RETRY_POLICIES = {
+        Endpoint.ACTUACIONES: {'max_reintentos': 2},
+    }
+    
+    # Circuit breaker por endpoint
+    CIRCUIT_FAILURE_THRESHOLD = 5  # Fallos transitorios seguidos que abren el circuito
+    CIRCUIT_COOLDOWN = 60  # Segundos abierto antes de la petición de prueba
+    CIRCUIT_MAX_TOTAL_PAUSE = 1800  # Pausa acumulada máxima por ejecución antes de marcar FAILED
+    
+    # Concurrencia (cliente asíncrono)
+    MAX_CONCURRENT_REQUESTS = 4
+    PARALLEL_DETAIL_FETCH = False  # Detalle y actuaciones a la vez
+    
+    # Paginación de actuaciones
+    ACTUACIONES_TODAS_LAS_PAGINAS = False  # La consulta completa recorre todas las páginas
+    ACTUACIONES_PREFETCH = 1  # Páginas pedidas por adelantado
+    ACTUACIONES_MAX_PAGINAS = 50
 
 
 class FileConfig:
@@ -49,6 +116,7 @@ class FileConfig:
     EXCEL_INPUT_FILE = DATA_DIR / "PROCESOS.xlsx"
     EXCEL_COLUMN = 0  # Columna A (índice 0)
     EXCEL_START_ROW = 2  # Empezar desde fila 2
+    EXCEL_PRIORITY_COLUMN = None  # Índice de la columna de prioridad explícita (None = sin columna)
     
     # Archivos de salida
     OUTPUT_DIR = PROJECT_ROOT / "output"
@@ -74,6 +142,17 @@ class ProcessConfig:
     MIN_RADICADO_LENGTH = 15
     MAX_RADICADO_LENGTH = 30
     
+    # Pipeline de consulta (lectura -> consulta -> procesamiento -> escritura)
+    PIPELINE_QUEUE_SIZE = 32  # Elementos máximos en cada cola entre etapas
+    PIPELINE_PROCESS_WORKERS = 1  # Hilos de procesamiento (los de consulta son --concurrencia)
+    
+    # Reintentos diferidos de radicados con fallo transitorio (timeout, conexión, 429, 5xx)
+    DEFERRED_RETRIES = 2  # Reintentos por radicado después del intento inicial (0 = ninguno)
+    DEFERRED_RETRY_DELAY = 30  # Segundos antes del primer reintento; se duplica en cada uno
+    
+    # Consultar primero los radicados más valiosos (ver src/priority.py)
+    PRIORITY_SCHEDULING = False
+    
     class Status:
         """Estados de procesamiento"""
         SUCCESS = "SUCCESS"
@@ -82,6 +161,59 @@ class ProcessConfig:
         FAILED = "FAILED"
 
 
+class CacheConfig:
+    """Configuración de la caché persistente de respuestas"""
+    
+    class Modo:
+        """Modos de uso de la caché"""
+        NORMAL = "normal"  # Lee y escribe
+        REFRESCAR = "refrescar"  # Ignora lo guardado pero escribe lo nuevo
+        SOLO_CACHE = "solo_cache"  # Sin red: lo que no esté en caché falla
+    
+    ENABLED = False
+    MODO = Modo.NORMAL
+    RUTA = FileConfig.PROJECT_ROOT / "cache" / "respuestas.sqlite3"
+    MAX_ENTRADAS = 50000
+    
+    # Vigencia por endpoint en segundos (0 = no cachear)
+    TTLS = {
+        APIConfig.Endpoint.RADICACION: 24 * 3600,
+        APIConfig.Endpoint.DETALLE: 7 * 24 * 3600,
+        APIConfig.Endpoint.ACTUACIONES: 24 * 3600,
+    }
+    
+    # Radicados no encontrados: se omiten sin consultar durante el TTL (0 = no recordar)
+    NEGATIVE_TTL = 7 * 24 * 3600
+    NEGATIVE_BLOOM_FILTER = False  # Útil con entradas muy grandes
+    NEGATIVE_BLOOM_CAPACITY = 1000000
+    
+    # Procesos privados: solo se obtiene el registro básico, se reutiliza durante
+    # el TTL y pasado REVALIDATE_AFTER se revisa al final de la ejecución
+    PRIVATE_TTL = 30 * 24 * 3600
+    PRIVATE_REVALIDATE_AFTER = 7 * 24 * 3600
+    PRIVATE_REVALIDATE_PER_RUN = 20
+
+
+class StateConfig:
+    """Configuración del estado persistente por radicado (sincronización incremental e índice)"""
+    
+    # Reutilizar detalle y actuaciones si fechaUltimaActuacion no cambió
+    INCREMENTAL = False
+    RUTA = FileConfig.PROJECT_ROOT / "cache" / "estado_procesos.sqlite3"
+    
+    # Índice radicado -> idProceso para saltar la consulta por radicación
+    INDICE_PROCESOS = False
+    INDICE_REVALIDAR_DIAS = 30
+
+
+class JournalConfig:
+    """Configuración del journal de ejecución (reanudar lotes interrumpidos)"""
+    
+    ENABLED = True
+    DIRECTORIO = FileConfig.PROJECT_ROOT / "journal"
+    DIAS_RETENCION = 30  # Journals más antiguos se eliminan al terminar
+
+
 class UIConfig:
     """Configuración para interfaz de usuario"""
     
@@ -147,8 +279,26 @@ def validate_config():
     if APIConfig.REQUEST_TIMEOUT <= 0:
         errores.append("Timeout de request debe ser positivo")
     
-    if APIConfig.DELAY_BETWEEN_REQUESTS < 0:
-        errores.append("Delay entre requests no puede ser negativo")
+    if APIConfig.CONNECT_TIMEOUT <= 0:
+        errores.append("Timeout de conexión debe ser positivo")
+    
+    if APIConfig.JSON_DECODER not in ("auto", "orjson", "json"):
+        errores.append(f"Decodificador JSON no válido: {APIConfig.JSON_DECODER}")
+    
+    if APIConfig.HTTP_POOL_SIZE < 1:
+        errores.append("Tamaño del pool HTTP debe ser al menos 1")
+    
+    if not 0 <= APIConfig.HEDGE_BUDGET_PERCENT <= 100:
+        errores.append("Presupuesto de peticiones de cobertura debe estar entre 0 y 100")
+    
+    if APIConfig.MIN_REQUEST_INTERVAL < 0:
+        errores.append("Intervalo mínimo entre peticiones no puede ser negativo")
+    
+    if APIConfig.SCHEDULER_MODE not in ("cortesia", "presupuesto_completo"):
+        errores.append(f"Modo de planificación no válido: {APIConfig.SCHEDULER_MODE}")
+    
+    if APIConfig.RATE_LIMIT_ADAPTIVE and APIConfig.RATE_LIMITER == "shared_token_bucket":
+        errores.append("La tasa adaptativa no se puede combinar con el rate limit compartido")
     
     # Validar configuración de archivos
     if FileConfig.EXCEL_START_ROW < 1:
@@ -157,6 +307,12 @@ def validate_config():
     if ProcessConfig.MIN_RADICADO_LENGTH <= 0:
         errores.append("Longitud mínima de radicado debe ser positiva")
     
+    if ProcessConfig.PIPELINE_QUEUE_SIZE < 1 or ProcessConfig.PIPELINE_PROCESS_WORKERS < 1:
+        errores.append("Tamaño de cola y trabajadores del pipeline deben ser al menos 1")
+    
+    if ProcessConfig.DEFERRED_RETRIES < 0 or ProcessConfig.DEFERRED_RETRY_DELAY < 0:
+        errores.append("Reintentos diferidos y su espera no pueden ser negativos")
+    
     if errores:
         raise ValueError(f"Errores en configuración: {'; '.join(errores)}")
 
@@ -172,7 +328,15 @@ def get_config_summary() -> Dict[str, Any]:
         "api": {
             "base_url": APIConfig.BASE_URL,
             "timeout": APIConfig.REQUEST_TIMEOUT,
-            "rate_limit": APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
+            "connect_timeout": APIConfig.CONNECT_TIMEOUT,
+            "timeout_adaptativo": APIConfig.ADAPTIVE_READ_TIMEOUT,
+            "peticiones_cobertura": APIConfig.HEDGED_REQUESTS,
+            "http_pool": APIConfig.HTTP_POOL_SIZE,
+            "http2": APIConfig.HTTP2,
+            "json_decoder": APIConfig.JSON_DECODER,
+            "rate_limit": APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE,
+            "rate_limiter": APIConfig.RATE_LIMITER,
+            "rate_limit_adaptativo": APIConfig.RATE_LIMIT_ADAPTIVE
         },
         "archivos": {
             "excel_input": str(FileConfig.EXCEL_INPUT_FILE),
@@ -182,7 +346,24 @@ def get_config_summary() -> Dict[str, Any]:
         "procesamiento": {
             "min_radicado_length": ProcessConfig.MIN_RADICADO_LENGTH,
             "max_radicado_length": ProcessConfig.MAX_RADICADO_LENGTH,
-            "delay_between_processes": APIConfig.DELAY_BETWEEN_PROCESSES
+            "planificador": APIConfig.SCHEDULER_MODE,
+            "intervalo_minimo": APIConfig.MIN_REQUEST_INTERVAL,
+            "pipeline_cola": ProcessConfig.PIPELINE_QUEUE_SIZE,
+            "pipeline_trabajadores_procesamiento": ProcessConfig.PIPELINE_PROCESS_WORKERS,
+            "reintentos_diferidos": ProcessConfig.DEFERRED_RETRIES,
+            "espera_reintento_diferido": ProcessConfig.DEFERRED_RETRY_DELAY,
+            "priorizar": ProcessConfig.PRIORITY_SCHEDULING,
+            "columna_prioridad": FileConfig.EXCEL_PRIORITY_COLUMN
+        },
+        "cache": {
+            "habilitada": CacheConfig.ENABLED,
+            "modo": CacheConfig.MODO,
+            "ruta": str(CacheConfig.RUTA)
+        },
+        "sincronizacion": {
+            "incremental": StateConfig.INCREMENTAL,
+            "indice_procesos": StateConfig.INDICE_PROCESOS,
+            "ruta": str(StateConfig.RUTA)
         }
     }
 
@@ -235,6 +416,107 @@ except ValueError as e:
     print(f"⚠️ Advertencia en configuración: {e}")
 
 
+def _ruta_del_proyecto(valor: str) -> Path:
+    """Ruta configurada: las relativas se toman respecto a FileConfig.PROJECT_ROOT, no al directorio actual"""
+    ruta = Path(valor)
+    return ruta if ruta.is_absolute() else FileConfig.PROJECT_ROOT / ruta
+
+
+# Archivo config.ini opcional (ver config.example.ini)
+def load_ini_config(ruta: Path = None):
+    """
+    Carga las secciones [API], [PROCESSING] y [CACHE] desde config.ini
+    
+    Args:
+        ruta: Ruta al archivo (default: config.ini junto a main.py)
+    """
+    ruta = ruta or Path(__file__).resolve().parent.parent / "config.ini"
+    if not ruta.exists():
+        return
+    
+    parser = configparser.ConfigParser()
+    try:
+        parser.read(ruta, encoding='utf-8')
+        
+        api = parser['API'] if parser.has_section('API') else {}
+        if 'base_url' in api:
+            APIConfig.BASE_URL = api['base_url']
+        if 'timeout' in api:
+            APIConfig.REQUEST_TIMEOUT = int(api['timeout'])
+        if 'connect_timeout' in api:
+            APIConfig.CONNECT_TIMEOUT = float(api['connect_timeout'])
+        if 'adaptive_read_timeout' in api:
+            APIConfig.ADAPTIVE_READ_TIMEOUT = parser.getboolean('API', 'adaptive_read_timeout')
+        if 'radicado_time_budget' in api:
+            APIConfig.RADICADO_TIME_BUDGET = float(api['radicado_time_budget'])
+        if 'http_pool_size' in api:
+            APIConfig.HTTP_POOL_SIZE = int(api['http_pool_size'])
+        if 'http2' in api:
+            APIConfig.HTTP2 = parser.getboolean('API', 'http2')
+        if 'warmup_connections' in api:
+            APIConfig.HTTP_WARMUP_CONNECTIONS = int(api['warmup_connections'])
+        if 'json_decoder' in api:
+            APIConfig.JSON_DECODER = api['json_decoder']
+        if 'project_responses' in api:
+            APIConfig.PROJECT_RESPONSES = parser.getboolean('API', 'project_responses')
+        if 'hedged_requests' in api:
+            APIConfig.HEDGED_REQUESTS = parser.getboolean('API', 'hedged_requests')
+        if 'hedge_budget_percent' in api:
+            APIConfig.HEDGE_BUDGET_PERCENT = float(api['hedge_budget_percent'])
+        if 'rate_limit_requests_per_minute' in api:
+            APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE = int(api['rate_limit_requests_per_minute'])
+        
+        procesamiento = parser['PROCESSING'] if parser.has_section('PROCESSING') else {}
+        if 'max_retries' in procesamiento:
+            APIConfig.MAX_RETRIES = int(procesamiento['max_retries'])
+        if 'retry_backoff_base' in procesamiento:
+            APIConfig.RETRY_BACKOFF_BASE = float(procesamiento['retry_backoff_base'])
+        if 'retry_backoff_max' in procesamiento:
+            APIConfig.RETRY_BACKOFF_MAX = float(procesamiento['retry_backoff_max'])
+        if 'circuit_failure_threshold' in procesamiento:
+            APIConfig.CIRCUIT_FAILURE_THRESHOLD = int(procesamiento['circuit_failure_threshold'])
+        if 'circuit_cooldown' in procesamiento:
+            APIConfig.CIRCUIT_COOLDOWN = float(procesamiento['circuit_cooldown'])
+        if 'min_request_interval' in procesamiento:
+            APIConfig.MIN_REQUEST_INTERVAL = float(procesamiento['min_request_interval'])
+        if 'scheduler_mode' in procesamiento:
+            APIConfig.SCHEDULER_MODE = procesamiento['scheduler_mode']
+        if 'pipeline_queue_size' in procesamiento:
+            ProcessConfig.PIPELINE_QUEUE_SIZE = int(procesamiento['pipeline_queue_size'])
+        if 'pipeline_process_workers' in procesamiento:
+            ProcessConfig.PIPELINE_PROCESS_WORKERS = int(procesamiento['pipeline_process_workers'])
+        if 'deferred_retries' in procesamiento:
+            ProcessConfig.DEFERRED_RETRIES = int(procesamiento['deferred_retries'])
+        if 'deferred_retry_delay' in procesamiento:
+            ProcessConfig.DEFERRED_RETRY_DELAY = float(procesamiento['deferred_retry_delay'])
+        if 'priority_scheduling' in procesamiento:
+            ProcessConfig.PRIORITY_SCHEDULING = parser.getboolean('PROCESSING', 'priority_scheduling')
+        if 'priority_column' in procesamiento:
+            FileConfig.EXCEL_PRIORITY_COLUMN = int(procesamiento['priority_column'])
+            
+        cache = parser['CACHE'] if parser.has_section('CACHE') else {}
+        if 'enabled' in cache:
+            CacheConfig.ENABLED = parser.getboolean('CACHE', 'enabled')
+        if 'path' in cache:
+            CacheConfig.RUTA = _ruta_del_proyecto(cache['path'])
+        if 'max_entries' in cache:
+            CacheConfig.MAX_ENTRADAS = int(cache['max_entries'])
+        if 'ttl_not_found' in cache:
+            CacheConfig.NEGATIVE_TTL = int(cache['ttl_not_found'])
+        if 'ttl_private' in cache:
+            CacheConfig.PRIVATE_TTL = int(cache['ttl_private'])
+        if 'private_revalidate_after' in cache:
+            CacheConfig.PRIVATE_REVALIDATE_AFTER = int(cache['private_revalidate_after'])
+        if 'bloom_filter' in cache:
+            CacheConfig.NEGATIVE_BLOOM_FILTER = parser.getboolean('CACHE', 'bloom_filter')
+        for endpoint in CacheConfig.TTLS:
+            if f'ttl_{endpoint}' in cache:
+                CacheConfig.TTLS[endpoint] = int(cache[f'ttl_{endpoint}'])
+            
+    except (configparser.Error, ValueError) as e:
+        print(f"⚠️ Advertencia: config.ini inválido ({ruta}): {e}")
+
+
 # Variables de entorno opcionales
 def load_env_config():
     """Carga configuración desde variables de entorno"""
@@ -249,6 +531,28 @@ def load_env_config():
         except ValueError:
             pass
     
+    if os.getenv('RATE_LIMITER'):
+        APIConfig.RATE_LIMITER = os.getenv('RATE_LIMITER')
+    
+    if os.getenv('RATE_LIMIT_ADAPTIVE'):
+        APIConfig.RATE_LIMIT_ADAPTIVE = os.getenv('RATE_LIMIT_ADAPTIVE').lower() in ('1', 'true', 'si', 'sí')
+    
+    if os.getenv('RATE_LIMIT_SHARED_FILE'):
+        APIConfig.RATE_LIMIT_SHARED_FILE = Path(os.getenv('RATE_LIMIT_SHARED_FILE'))
+    
+    if os.getenv('API_MAX_RETRIES'):
+        try:
+            APIConfig.MAX_RETRIES = int(os.getenv('API_MAX_RETRIES'))
+        except ValueError:
+            pass
+    
+    # Solo la ruta: la caché y el modo incremental se activan con su opción o en config.ini
+    if os.getenv('RESPONSE_CACHE_PATH'):
+        CacheConfig.RUTA = _ruta_del_proyecto(os.getenv('RESPONSE_CACHE_PATH'))
+    
+    if os.getenv('PROCESS_STATE_PATH'):
+        StateConfig.RUTA = _ruta_del_proyecto(os.getenv('PROCESS_STATE_PATH'))
+    
     # File Config desde env
     if os.getenv('EXCEL_INPUT_PATH'):
         FileConfig.EXCEL_INPUT_FILE = Path(os.getenv('EXCEL_INPUT_PATH'))
@@ -267,5 +571,6 @@ def load_env_config():
         LogConfig.DEFAULT_LEVEL = level_map.get(os.getenv('LOG_LEVEL').upper(), logging.INFO)
 
 
-# Cargar configuración de variables de entorno si están disponibles
+# Cargar config.ini y luego variables de entorno (tienen prioridad)
+load_ini_config()
 load_env_config()
\ No newline at end of file
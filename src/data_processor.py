@@ -232,6 +232,10 @@ class ProcesosProcessor:
         radicado = datos_proceso.get('radicado', 'UNKNOWN')
         
         try:
+            if datos_proceso.get('status') == ProcessConfig.Status.NOT_FOUND:
+                logger.info(f"Proceso no encontrado: {radicado}")
+                return ProcesoInfo(radicado=radicado, status=ProcessConfig.Status.NOT_FOUND)
+            
             # Verificar si es proceso privado
             if datos_proceso.get('es_privado', False):
                 return self._procesar_proceso_privado(datos_proceso)
@@ -321,7 +325,12 @@ class ProcesosProcessor:
         Returns:
             String formateado con la información del proceso
         """
-        if proceso_info.es_privado:
+        if proceso_info.status == ProcessConfig.Status.NOT_FOUND:
+            return f"""{UIConfig.SEPARATOR_RESULT}
+Radicado del proceso: {proceso_info.radicado}
+Estado: NO ENCONTRADO - Verifique el número de radicación
+{UIConfig.SEPARATOR_RESULT}"""
+        elif proceso_info.es_privado:
             return self._formatear_proceso_privado(proceso_info)
         else:
             return self._formatear_proceso_normal(proceso_info)
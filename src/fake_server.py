@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor local que simula la API de consulta de procesos de la Rama Judicial
+
+Implementa los tres endpoints que usa RamaJudicialClient con datos
+sintéticos deterministas (el mismo radicado siempre da el mismo proceso) o
+grabados, y permite inyectar latencia, errores 429/500 y proporciones de
+procesos privados y no encontrados. Sirve para medir rendimiento y ajustar
+concurrencia y rate limiting sin tocar el portal real.
+
+Uso:
+    python src/fake_server.py --puerto 8448 --latencia 0.4 --tasa-429 0.02
+    
+y apuntar el cliente a http://127.0.0.1:8448/api/v2 (base_url en
+config.ini o RAMA_JUDICIAL_API_URL).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+PREFIJO_API = "/api/v2"
+
+DESPACHOS = [
+    ("JUZGADO 001 CIVIL DEL CIRCUITO DE BOGOTÁ ", "BOGOTÁ"),
+    ("JUZGADO 003 LABORAL DEL CIRCUITO DE MEDELLÍN ", "ANTIOQUIA"),
+    ("JUZGADO 012 CIVIL MUNICIPAL DE CALI ", "VALLE DEL CAUCA"),
+    ("JUZGADO 002 DE FAMILIA DE BARRANQUILLA ", "ATLÁNTICO"),
+]
+TIPOS_PROCESO = [
+    ("Declarativo", "Verbal", "Responsabilidad civil"),
+    ("Ejecutivo", "Ejecutivo singular", "Sin subclase de proceso"),
+    ("Ordinario", "Ordinario laboral", "Sin subclase de proceso"),
+]
+ACTUACIONES = ["Fijacion estado", "Auto admite demanda", "Auto requiere", "Recepción memorial",
+               "Auto decreta medida cautelar", "Sentencia", "Radicación de proceso"]
+
+
+@dataclass
+class EscenarioSimulado:
+    """Parámetros del comportamiento del servidor simulado"""
+    latencia_mediana: float = 0.0  # segundos
+    latencia_sigma: float = 0.5  # Dispersión lognormal (colas largas)
+    tasa_429: float = 0.0  # Fracción de peticiones respondidas con 429
+    tasa_500: float = 0.0  # Fracción de peticiones respondidas con 500
+    retry_after: int = 1  # Segundos indicados en los 429
+    proporcion_privados: float = 0.0
+    proporcion_no_encontrados: float = 0.0
+    actuaciones_promedio: int = 20
+    actuaciones_por_pagina: int = 40
+    semilla: int = 0
+    # Respuestas grabadas: ruta sin prefijo (p. ej. "/Proceso/Detalle/123") -> payload
+    grabaciones: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def cargar_grabaciones(cls, ruta: Path, **kwargs) -> "EscenarioSimulado":
+        """
+        Crea un escenario con respuestas grabadas desde un archivo JSON
+        
+        Args:
+            ruta: Archivo JSON con un objeto ruta -> payload
+            **kwargs: Resto de parámetros del escenario
+            
+        Returns:
+            EscenarioSimulado con las grabaciones cargadas
+        """
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            return cls(grabaciones=json.load(archivo), **kwargs)
+
+
+def _fraccion(texto: str, sal: str) -> float:
+    """Valor determinista en [0, 1) derivado de un texto"""
+    digest = hashlib.blake2b(f"{sal}:{texto}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64
+
+
+class _ManejadorAPI(BaseHTTPRequestHandler):
+    """Atiende las peticiones con el escenario del servidor"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers y cuerpo van en escrituras separadas
+    server: "ServidorSimulado"
+    
+    def do_HEAD(self):
+        self._responder(200, b"")
+    
+    def do_GET(self):
+        servidor = self.server
+        url = urlparse(self.path)
+        ruta = url.path[len(PREFIJO_API):] if url.path.startswith(PREFIJO_API) else url.path
+        params = {clave: valores[0] for clave, valores in parse_qs(url.query).items()}
+        
+        endpoint, generador = servidor.resolver(ruta)
+        if generador is None:
+            self._responder_json(404, {"Message": "Ruta no encontrada"})
+            return
+        
+        servidor.contar(endpoint)
+        time.sleep(servidor.muestrear_latencia())
+        
+        error = servidor.muestrear_error()
+        if error == 429:
+            self._responder_json(429, {"Message": "Too Many Requests"},
+                                 {"Retry-After": str(servidor.escenario.retry_after)})
+            return
+        if error == 500:
+            self._responder_json(500, {"Message": "Error interno"})
+            return
+        
+        grabada = servidor.escenario.grabaciones.get(ruta)
+        if grabada is not None:
+            self._responder_json(200, grabada)
+            return
+        
+        estado, datos = generador(ruta, params)
+        self._responder_json(estado, datos)
+    
+    def _responder_json(self, estado: int, datos: Any, headers: Optional[Dict[str, str]] = None):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        self._responder(estado, cuerpo, {"Content-Type": "application/json; charset=utf-8", **(headers or {})})
+    
+    def _responder(self, estado: int, cuerpo: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(estado)
+        for nombre, valor in (headers or {}).items():
+            self.send_header(nombre, valor)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(cuerpo)
+    
+    def log_message(self, formato, *args):
+        logger.debug(f"{self.address_string()} {formato % args}")
+
+
+class ServidorSimulado(ThreadingHTTPServer):
+    """Servidor HTTP con los endpoints de la API en un hilo de fondo"""
+    
+    daemon_threads = True
+    
+    def __init__(self, escenario: Optional[EscenarioSimulado] = None,
+                 host: str = "127.0.0.1", puerto: int = 0):
+        """
+        Args:
+            escenario: Comportamiento simulado (default: sin latencia ni errores)
+            host: Interfaz de escucha
+            puerto: Puerto (0 = uno libre)
+        """
+        super().__init__((host, puerto), _ManejadorAPI)
+        self.escenario = escenario or EscenarioSimulado()
+        self._aleatorio = random.Random(self.escenario.semilla)
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self.peticiones: Dict[str, int] = {}
+        self.errores_inyectados = 0
+        self._rutas = [
+            (re.compile(r"^/Procesos/Consulta/NumeroRadicacion$"), APIConfig.Endpoint.RADICACION,
+             self._consulta_radicacion),
+            (re.compile(r"^/Proceso/Detalle/(\d+)$"), APIConfig.Endpoint.DETALLE, self._detalle),
+            (re.compile(r"^/Proceso/Actuaciones/(\d+)$"), APIConfig.Endpoint.ACTUACIONES, self._actuaciones),
+        ]
+    
+    @property
+    def base_url(self) -> str:
+        """URL base para APIConfig.BASE_URL"""
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}{PREFIJO_API}"
+    
+    def iniciar(self) -> str:
+        """
+        Empieza a atender peticiones en un hilo de fondo
+        
+        Returns:
+            URL base del servidor
+        """
+        self._hilo = threading.Thread(target=self.serve_forever, name="servidor-simulado", daemon=True)
+        self._hilo.start()
+        logger.info(f"Servidor simulado escuchando en {self.base_url}")
+        return self.base_url
+    
+    def detener(self):
+        """Detiene el servidor y libera el puerto"""
+        if self._hilo is not None:
+            self.shutdown()
+            self._hilo.join()
+            self._hilo = None
+        self.server_close()
+    
+    def __enter__(self):
+        self.iniciar()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.detener()
+    
+    def resolver(self, ruta: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Endpoint lógico y generador de respuesta para una ruta"""
+        for patron, endpoint, generador in self._rutas:
+            if patron.match(ruta):
+                return endpoint, generador
+        return None, None
+    
+    def contar(self, endpoint: str):
+        with self._lock:
+            self.peticiones[endpoint] = self.peticiones.get(endpoint, 0) + 1
+    
+    def muestrear_latencia(self) -> float:
+        """Latencia lognormal con la mediana del escenario"""
+        if self.escenario.latencia_mediana <= 0:
+            return 0.0
+        with self._lock:
+            return self.escenario.latencia_mediana * math.exp(
+                self._aleatorio.gauss(0, self.escenario.latencia_sigma))
+    
+    def muestrear_error(self) -> Optional[int]:
+        """Código de error a inyectar en esta petición (None si ninguno)"""
+        with self._lock:
+            valor = self._aleatorio.random()
+            if valor < self.escenario.tasa_429:
+                codigo = 429
+            elif valor < self.escenario.tasa_429 + self.escenario.tasa_500:
+                codigo = 500
+            else:
+                return None
+            self.errores_inyectados += 1
+            return codigo
+    
+    # Generadores de respuestas sintéticas
+    
+    @staticmethod
+    def id_proceso(radicado: str) -> int:
+        """idProceso determinista de un radicado"""
+        return 100000 + int(_fraccion(radicado, "id") * 900000000)
+    
+    def _consulta_radicacion(self, ruta: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        radicado = params.get('numero', '')
+        paginacion = {"cantidadRegistros": 0, "registrosPagina": 20, "cantidadPaginas": 0,
+                      "pagina": 1, "paginas": None}
+        
+        if not radicado or _fraccion(radicado, "no_encontrado") < self.escenario.proporcion_no_encontrados:
+            return 200, {"tipoConsulta": "NumeroRadicacion", "procesos": [], "paginacion": paginacion}
+        
+        id_proceso = self.id_proceso(radicado)
+        aleatorio = random.Random(id_proceso)
+        despacho, departamento = aleatorio.choice(DESPACHOS)
+        proceso = {
+            "idProceso": id_proceso,
+            "idConexion": 250,
+            "llaveProceso": radicado,
+            "fechaProceso": f"20{aleatorio.randint(10, 24)}-0{aleatorio.randint(1, 9)}-1{aleatorio.randint(0, 9)}T00:00:00",
+            "fechaUltimaActuacion": self._fecha_actuacion(id_proceso, 0),
+            "despacho": despacho,
+            "departamento": departamento,
+            "sujetosProcesales": f"Demandante: PERSONA {id_proceso % 997} | Demandado: EMPRESA {id_proceso % 89} S.A.S.",
+            "esPrivado": _fraccion(radicado, "privado") < self.escenario.proporcion_privados,
+            "cantFilas": -1,
+        }
+        paginacion.update(cantidadRegistros=1, cantidadPaginas=1)
+        return 200, {"tipoConsulta": "NumeroRadicacion", "procesos": [proceso], "paginacion": paginacion}
+    
+    def _detalle(self, ruta: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        id_proceso = int(ruta.rsplit('/', 1)[1])
+        aleatorio = random.Random(id_proceso)
+        despacho, _ = aleatorio.choice(DESPACHOS)
+        tipo, clase, subclase = aleatorio.choice(TIPOS_PROCESO)
+        return 200, {
+            "idRegProceso": id_proceso,
+            "llaveProceso": f"{id_proceso:023d}",
+            "esPrivado": False,
+            "despacho": despacho,
+            "ponente": "SIN PONENTE",
+            "tipoProceso": tipo,
+            "claseProceso": clase,
+            "subclaseProceso": subclase,
+            "recurso": "Sin Tipo de Recurso",
+            "ubicacion": "Secretaría",
+            "contenidoRadicacion": "Proceso sintético del servidor simulado",
+            "ultimaActualizacion": self._fecha_actuacion(id_proceso, 0),
+        }
+    
+    def _actuaciones(self, ruta: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        id_proceso = int(ruta.rsplit('/', 1)[1])
+        total = 1 + int(_fraccion(str(id_proceso), "actuaciones") * 2 * self.escenario.actuaciones_promedio)
+        por_pagina = self.escenario.actuaciones_por_pagina
+        paginas = max(1, math.ceil(total / por_pagina))
+        try:
+            pagina = max(1, int(params.get('pagina', 1)))
+        except ValueError:
+            pagina = 1
+        
+        inicio = (pagina - 1) * por_pagina
+        actuaciones = [self._actuacion(id_proceso, indice, total)
+                       for indice in range(inicio, min(inicio + por_pagina, total))]
+        return 200, {
+            "actuaciones": actuaciones,
+            "paginacion": {"cantidadRegistros": total, "registrosPagina": por_pagina,
+                           "cantidadPaginas": paginas, "pagina": pagina, "paginas": None},
+        }
+    
+    @staticmethod
+    def _fecha_actuacion(id_proceso: int, indice: int) -> str:
+        """Fechas descendentes: la actuación 0 es la más reciente"""
+        dias = (id_proceso % 300) + indice * 7
+        fecha = time.gmtime(1735689600 - dias * 86400)  # Desde 2025-01-01
+        return time.strftime("%Y-%m-%dT00:00:00", fecha)
+    
+    def _actuacion(self, id_proceso: int, indice: int, total: int) -> Dict[str, Any]:
+        aleatorio = random.Random(id_proceso * 10007 + indice)
+        fecha = self._fecha_actuacion(id_proceso, indice)
+        return {
+            "idRegActuacion": id_proceso * 1000 + (total - indice),
+            "llaveProceso": f"{id_proceso:023d}",
+            "consActuacion": total - indice,
+            "fechaActuacion": fecha,
+            "actuacion": aleatorio.choice(ACTUACIONES),
+            "anotacion": f"Anotación sintética {total - indice} del proceso {id_proceso}",
+            "fechaInicial": None,
+            "fechaFinal": None,
+            "fechaRegistro": fecha,
+            "codRegla": "00                              ",
+            "conDocumentos": aleatorio.random() < 0.3,
+            "cant": total,
+        }
+
+
+def main():
+    """Arranca el servidor simulado desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor local que simula la API de la Rama Judicial")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8448)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latencia mediana en segundos")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Dispersión lognormal de la latencia")
+    parser.add_argument("--tasa-429", type=float, default=0.0)
+    parser.add_argument("--tasa-500", type=float, default=0.0)
+    parser.add_argument("--privados", type=float, default=0.0, help="Proporción de procesos privados")
+    parser.add_argument("--no-encontrados", type=float, default=0.0, help="Proporción de radicados inexistentes")
+    parser.add_argument("--actuaciones", type=int, default=20, help="Actuaciones promedio por proceso")
+    parser.add_argument("--grabaciones", type=Path, help="JSON con respuestas grabadas por ruta")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    
+    parametros = dict(latencia_mediana=args.latencia, latencia_sigma=args.sigma, tasa_429=args.tasa_429,
+                      tasa_500=args.tasa_500, proporcion_privados=args.privados,
+                      proporcion_no_encontrados=args.no_encontrados,
+                      actuaciones_promedio=args.actuaciones, semilla=args.semilla)
+    escenario = (EscenarioSimulado.cargar_grabaciones(args.grabaciones, **parametros) if args.grabaciones
+                 else EscenarioSimulado(**parametros))
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    servidor = ServidorSimulado(escenario, args.host, args.puerto)
+    print(f"Servidor simulado en {servidor.base_url} (Ctrl+C para detener)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print(f"Peticiones atendidas: {servidor.peticiones}, errores inyectados: {servidor.errores_inyectados}")
+
+
+if __name__ == "__main__":
+    main()
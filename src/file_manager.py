@@ -51,6 +51,7 @@ class ExcelReader:
             archivo_path: Ruta al archivo Excel (opcional, usa config por defecto)
         """
         self.archivo_path = archivo_path or FileConfig.EXCEL_INPUT_FILE
+        self.prioridades: Dict[str, float] = {}  # De la columna de prioridad, si está configurada
         logger.info(f"ExcelReader inicializado con archivo: {self.archivo_path}")
     
     def validar_archivo(self) -> bool:
@@ -87,6 +88,10 @@ class ExcelReader:
         """
         Lee los radicados desde el archivo Excel
         
+        Si FileConfig.EXCEL_PRIORITY_COLUMN está configurada, guarda además
+        en self.prioridades la prioridad explícita de cada radicado (número
+        mayor = más urgente).
+        
         Returns:
             Lista de radicados encontrados
             
@@ -103,6 +108,11 @@ class ExcelReader:
             df = pd.read_excel(self.archivo_path, header=None, dtype=str)
             
             radicados = []
+            self.prioridades = {}
+            columna_prioridad = FileConfig.EXCEL_PRIORITY_COLUMN
+            if columna_prioridad is not None and columna_prioridad >= len(df.columns):
+                logger.warning(f"El Excel no tiene la columna de prioridad {columna_prioridad}, se ignora")
+                columna_prioridad = None
             
             # Verificar que hay datos en la columna A
             if len(df.columns) > 0:
@@ -121,6 +131,8 @@ class ExcelReader:
                             if radicado.isdigit() and len(radicado) >= ProcessConfig.MIN_RADICADO_LENGTH:
                                 radicados.append(radicado)
                                 logger.debug(f"Radicado válido encontrado: {radicado}")
+                                if columna_prioridad is not None:
+                                    self._leer_prioridad(radicado, df.iloc[i, columna_prioridad])
                             else:
                                 logger.warning(f"Radicado con formato inválido ignorado: {radicado}")
                         else:
@@ -151,6 +163,18 @@ class ExcelReader:
             logger.error(error_msg)
             raise FileManagerError(error_msg)
     
+    def _leer_prioridad(self, radicado: str, valor: Any):
+        """Guarda la prioridad explícita de un radicado (las celdas vacías no cuentan)"""
+        if pd.isna(valor) or not str(valor).strip():
+            return
+        try:
+            prioridad = float(str(valor).strip().replace(',', '.'))
+        except ValueError:
+            logger.warning(f"Prioridad no numérica ignorada para {radicado}: {valor}")
+            return
+        # Con el radicado repetido gana la prioridad más alta
+        self.prioridades[radicado] = max(prioridad, self.prioridades.get(radicado, prioridad))
+    
     def obtener_info_archivo(self) -> Dict[str, Any]:
         """
         Obtiene información del archivo Excel
@@ -207,6 +231,16 @@ class ResultWriter:
         timestamp = datetime.now().strftime(FileConfig.OUTPUT_DATETIME_FORMAT)
         return f"{prefijo}_{timestamp}.{extension}"
     
+    def crear_escritor_excel(self) -> 'EscritorExcel':
+        """
+        Crea un escritor que agrega filas al Excel de resultados a medida que llegan
+        
+        Returns:
+            EscritorExcel sobre un archivo nuevo del directorio de salida
+        """
+        ruta_archivo = self.output_dir / self.generar_nombre_archivo("consulta_procesos", "xlsx")
+        return EscritorExcel(ruta_archivo)
+    
     def escribir_resultados_excel(self, procesos: List[ProcesoInfo]) -> Path:
         """
         Escribe los resultados en formato Excel simplificado
@@ -217,129 +251,148 @@ class ResultWriter:
         Returns:
             Ruta del archivo Excel creado
         """
+        escritor = self.crear_escritor_excel()
+        for proceso in procesos:
+            escritor.agregar(proceso)
+        return escritor.cerrar()
+
+
+class EscritorExcel:
+    """
+    Excel de resultados escrito fila a fila
+    
+    Usa el modo write_only de openpyxl, que vuelca cada fila a disco al
+    agregarla: la memoria no depende del número de procesos. El formato
+    (encabezado, bordes, alineación, anchos y primera fila fija) se aplica
+    al escribir cada celda, porque en ese modo no se puede volver atrás.
+    """
+    
+    HOJA = 'Datos de Procesos'
+    
+    # Columna y ancho
+    COLUMNAS = [
+        ('No.', 8),
+        ('Radicado', 25),
+        ('Demandante', 30),
+        ('Demandado', 30),
+        ('Juzgado', 40),
+        ('Departamento', 15),
+        ('Tipo del Proceso', 20),
+        ('Clase del Proceso', 25),
+        ('Subclase del Proceso', 25),
+        ('Última Fecha de Actuación', 12),
+        ('Última Actuación', 50),
+        ('Anotaciones', 60),
+        ('Es Privado', 10),
+        ('Estado', 12),
+    ]
+    
+    def __init__(self, ruta_archivo: Path):
+        """
+        Args:
+            ruta_archivo: Archivo .xlsx a crear
+            
+        Raises:
+            FileManagerError: Si no se puede crear el libro
+        """
         try:
-            nombre_archivo = self.generar_nombre_archivo("consulta_procesos", "xlsx")
-            ruta_archivo = self.output_dir / nombre_archivo
+            from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+            from openpyxl.utils import get_column_letter
             
-            logger.info(f"Escribiendo Excel en: {ruta_archivo}")
+            self.ruta_archivo = ruta_archivo
+            self.filas = 0
+            self._celda = WriteOnlyCell
+            self._wb = Workbook(write_only=True)
+            self._ws = self._wb.create_sheet(self.HOJA)
             
-            # Preparar datos completos con las nuevas columnas
-            datos_excel = []
-            
-            for i, proceso in enumerate(procesos, 1):
-                datos_excel.append({
-                    'No.': i,
-                    'Radicado': proceso.radicado,
-                    'Demandante': proceso.demandante,
-                    'Demandado': proceso.demandado,
-                    'Juzgado': proceso.juzgado,
-                    'Departamento': proceso.departamento,
-                    'Tipo del Proceso': proceso.tipo_proceso,
-                    'Clase del Proceso': proceso.clase_proceso,
-                    'Subclase del Proceso': proceso.subclase_proceso,
-                    'Última Fecha de Actuación': proceso.fecha_ultima_actuacion,
-                    'Última Actuación': proceso.ultima_actuacion,  # NUEVO
-                    'Anotaciones': proceso.anotaciones,  # NUEVO
-                    'Es Privado': 'Sí' if proceso.es_privado else 'No',
-                    'Estado': proceso.status
-                })
+            # Estilos
+            borde = Side(style='thin')
+            self._border = Border(left=borde, right=borde, top=borde, bottom=borde)
+            self._data_font = Font(name='Calibri', size=10)
+            self._center_alignment = Alignment(horizontal='center', vertical='center')
+            self._left_alignment = Alignment(horizontal='left', vertical='center')
             
-            # Crear DataFrame
-            df = pd.DataFrame(datos_excel)
+            for posicion, (_, ancho) in enumerate(self.COLUMNAS, 1):
+                self._ws.column_dimensions[get_column_letter(posicion)].width = ancho
             
-            # Crear el escritor de Excel
-            with pd.ExcelWriter(ruta_archivo, engine='openpyxl') as writer:
-                # Escribir datos en una sola hoja
-                df.to_excel(writer, sheet_name='Datos de Procesos', index=False)
+            # Congelar primera fila
+            self._ws.freeze_panes = 'A2'
             
-            # Aplicar formato
-            self._aplicar_formato_excel(ruta_archivo)
+            header_font = Font(name='Calibri', size=12, bold=True, color='FFFFFF')
+            header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+            encabezado = []
+            for nombre, _ in self.COLUMNAS:
+                celda = WriteOnlyCell(self._ws, value=nombre)
+                celda.font = header_font
+                celda.fill = header_fill
+                celda.alignment = self._center_alignment
+                celda.border = self._border
+                encabezado.append(celda)
+            self._ws.append(encabezado)
             
-            logger.info(f"Archivo Excel creado exitosamente: {ruta_archivo}")
-            return ruta_archivo
+            logger.info(f"Escribiendo Excel en: {ruta_archivo}")
             
         except Exception as e:
-            error_msg = f"Error al escribir resultados en Excel: {e}"
+            error_msg = f"Error al crear el Excel de resultados: {e}"
             logger.error(error_msg)
             raise FileManagerError(error_msg)
     
-    def _aplicar_formato_excel(self, ruta_archivo: Path):
-        """Aplica formato básico al archivo Excel"""
+    def agregar(self, proceso: ProcesoInfo):
+        """
+        Agrega la fila de un proceso (numerada según el orden de llegada)
         
-        try:
-            from openpyxl import load_workbook
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            
-            # Cargar el workbook
-            wb = load_workbook(ruta_archivo)
-            ws = wb.active
-            
-            # Estilos
-            header_font = Font(name='Calibri', size=12, bold=True, color='FFFFFF')
-            header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-            data_font = Font(name='Calibri', size=10)
-            
-            border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            center_alignment = Alignment(horizontal='center', vertical='center')
-            left_alignment = Alignment(horizontal='left', vertical='center')
-            
-            # Formatear headers (fila 1)
-            for col in range(1, ws.max_column + 1):
-                cell = ws.cell(row=1, column=col)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_alignment
-                cell.border = border
-            
-            # Formatear datos
-            for row in range(2, ws.max_row + 1):
-                for col in range(1, ws.max_column + 1):
-                    cell = ws.cell(row=row, column=col)
-                    cell.font = data_font
-                    cell.border = border
-                    
-                    # Alineación según columna
-                    if col <= 2:  # No. y Radicado - centrado
-                        cell.alignment = center_alignment
-                    else:  # Resto - izquierda
-                        cell.alignment = left_alignment
-            
-            # Ajustar ancho de columnas
-            column_widths = {
-                'A': 8,   # No.
-                'B': 25,  # Radicado
-                'C': 30,  # Demandante
-                'D': 30,  # Demandado
-                'E': 40,  # Juzgado
-                'F': 15,  # Departamento
-                'G': 20,  # Tipo del Proceso
-                'H': 25,  # Clase del Proceso
-                'I': 25,  # Subclase del Proceso
-                'J': 12,  # Última Fecha
-                'K': 50,  # Última Actuación
-                'L': 60,  # Anotaciones
-                'M': 10,  # Es Privado
-                'N': 12   # Estado
-            }
-            
-            for col_letter, width in column_widths.items():
-                ws.column_dimensions[col_letter].width = width
-            
-            # Congelar primera fila
-            ws.freeze_panes = 'A2'
-            
-            # Guardar cambios
-            wb.save(ruta_archivo)
+        Args:
+            proceso: Proceso procesado
+        """
+        self.filas += 1
+        valores = [
+            self.filas,
+            proceso.radicado,
+            proceso.demandante,
+            proceso.demandado,
+            proceso.juzgado,
+            proceso.departamento,
+            proceso.tipo_proceso,
+            proceso.clase_proceso,
+            proceso.subclase_proceso,
+            proceso.fecha_ultima_actuacion,
+            proceso.ultima_actuacion,
+            proceso.anotaciones,
+            'Sí' if proceso.es_privado else 'No',
+            proceso.status,
+        ]
+        
+        fila = []
+        for columna, valor in enumerate(valores, 1):
+            celda = self._celda(self._ws, value=valor)
+            celda.font = self._data_font
+            celda.border = self._border
+            # No. y Radicado centrados, el resto a la izquierda
+            celda.alignment = self._center_alignment if columna <= 2 else self._left_alignment
+            fila.append(celda)
+        self._ws.append(fila)
+    
+    def cerrar(self) -> Path:
+        """
+        Termina y guarda el archivo
+        
+        Returns:
+            Ruta del archivo Excel creado
             
+        Raises:
+            FileManagerError: Si no se puede guardar
+        """
+        try:
+            self._wb.save(self.ruta_archivo)
         except Exception as e:
-            logger.warning(f"No se pudo aplicar formato al Excel: {e}")
-            # El archivo Excel básico ya fue creado, solo falló el formato
+            error_msg = f"Error al escribir resultados en Excel: {e}"
+            logger.error(error_msg)
+            raise FileManagerError(error_msg)
+        
+        logger.info(f"Archivo Excel creado exitosamente: {self.ruta_archivo} ({self.filas} filas)")
+        return self.ruta_archivo
 
 
 class FileManager:
@@ -372,7 +425,26 @@ class FileManager:
         try:
             # Escribir solo Excel
             archivo_excel = self.result_writer.escribir_resultados_excel(procesos)
+            return self.resumir_procesamiento(archivo_excel, estadisticas)
             
+        except Exception as e:
+            error_msg = f"Error en procesamiento completo: {e}"
+            logger.error(error_msg)
+            raise FileManagerError(error_msg)
+    
+    def resumir_procesamiento(self, archivo_excel: Path,
+                              estadisticas: EstadisticasProcesamiento) -> Dict[str, Any]:
+        """
+        Resume un procesamiento cuyo Excel ya fue escrito
+        
+        Args:
+            archivo_excel: Excel de resultados
+            estadisticas: Estadísticas del procesamiento
+            
+        Returns:
+            Diccionario con información del procesamiento
+        """
+        try:
             # Información del archivo de entrada
             info_entrada = self.excel_reader.obtener_info_archivo()
             
@@ -383,6 +455,7 @@ class FileManager:
                     "total_procesados": estadisticas.total_procesados,
                     "exitosos": estadisticas.exitosos,
                     "privados": estadisticas.privados,
+                    "no_encontrados": estadisticas.no_encontrados,
                     "fallidos": estadisticas.fallidos,
                     "tasa_exito": estadisticas.tasa_exito
                 }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Decodificación de las respuestas JSON de la API
+
+Usa orjson si está instalado (varias veces más rápido que el módulo json
+de la biblioteca estándar) y permite proyectar las actuaciones a los pocos
+campos que usa el procesamiento, para no retener en memoria, caché y
+estado el resto del payload.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+# Campos de cada actuación usados por ProcesosProcessor y las condiciones de parada
+CAMPOS_ACTUACION = ('idRegActuacion', 'fechaActuacion', 'actuacion', 'anotacion')
+
+Decodificador = Callable[[bytes], Any]
+
+
+def decodificar_json(contenido: bytes) -> Any:
+    """Decodifica con el módulo json de la biblioteca estándar"""
+    return json.loads(contenido)
+
+
+def decodificar_orjson(contenido: bytes) -> Any:
+    """
+    Decodifica con orjson
+    
+    orjson.JSONDecodeError hereda de json.JSONDecodeError, así que los
+    errores se manejan igual que con el decodificador estándar.
+    """
+    return orjson.loads(contenido)
+
+
+def crear_decodificador(nombre: Optional[str] = None) -> Decodificador:
+    """
+    Crea el decodificador de respuestas según la configuración
+    
+    Args:
+        nombre: "auto", "orjson" o "json" (default: APIConfig.JSON_DECODER);
+            "auto" usa orjson si está instalado
+            
+    Returns:
+        Función que recibe el cuerpo de la respuesta en bytes
+        
+    Raises:
+        ValueError: Si el nombre no es válido
+    """
+    nombre = (nombre or APIConfig.JSON_DECODER).lower()
+    if nombre not in ("auto", "orjson", "json"):
+        raise ValueError(f"Decodificador JSON desconocido: {nombre}")
+    
+    if nombre != "json":
+        if orjson is not None:
+            return decodificar_orjson
+        if nombre == "orjson":
+            logger.warning("orjson no está instalado; se usa el módulo json estándar")
+    
+    return decodificar_json
+
+
+def proyectar_actuaciones(datos: Any) -> Any:
+    """
+    Reduce una página de actuaciones a los campos que usa el procesamiento
+    
+    Args:
+        datos: Respuesta decodificada del endpoint de actuaciones
+        
+    Returns:
+        Diccionario con 'actuaciones' (solo CAMPOS_ACTUACION) y 'paginacion';
+        cualquier otra forma de respuesta se devuelve sin cambios
+    """
+    if not isinstance(datos, dict) or not isinstance(datos.get('actuaciones'), list):
+        return datos
+    
+    proyectado: Dict[str, Any] = {
+        'actuaciones': [
+            {campo: actuacion[campo] for campo in CAMPOS_ACTUACION if campo in actuacion}
+            for actuacion in datos['actuaciones']
+        ]
+    }
+    if 'paginacion' in datos:
+        proyectado['paginacion'] = datos['paginacion']
+    return proyectado
+
+
+# Proyección por endpoint aplicada al decodificar
+PROYECCIONES: Dict[str, Callable[[Any], Any]] = {
+    APIConfig.Endpoint.ACTUACIONES: proyectar_actuaciones,
+}
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seguimiento de latencias por endpoint y timeouts adaptativos
+
+Mantiene una ventana móvil de latencias observadas por endpoint y deriva
+de sus percentiles el timeout de lectura de cada petición.
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Ventana móvil de latencias por endpoint"""
+    
+    def __init__(self, ventana: Optional[int] = None, min_muestras: Optional[int] = None):
+        """
+        Args:
+            ventana: Latencias recientes conservadas por endpoint
+                (default: APIConfig.LATENCY_WINDOW)
+            min_muestras: Muestras necesarias antes de calcular percentiles
+                (default: APIConfig.LATENCY_MIN_SAMPLES)
+        """
+        self.ventana = ventana or APIConfig.LATENCY_WINDOW
+        self.min_muestras = min_muestras or APIConfig.LATENCY_MIN_SAMPLES
+        self._muestras: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+    
+    def registrar(self, endpoint: str, segundos: float):
+        """
+        Registra la latencia de una petición
+        
+        Args:
+            endpoint: Nombre lógico del endpoint
+            segundos: Tiempo hasta recibir la respuesta, o el timeout de
+                lectura si se agotó (cota inferior de la latencia real)
+        """
+        with self._lock:
+            muestras = self._muestras.get(endpoint)
+            if muestras is None:
+                muestras = self._muestras[endpoint] = deque(maxlen=self.ventana)
+            muestras.append(segundos)
+    
+    def percentil(self, endpoint: str, p: float) -> Optional[float]:
+        """
+        Calcula un percentil de la ventana (método del rango más cercano)
+        
+        Args:
+            endpoint: Nombre lógico del endpoint
+            p: Percentil entre 0 y 100
+            
+        Returns:
+            Latencia en segundos o None si aún no hay suficientes muestras
+        """
+        with self._lock:
+            muestras = sorted(self._muestras.get(endpoint, ()))
+        
+        if len(muestras) < self.min_muestras:
+            return None
+        
+        posicion = max(1, math.ceil(p / 100 * len(muestras)))
+        return muestras[posicion - 1]
+    
+    def timeout_lectura(self, endpoint: Optional[str]) -> float:
+        """
+        Timeout de lectura para el endpoint: múltiplo del p99 con límites
+        
+        Args:
+            endpoint: Nombre lógico del endpoint
+            
+        Returns:
+            Segundos entre APIConfig.READ_TIMEOUT_MIN y APIConfig.REQUEST_TIMEOUT
+            (este último mientras no haya suficientes muestras)
+        """
+        p99 = self.percentil(endpoint, 99) if endpoint else None
+        if p99 is None:
+            return APIConfig.REQUEST_TIMEOUT
+        
+        return min(APIConfig.REQUEST_TIMEOUT,
+                   max(APIConfig.READ_TIMEOUT_MIN, p99 * APIConfig.READ_TIMEOUT_P99_FACTOR))
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene p50, p95, p99 y timeout actual por endpoint
+        
+        Returns:
+            Diccionario endpoint -> resumen de latencias
+        """
+        with self._lock:
+            endpoints = list(self._muestras)
+        
+        estadisticas = {}
+        for endpoint in endpoints:
+            p50 = self.percentil(endpoint, 50)
+            if p50 is None:
+                continue
+            estadisticas[endpoint] = (f"p50 {p50:.2f}s, p95 {self.percentil(endpoint, 95):.2f}s, "
+                                      f"p99 {self.percentil(endpoint, 99):.2f}s, "
+                                      f"timeout {self.timeout_lectura(endpoint):.1f}s")
+        return estadisticas
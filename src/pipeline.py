@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline por etapas con colas acotadas
+
+Conecta una fuente, una serie de etapas (cada una con su propio número de
+hilos) y un sumidero mediante colas de tamaño fijo. Si una etapa se atrasa,
+las anteriores se bloquean al llenar su cola en lugar de acumular
+resultados en memoria, así que la memoria no crece con el tamaño de la
+entrada.
+
+El sumidero recibe los resultados en el orden de la entrada (o a medida
+que terminan, con ordenado=False) y corre en el hilo que llama a
+ejecutar(): un Ctrl-C ahí cancela el pipeline, los hilos terminan lo que
+tienen en curso y los resultados ya completos se entregan antes de volver.
+
+Una etapa puede devolver Reintento para que el elemento vuelva a pasar por
+ella pasado un tiempo, sin ocupar un hilo mientras espera: entretanto la
+etapa sigue con los demás elementos. Con entrega ordenada, los resultados
+posteriores al diferido esperan en memoria hasta que se resuelva y, al
+llegar a max_en_vuelo, la lectura se detiene: si las esperas son largas
+conviene la entrega sin orden.
+"""
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    from config import ProcessConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import ProcessConfig
+
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre comprobaciones de cancelación al esperar una cola
+_INTERVALO_CANCELACION = 0.1
+
+
+@dataclass
+class Etapa:
+    """Transformación aplicada a cada elemento por un grupo de hilos"""
+    nombre: str
+    funcion: Callable[[Any], Any]
+    trabajadores: int = 1
+
+
+@dataclass
+class Reintento:
+    """Resultado de una etapa que pide volver a pasar el elemento por ella más tarde"""
+    valor: Any  # Elemento que recibirá la etapa en el reintento
+    espera: float  # Segundos antes de volver a encolarlo
+
+
+class Pipeline:
+    """Etapas conectadas por colas acotadas con entrega ordenada o sin orden"""
+    
+    def __init__(self, etapas: List[Etapa], tamano_cola: Optional[int] = None,
+                 max_en_vuelo: Optional[int] = None, ordenado: bool = True):
+        """
+        Args:
+            etapas: Etapas en orden de ejecución
+            tamano_cola: Elementos máximos en cada cola entre etapas
+                (default: ProcessConfig.PIPELINE_QUEUE_SIZE)
+            max_en_vuelo: Elementos máximos leídos y aún no entregados al
+                sumidero, incluidos los que esperan a uno anterior para
+                mantener el orden (default: lo que cabe en colas y etapas)
+            ordenado: Si el sumidero recibe los resultados en el orden de la
+                entrada (False = a medida que terminan)
+                
+        Raises:
+            ValueError: Si no hay etapas o alguna tiene menos de un trabajador
+        """
+        if not etapas:
+            raise ValueError("El pipeline necesita al menos una etapa")
+        for etapa in etapas:
+            if etapa.trabajadores < 1:
+                raise ValueError(f"La etapa {etapa.nombre} necesita al menos un trabajador")
+        
+        self.etapas = etapas
+        self.ordenado = ordenado
+        self.tamano_cola = tamano_cola or ProcessConfig.PIPELINE_QUEUE_SIZE
+        self.max_en_vuelo = max_en_vuelo or (self.tamano_cola * (len(etapas) + 1)
+                                             + sum(etapa.trabajadores for etapa in etapas))
+        self.cancelado = threading.Event()
+        self.procesados: Dict[str, int] = {etapa.nombre: 0 for etapa in etapas}
+        self.reintentos: Dict[str, int] = {etapa.nombre: 0 for etapa in etapas}
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._detenido = threading.Event()
+        self._total: Optional[int] = None  # Entradas leídas, al terminar la lectura
+        self._diferidos: List[tuple] = []  # Montículo (vencimiento, secuencia, posición, elemento)
+        self._secuencia = itertools.count()
+        self._hay_diferidos = threading.Condition(self._lock)
+    
+    def cancelar(self):
+        """Detiene la lectura y las etapas después de los elementos en curso"""
+        self.cancelado.set()
+        self._detener()
+    
+    def _detener(self):
+        self._detenido.set()
+        with self._hay_diferidos:
+            self._hay_diferidos.notify_all()
+    
+    def ejecutar(self, entradas: Iterable[Any], sumidero: Callable[[Any], None]) -> bool:
+        """
+        Pasa cada entrada por todas las etapas y entrega el resultado al sumidero
+        
+        Args:
+            entradas: Elementos a procesar (se consumen a medida que hay cupo)
+            sumidero: Recibe cada resultado, en el orden de las entradas si
+                el pipeline es ordenado
+            
+        Returns:
+            True si se procesaron todas las entradas, False si se canceló
+            
+        Raises:
+            Exception: La primera excepción de la lectura o de una etapa, una
+                vez detenido el pipeline
+        """
+        colas = [queue.Queue(maxsize=self.tamano_cola) for _ in range(len(self.etapas) + 1)]
+        cupo = threading.Semaphore(self.max_en_vuelo)
+        
+        hilos = [threading.Thread(target=self._leer, args=(entradas, colas[0], cupo),
+                                  name="pipeline-lectura", daemon=True),
+                 threading.Thread(target=self._reencolar, args=(colas,), name="pipeline-reintentos", daemon=True)]
+        for posicion, etapa in enumerate(self.etapas):
+            for numero in range(etapa.trabajadores):
+                hilos.append(threading.Thread(
+                    target=self._trabajar,
+                    args=(etapa, posicion, colas[posicion], colas[posicion + 1]),
+                    name=f"pipeline-{etapa.nombre}-{numero}", daemon=True
+                ))
+        
+        for hilo in hilos:
+            hilo.start()
+        
+        try:
+            completo = self._consumir(colas[-1], sumidero, cupo)
+        finally:
+            self._detener()
+            if any(hilo.is_alive() for hilo in hilos):
+                logger.info("Esperando a que terminen los elementos en curso del pipeline...")
+            for hilo in hilos:
+                hilo.join()
+        
+        if self._error is not None:
+            raise self._error
+        return completo
+    
+    def _consumir(self, cola: queue.Queue, sumidero: Callable[[Any], None], cupo: threading.Semaphore) -> bool:
+        """Entrega los resultados al sumidero (en el orden de la entrada si es ordenado)"""
+        pendientes: Dict[int, Any] = {}
+        entregados = 0  # Con entrega ordenada, también el índice del siguiente
+        
+        try:
+            # Termina cuando la lectura acabó y se entregaron todas las entradas
+            while self._total is None or entregados < self._total:
+                if self.cancelado.is_set():
+                    break
+                try:
+                    indice, valor = cola.get(timeout=_INTERVALO_CANCELACION)
+                except queue.Empty:
+                    continue
+                
+                if not self.ordenado:
+                    sumidero(valor)
+                    cupo.release()
+                    entregados += 1
+                    continue
+                
+                pendientes[indice] = valor
+                while entregados in pendientes:
+                    sumidero(pendientes.pop(entregados))
+                    cupo.release()
+                    entregados += 1
+            else:
+                return True
+        except KeyboardInterrupt:
+            logger.warning("Pipeline interrumpido por el usuario")
+            self.cancelar()
+        
+        # Cancelado: se entregan en orden los resultados que ya terminaron
+        for indice in sorted(pendientes):
+            sumidero(pendientes[indice])
+        return False
+    
+    def _leer(self, entradas: Iterable[Any], salida: queue.Queue, cupo: threading.Semaphore):
+        """Hilo de lectura: numera las entradas y las encola según el cupo"""
+        total = 0
+        try:
+            for indice, valor in enumerate(entradas):
+                while not cupo.acquire(timeout=_INTERVALO_CANCELACION):
+                    if self._detenido.is_set():
+                        return
+                if not self._poner(salida, (indice, valor)):
+                    return
+                total = indice + 1
+        except Exception as e:
+            self._fallar("lectura", e)
+            return
+        self._total = total
+    
+    def _trabajar(self, etapa: Etapa, posicion: int, entrada: queue.Queue, salida: queue.Queue):
+        """Hilo de una etapa: aplica su función hasta que el pipeline se detiene"""
+        try:
+            while True:
+                elemento = self._obtener(entrada)
+                if elemento is None:
+                    return
+                
+                indice, valor = elemento
+                resultado = etapa.funcion(valor)
+                if self.cancelado.is_set():
+                    # El sumidero ya no lee la cola: lo que termina tras cancelar no se entrega
+                    return
+                if isinstance(resultado, Reintento):
+                    self._diferir(posicion, (indice, resultado.valor), resultado.espera)
+                    with self._lock:
+                        self.reintentos[etapa.nombre] += 1
+                    continue
+                
+                with self._lock:
+                    self.procesados[etapa.nombre] += 1
+                if not self._poner(salida, (indice, resultado)):
+                    return
+        except Exception as e:
+            self._fallar(etapa.nombre, e)
+    
+    def _diferir(self, posicion: int, elemento: tuple, espera: float):
+        """Guarda un elemento para volver a encolarlo en la etapa pasado el tiempo de espera"""
+        with self._hay_diferidos:
+            heapq.heappush(self._diferidos,
+                           (time.monotonic() + max(espera, 0.0), next(self._secuencia), posicion, elemento))
+            self._hay_diferidos.notify()
+    
+    def _reencolar(self, colas: List[queue.Queue]):
+        """Hilo de reintentos: devuelve cada elemento diferido a su etapa al vencer su espera"""
+        while True:
+            with self._hay_diferidos:
+                while not self._detenido.is_set():
+                    ahora = time.monotonic()
+                    if self._diferidos and self._diferidos[0][0] <= ahora:
+                        break
+                    self._hay_diferidos.wait(self._diferidos[0][0] - ahora if self._diferidos else None)
+                if self._detenido.is_set():
+                    return
+                _, _, posicion, elemento = heapq.heappop(self._diferidos)
+            
+            if not self._poner(colas[posicion], elemento):
+                return
+    
+    def _obtener(self, cola: queue.Queue) -> Any:
+        """Espera un elemento de la cola (None si el pipeline se detuvo)"""
+        while not self._detenido.is_set():
+            try:
+                return cola.get(timeout=_INTERVALO_CANCELACION)
+            except queue.Empty:
+                continue
+        return None
+    
+    def _poner(self, cola: queue.Queue, elemento: Any) -> bool:
+        """Encola esperando si está llena (False si el pipeline se detuvo)"""
+        while not self._detenido.is_set():
+            try:
+                cola.put(elemento, timeout=_INTERVALO_CANCELACION)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _fallar(self, nombre: str, error: Exception):
+        """Registra el primer error y cancela el pipeline"""
+        logger.error(f"Error en la etapa {nombre} del pipeline: {error}")
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self.cancelar()
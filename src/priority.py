@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Priorización de radicados antes de la etapa de consulta
+
+Con un presupuesto de peticiones fijo, el orden de consulta decide qué
+queda al día si la ejecución se corta. Los radicados se ordenan por:
+
+1. Los que fallaron en la ejecución anterior
+2. La prioridad explícita de la columna del Excel (número mayor primero)
+3. Las actuaciones nuevas esperadas: frecuencia histórica de actuaciones
+   por el tiempo desde la última actualización exitosa (los que nunca se
+   actualizaron van primero)
+4. El tiempo desde la última actualización, y por último el orden de la
+   entrada
+"""
+
+import logging
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from state_store import ProcessStateStore
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from state_store import ProcessStateStore
+
+
+logger = logging.getLogger(__name__)
+
+_SEGUNDOS_POR_MES = 30 * 24 * 60 * 60
+
+
+class PriorizadorRadicados:
+    """Ordena los radicados para consultar primero los más valiosos"""
+    
+    def __init__(self, estado: Optional[ProcessStateStore] = None, prioridades: Optional[Dict[str, float]] = None,
+                 fallidos: Iterable[str] = (), reloj: Callable[[], float] = time.time):
+        """
+        Args:
+            estado: Estado por radicado con la última actualización y la
+                frecuencia de actuaciones (None = sin ese criterio)
+            prioridades: Prioridad explícita por radicado (número mayor = más urgente)
+            fallidos: Radicados que fallaron en la ejecución anterior
+            reloj: Función que devuelve el tiempo actual (epoch)
+        """
+        self.estado = estado
+        self.prioridades = prioridades or {}
+        self.fallidos = set(fallidos)
+        self._reloj = reloj
+        self.resumen: Dict[str, int] = {}
+    
+    def ordenar(self, radicados: List[str]) -> List[str]:
+        """
+        Ordena los radicados de mayor a menor prioridad
+        
+        Args:
+            radicados: Radicados únicos en el orden de la entrada
+            
+        Returns:
+            Los mismos radicados en el orden en que conviene consultarlos
+        """
+        actividad = self.estado.obtener_actividad(radicados) if self.estado else {}
+        ahora = self._reloj()
+        
+        ordenados = sorted(range(len(radicados)),
+                           key=lambda posicion: self._clave(radicados[posicion], posicion, actividad, ahora))
+        
+        self.resumen = {
+            'fallidos_anteriores': sum(1 for radicado in radicados if radicado in self.fallidos),
+            'con_prioridad_explicita': sum(1 for radicado in radicados if radicado in self.prioridades),
+            'sin_actualizacion_previa': sum(1 for radicado in radicados if radicado not in actividad),
+        }
+        logger.info(f"Radicados priorizados: {self.resumen}")
+        return [radicados[posicion] for posicion in ordenados]
+    
+    def _clave(self, radicado: str, posicion: int, actividad: Dict[str, Tuple[float, Optional[float]]],
+               ahora: float) -> tuple:
+        """Clave de orden: las tuplas menores se consultan primero"""
+        if radicado in actividad:
+            actualizado_en, por_mes = actividad[radicado]
+            meses = max(ahora - actualizado_en, 0.0) / _SEGUNDOS_POR_MES
+            esperadas = (por_mes or 0.0) * meses
+        else:
+            meses = esperadas = math.inf
+        
+        return (radicado not in self.fallidos, -self.prioridades.get(radicado, 0.0), -esperadas, -meses, posicion)
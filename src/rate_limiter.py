@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Limitadores de peticiones para la API de la Rama Judicial
+
+Todos los limitadores trabajan por reserva: cada petición reserva su turno
+bajo un lock y luego espera fuera de él, así varios hilos o corrutinas
+pueden compartir un mismo limitador sin ráfagas ni esperas duplicadas.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(ABC):
+    """Interfaz común para los limitadores de peticiones"""
+    
+    def __init__(self, reloj: Callable[[], float] = time.monotonic,
+                 dormir: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            reloj: Función que devuelve el tiempo actual en segundos
+            dormir: Función usada para esperar en modo síncrono
+        """
+        self._reloj = reloj
+        self._dormir = dormir
+        self._lock = threading.Lock()
+    
+    @abstractmethod
+    def reservar(self, costo: int = 1) -> float:
+        """
+        Reserva turno para una o más peticiones
+        
+        Args:
+            costo: Número de peticiones a reservar
+            
+        Returns:
+            Segundos que se deben esperar antes de enviar
+        """
+    
+    def adquirir(self, costo: int = 1) -> float:
+        """
+        Reserva turno y bloquea el hilo hasta que llegue
+        
+        Args:
+            costo: Número de peticiones a reservar
+            
+        Returns:
+            Segundos esperados
+        """
+        espera = self.reservar(costo)
+        if espera > 0:
+            logger.info(f"Rate limit alcanzado, esperando {espera:.1f} segundos")
+            self._dormir(espera)
+        return espera
+    
+    async def adquirir_async(self, costo: int = 1) -> float:
+        """
+        Reserva turno y espera sin bloquear el event loop
+        
+        Args:
+            costo: Número de peticiones a reservar
+            
+        Returns:
+            Segundos esperados
+        """
+        espera = self.reservar(costo)
+        if espera > 0:
+            logger.info(f"Rate limit alcanzado, esperando {espera:.1f} segundos")
+            await asyncio.sleep(espera)
+        return espera
+    
+    def registrar_respuesta(self, status_code: Optional[int], latencia: float):
+        """
+        Informa el resultado de una petición (los limitadores fijos lo ignoran)
+        
+        Args:
+            status_code: Código HTTP o None si no hubo respuesta (timeout, conexión)
+            latencia: Duración de la petición en segundos
+        """
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas del limitador para el resumen de ejecución
+        
+        Returns:
+            Diccionario con estadísticas (vacío si no hay nada que reportar)
+        """
+        return {}
+
+
+class AdjustableRateLimiter(RateLimiter):
+    """Limitador cuya tasa puede cambiarse en caliente (requisito de AIMDController)"""
+    
+    @abstractmethod
+    def ajustar_tasa(self, requests_per_minute: float):
+        """
+        Cambia la tasa permitida en caliente
+        
+        Args:
+            requests_per_minute: Nueva tasa de peticiones por minuto
+        """
+
+
+class SlidingWindowLimiter(AdjustableRateLimiter):
+    """Ventana deslizante: como máximo N peticiones en cualquier periodo"""
+    
+    def __init__(self, max_peticiones: int, periodo: float = 60.0, **kwargs):
+        """
+        Args:
+            max_peticiones: Peticiones permitidas por periodo
+            periodo: Duración de la ventana en segundos
+            **kwargs: Opciones de RateLimiter (reloj, dormir)
+        """
+        super().__init__(**kwargs)
+        if max_peticiones < 1:
+            raise ValueError("max_peticiones debe ser al menos 1")
+        
+        self.max_peticiones = max_peticiones
+        self.periodo = periodo
+        # Instantes concedidos a las últimas max_peticiones peticiones
+        self._turnos = deque(maxlen=max_peticiones)
+    
+    def reservar(self, costo: int = 1) -> float:
+        """Reserva turno respetando la ventana deslizante"""
+        with self._lock:
+            ahora = self._reloj()
+            turno = ahora
+            
+            for _ in range(costo):
+                if len(self._turnos) == self.max_peticiones:
+                    # La petición más antigua de la ventana marca el siguiente hueco
+                    turno = max(ahora, self._turnos[0] + self.periodo)
+                self._turnos.append(turno)
+            
+            return turno - ahora
+    
+    def ajustar_tasa(self, requests_per_minute: float):
+        """Cambia el tamaño de la ventana conservando los turnos más recientes"""
+        with self._lock:
+            self.max_peticiones = max(1, round(requests_per_minute * self.periodo / 60.0))
+            self._turnos = deque(self._turnos, maxlen=self.max_peticiones)
+
+
+class _TokenBucketBase(RateLimiter):
+    """Tasa y ráfaga comunes a los token bucket local y compartido"""
+    
+    def __init__(self, requests_per_minute: float, burst: int = 1, **kwargs):
+        """
+        Args:
+            requests_per_minute: Tasa sostenida de peticiones por minuto
+            burst: Peticiones que se pueden enviar seguidas sin esperar
+            **kwargs: Opciones de RateLimiter (reloj, dormir)
+        """
+        super().__init__(**kwargs)
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute debe ser positivo")
+        if burst < 1:
+            raise ValueError("burst debe ser al menos 1")
+        
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self._tokens = float(burst)
+        self._ultimo = self._reloj()
+    
+    @property
+    def _tasa(self) -> float:
+        """Tokens generados por segundo"""
+        return self.requests_per_minute / 60.0
+
+
+class TokenBucketLimiter(_TokenBucketBase, AdjustableRateLimiter):
+    """Token bucket: tasa sostenida con ráfagas acotadas"""
+    
+    def reservar(self, costo: int = 1) -> float:
+        """Consume tokens; si no alcanzan, la deuda se paga esperando"""
+        with self._lock:
+            ahora = self._reloj()
+            self._tokens = min(self.burst, self._tokens + (ahora - self._ultimo) * self._tasa)
+            self._ultimo = ahora
+            self._tokens -= costo
+            
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._tasa
+    
+    def ajustar_tasa(self, requests_per_minute: float):
+        """Cambia la tasa liquidando primero los tokens generados a la tasa anterior"""
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute debe ser positivo")
+        
+        with self._lock:
+            ahora = self._reloj()
+            self._tokens = min(self.burst, self._tokens + (ahora - self._ultimo) * self._tasa)
+            self._ultimo = ahora
+            self.requests_per_minute = requests_per_minute
+
+
+@contextmanager
+def _bloqueo_archivo(archivo):
+    """
+    Bloqueo exclusivo entre procesos sobre un archivo abierto
+    
+    Usa fcntl.flock en POSIX y msvcrt.locking en Windows.
+    
+    Args:
+        archivo: Archivo abierto en modo lectura/escritura
+    """
+    if os.name == 'nt':
+        archivo.seek(0)
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+
+
+class SharedTokenBucketLimiter(_TokenBucketBase):
+    """
+    Token bucket compartido por todos los procesos del host
+    
+    Los tokens viven en un archivo de estado protegido con un lock de archivo,
+    de modo que los shards de main.py y script_base/script.py consumen de un
+    único presupuesto por IP. Todos los procesos deben usar la misma tasa y
+    ráfaga; el reloj es time.time() porque se compara entre procesos.
+    
+    La tasa es fija: cambiarla en un solo proceso rompería el presupuesto
+    común, así que no es un AdjustableRateLimiter ni admite control adaptativo.
+    """
+    
+    def __init__(self, requests_per_minute: float, burst: int = 1,
+                 ruta_estado: Optional[Path] = None, **kwargs):
+        """
+        Args:
+            requests_per_minute: Tasa sostenida de peticiones por minuto (total del host)
+            burst: Peticiones que se pueden enviar seguidas sin esperar
+            ruta_estado: Archivo de estado compartido (default: APIConfig.RATE_LIMIT_SHARED_FILE)
+            **kwargs: Opciones de RateLimiter (reloj, dormir)
+        """
+        kwargs.setdefault('reloj', time.time)
+        super().__init__(requests_per_minute, burst=burst, **kwargs)
+        self.ruta_estado = Path(ruta_estado or APIConfig.RATE_LIMIT_SHARED_FILE)
+        self.ruta_estado.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Rate limit compartido en: {self.ruta_estado}")
+    
+    def _leer_estado(self, contenido: bytes, ahora: float) -> Dict[str, float]:
+        """Interpreta el archivo de estado; si está vacío o corrupto arranca lleno"""
+        try:
+            estado = json.loads(contenido.decode('utf-8'))
+            return {'tokens': float(estado['tokens']), 'ultimo': float(estado['ultimo'])}
+        except (ValueError, KeyError, TypeError):
+            return {'tokens': float(self.burst), 'ultimo': ahora}
+    
+    def reservar(self, costo: int = 1) -> float:
+        """Consume tokens del presupuesto compartido bajo el lock de archivo"""
+        # El lock de hilo es necesario: flock no excluye hilos del mismo proceso
+        with self._lock:
+            fd = os.open(self.ruta_estado, os.O_RDWR | os.O_CREAT, 0o666)
+            with os.fdopen(fd, 'r+b') as archivo, _bloqueo_archivo(archivo):
+                archivo.seek(0)
+                ahora = self._reloj()
+                estado = self._leer_estado(archivo.read(), ahora)
+                
+                # Un reloj que retrocede no debe generar tokens negativos
+                transcurrido = max(0.0, ahora - estado['ultimo'])
+                tokens = min(self.burst, estado['tokens'] + transcurrido * self._tasa) - costo
+                
+                archivo.seek(0)
+                archivo.truncate()
+                archivo.write(json.dumps({'tokens': tokens, 'ultimo': max(ahora, estado['ultimo'])}).encode('utf-8'))
+                archivo.flush()
+        
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self._tasa
+    
+
+
+class AIMDController(RateLimiter):
+    """
+    Control adaptativo de la tasa (aumento aditivo, reducción multiplicativa)
+    
+    Envuelve otro limitador y ajusta su tasa según las respuestas: sube
+    poco a poco mientras la API responde bien y recorta de golpe ante 429,
+    errores 5xx, fallos de red o una latencia que crece sobre su línea base.
+    """
+    
+    def __init__(self, limiter: AdjustableRateLimiter, tasa_inicial: float, minimo: float, maximo: float,
+                 incremento: float = 1.0, factor_reduccion: float = 0.5,
+                 factor_latencia: float = 2.0, enfriamiento: float = 30.0, **kwargs):
+        """
+        Args:
+            limiter: Limitador cuya tasa se controla
+            tasa_inicial: Tasa de arranque en peticiones por minuto
+            minimo: Tasa mínima (piso)
+            maximo: Tasa máxima (techo)
+            incremento: Peticiones/min que se suman tras un minuto sano
+            factor_reduccion: Multiplicador aplicado ante congestión (0-1)
+            factor_latencia: Latencia reciente / línea base que se considera congestión
+            enfriamiento: Segundos mínimos entre dos reducciones
+            **kwargs: Opciones de RateLimiter (reloj, dormir)
+        """
+        super().__init__(**kwargs)
+        if not isinstance(limiter, AdjustableRateLimiter):
+            raise ValueError(f"{type(limiter).__name__} no admite cambiar la tasa")
+        if not 0 < minimo <= maximo:
+            raise ValueError("Se requiere 0 < minimo <= maximo")
+        if not 0 < factor_reduccion < 1:
+            raise ValueError("factor_reduccion debe estar entre 0 y 1")
+        
+        self.limiter = limiter
+        self.minimo = minimo
+        self.maximo = maximo
+        self.incremento = incremento
+        self.factor_reduccion = factor_reduccion
+        self.factor_latencia = factor_latencia
+        self.enfriamiento = enfriamiento
+        self.tasa = min(max(tasa_inicial, minimo), maximo)
+        self.limiter.ajustar_tasa(self.tasa)
+        
+        self.aumentos = 0
+        self.reducciones = 0
+        self.historial = deque(maxlen=50)
+        self._respuestas_sanas = 0
+        self._ultima_reduccion = None
+        self._latencia_base = None
+        self._latencia_reciente = None
+        self._muestras_latencia = 0
+    
+    def reservar(self, costo: int = 1) -> float:
+        """Delegado al limitador controlado"""
+        return self.limiter.reservar(costo)
+    
+    def adquirir(self, costo: int = 1) -> float:
+        """Delegado al limitador controlado"""
+        return self.limiter.adquirir(costo)
+    
+    async def adquirir_async(self, costo: int = 1) -> float:
+        """Delegado al limitador controlado"""
+        return await self.limiter.adquirir_async(costo)
+    
+    def _detectar_congestion(self, status_code: Optional[int], latencia: float) -> Optional[str]:
+        """Devuelve el motivo de congestión de una respuesta o None si fue sana"""
+        if status_code is None:
+            return "error_red"
+        if status_code == 429:
+            return "429"
+        if status_code >= 500:
+            return "5xx"
+        
+        # Línea base lenta y media reciente rápida (EWMA)
+        self._muestras_latencia += 1
+        if self._latencia_base is None:
+            self._latencia_base = self._latencia_reciente = latencia
+            return None
+        
+        self._latencia_base += 0.02 * (latencia - self._latencia_base)
+        self._latencia_reciente += 0.3 * (latencia - self._latencia_reciente)
+        
+        if (self._muestras_latencia >= 10
+                and self._latencia_reciente > self._latencia_base * self.factor_latencia):
+            return "latencia"
+        return None
+    
+    def _cambiar_tasa(self, nueva_tasa: float, accion: str, motivo: str):
+        """Aplica la nueva tasa al limitador y registra la decisión"""
+        anterior = self.tasa
+        self.tasa = nueva_tasa
+        self.limiter.ajustar_tasa(nueva_tasa)
+        self.historial.append({
+            'instante': time.time(),
+            'accion': accion,
+            'motivo': motivo,
+            'tasa_anterior': round(anterior, 2),
+            'tasa_nueva': round(nueva_tasa, 2)
+        })
+        logger.info(f"Rate adaptativo: {accion} por {motivo} ({anterior:.1f} -> {nueva_tasa:.1f} req/min)")
+    
+    def registrar_respuesta(self, status_code: Optional[int], latencia: float):
+        """Ajusta la tasa según el resultado de una petición"""
+        with self._lock:
+            motivo = self._detectar_congestion(status_code, latencia)
+            
+            if motivo:
+                self._respuestas_sanas = 0
+                ahora = self._reloj()
+                if self._ultima_reduccion is not None and ahora - self._ultima_reduccion < self.enfriamiento:
+                    return
+                
+                self._ultima_reduccion = ahora
+                nueva_tasa = max(self.minimo, self.tasa * self.factor_reduccion)
+                if nueva_tasa < self.tasa:
+                    self.reducciones += 1
+                    self._cambiar_tasa(nueva_tasa, "reduccion", motivo)
+                return
+            
+            # Un minuto de respuestas sanas a la tasa actual justifica subir
+            self._respuestas_sanas += 1
+            if self._respuestas_sanas >= self.tasa:
+                self._respuestas_sanas = 0
+                nueva_tasa = min(self.maximo, self.tasa + self.incremento)
+                if nueva_tasa > self.tasa:
+                    self.aumentos += 1
+                    self._cambiar_tasa(nueva_tasa, "aumento", "respuestas_sanas")
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Tasa actual y decisiones tomadas por el controlador"""
+        with self._lock:
+            return {
+                'tasa_actual': round(self.tasa, 2),
+                'tasa_minima': self.minimo,
+                'tasa_maxima': self.maximo,
+                'aumentos': self.aumentos,
+                'reducciones': self.reducciones,
+                'latencia_base': round(self._latencia_base, 3) if self._latencia_base else None,
+                'decisiones': list(self.historial)
+            }
+
+
+def crear_limitador(tipo: str = None, requests_per_minute: float = None,
+                    burst: int = None, adaptativo: bool = None) -> RateLimiter:
+    """
+    Crea un limitador según la configuración
+    
+    Args:
+        tipo: 'sliding_window', 'token_bucket' o 'shared_token_bucket'
+            (default: APIConfig.RATE_LIMITER)
+        requests_per_minute: Peticiones por minuto (default: APIConfig)
+        burst: Ráfaga del token bucket (default: APIConfig.RATE_LIMIT_BURST)
+        adaptativo: Envolver en un AIMDController (default: APIConfig.RATE_LIMIT_ADAPTIVE)
+        
+    Returns:
+        Limitador configurado
+        
+    Raises:
+        ValueError: Si el tipo de limitador no existe, o si se pide tasa
+            adaptativa con un limitador de tasa fija (el compartido)
+    """
+    tipo = tipo or APIConfig.RATE_LIMITER
+    requests_per_minute = requests_per_minute or APIConfig.RATE_LIMIT_REQUESTS_PER_MINUTE
+    burst = burst or APIConfig.RATE_LIMIT_BURST
+    if adaptativo is None:
+        adaptativo = APIConfig.RATE_LIMIT_ADAPTIVE
+    if tipo == "sliding_window":
+        limitador = SlidingWindowLimiter(int(requests_per_minute), periodo=60.0)
+    elif tipo == "token_bucket":
+        limitador = TokenBucketLimiter(requests_per_minute, burst=burst)
+    elif tipo == "shared_token_bucket":
+        limitador = SharedTokenBucketLimiter(requests_per_minute, burst=burst)
+    else:
+        raise ValueError(f"Tipo de limitador desconocido: {tipo}")
+    
+    if not adaptativo:
+        return limitador
+    if not isinstance(limitador, AdjustableRateLimiter):
+        raise ValueError(f"La tasa adaptativa no se puede combinar con el limitador {tipo}: "
+                         "su tasa es fija (el rate limit compartido perdería el presupuesto común)")
+    
+    return AIMDController(
+        limitador,
+        tasa_inicial=requests_per_minute,
+        minimo=APIConfig.RATE_LIMIT_MIN_PER_MINUTE,
+        maximo=APIConfig.RATE_LIMIT_MAX_PER_MINUTE,
+        incremento=APIConfig.AIMD_INCREMENT,
+        factor_reduccion=APIConfig.AIMD_DECREASE_FACTOR,
+        factor_latencia=APIConfig.AIMD_LATENCY_FACTOR,
+        enfriamiento=APIConfig.AIMD_COOLDOWN
+    )
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché persistente de respuestas de la API de la Rama Judicial
+
+Guarda en SQLite las respuestas exitosas por endpoint y parámetros
+normalizados, con TTL por endpoint y expulsión LRU por tamaño. También
+recuerda los radicados que la API no encontró (caché negativa) y los
+procesos privados, de los que nunca se obtiene más que el registro básico.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    from config import CacheConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import CacheConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom en memoria
+    
+    Responde "seguro que no está" sin falsos negativos; un "puede estar"
+    debe confirmarse contra el almacenamiento real.
+    """
+    
+    def __init__(self, capacidad: int, tasa_falsos_positivos: float = 0.01):
+        """
+        Args:
+            capacidad: Número esperado de elementos
+            tasa_falsos_positivos: Tasa de falsos positivos aceptada con esa capacidad
+        """
+        capacidad = max(1, capacidad)
+        self.num_bits = max(8, int(-capacidad * math.log(tasa_falsos_positivos) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacidad * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _posiciones(self, elemento: str) -> Iterator[int]:
+        """Posiciones de bit del elemento (doble hashing)"""
+        digest = hashlib.blake2b(elemento.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def agregar(self, elemento: str):
+        """Agrega un elemento al filtro"""
+        for posicion in self._posiciones(elemento):
+            self._bits[posicion >> 3] |= 1 << (posicion & 7)
+    
+    def __contains__(self, elemento: str) -> bool:
+        return all(self._bits[posicion >> 3] & (1 << (posicion & 7))
+                   for posicion in self._posiciones(elemento))
+
+
+class ResponseCache:
+    """Caché de respuestas en SQLite con TTL por endpoint y LRU"""
+    
+    def __init__(self, ruta: Optional[Path] = None, max_entradas: Optional[int] = None,
+                 ttls: Optional[Dict[str, float]] = None, modo: Optional[str] = None,
+                 ttl_negativo: Optional[float] = None, usar_bloom: Optional[bool] = None,
+                 ttl_privados: Optional[float] = None, revalidar_privados_despues: Optional[float] = None,
+                 reloj: Callable[[], float] = time.time):
+        """
+        Args:
+            ruta: Archivo SQLite (default: CacheConfig.RUTA)
+            max_entradas: Máximo de respuestas guardadas (default: CacheConfig.MAX_ENTRADAS)
+            ttls: Segundos de vigencia por endpoint (default: CacheConfig.TTLS)
+            modo: CacheConfig.Modo.NORMAL, REFRESCAR o SOLO_CACHE
+            ttl_negativo: Segundos que se recuerda un radicado no encontrado,
+                0 para no recordarlos (default: CacheConfig.NEGATIVE_TTL)
+            usar_bloom: Si filtrar las búsquedas negativas con un filtro de
+                Bloom en memoria (default: CacheConfig.NEGATIVE_BLOOM_FILTER)
+            ttl_privados: Segundos que se reutiliza un proceso privado, 0 para
+                no guardarlos (default: CacheConfig.PRIVATE_TTL)
+            revalidar_privados_despues: Antigüedad a partir de la cual un
+                privado vigente se marca para revalidar
+                (default: CacheConfig.PRIVATE_REVALIDATE_AFTER)
+            reloj: Función que devuelve el tiempo actual (epoch)
+        """
+        self.ruta = Path(ruta or CacheConfig.RUTA)
+        self.max_entradas = max_entradas or CacheConfig.MAX_ENTRADAS
+        self.ttls = dict(CacheConfig.TTLS, **(ttls or {}))
+        self.modo = modo or CacheConfig.MODO
+        self.ttl_negativo = CacheConfig.NEGATIVE_TTL if ttl_negativo is None else ttl_negativo
+        self.ttl_privados = CacheConfig.PRIVATE_TTL if ttl_privados is None else ttl_privados
+        self.revalidar_privados_despues = (CacheConfig.PRIVATE_REVALIDATE_AFTER
+                                           if revalidar_privados_despues is None
+                                           else revalidar_privados_despues)
+        self._reloj = reloj
+        
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.expulsiones = 0
+        self.no_encontrados_evitados = 0
+        self.privados_evitados = 0
+        self._escrituras_desde_limpieza = 0
+        
+        self._lock = threading.Lock()
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS respuestas (
+                clave TEXT PRIMARY KEY,
+                endpoint TEXT,
+                datos TEXT NOT NULL,
+                creado REAL NOT NULL,
+                expira REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL
+            )
+        """)
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_respuestas_acceso ON respuestas (ultimo_acceso)"
+        )
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS no_encontrados (
+                radicado TEXT PRIMARY KEY,
+                expira REAL NOT NULL
+            )
+        """)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS privados (
+                radicado TEXT PRIMARY KEY,
+                proceso_basico TEXT NOT NULL,
+                creado REAL NOT NULL,
+                expira REAL NOT NULL
+            )
+        """)
+        self._conexion.commit()
+        
+        self._bloom = None
+        if CacheConfig.NEGATIVE_BLOOM_FILTER if usar_bloom is None else usar_bloom:
+            self._bloom = BloomFilter(CacheConfig.NEGATIVE_BLOOM_CAPACITY)
+            for (radicado,) in self._conexion.execute(
+                    "SELECT radicado FROM no_encontrados WHERE expira > ?", (self._reloj(),)):
+                self._bloom.agregar(radicado)
+        logger.info(f"Caché de respuestas en {self.ruta} (modo: {self.modo})")
+    
+    @property
+    def solo_cache(self) -> bool:
+        """True si los fallos de caché no deben ir a la red"""
+        return self.modo == CacheConfig.Modo.SOLO_CACHE
+    
+    @staticmethod
+    def generar_clave(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Genera la clave de una petición con parámetros normalizados
+        
+        Args:
+            method: Método HTTP
+            url: URL completa
+            params: Parámetros de la query (el orden no importa)
+            
+        Returns:
+            Clave estable para la petición
+        """
+        params_normalizados = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return f"{method.upper()} {url} {json.dumps(params_normalizados, ensure_ascii=False)}"
+    
+    def obtener(self, clave: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca una respuesta vigente
+        
+        Args:
+            clave: Clave de la petición (ver generar_clave)
+            
+        Returns:
+            Datos de la respuesta o None si no hay entrada vigente
+        """
+        if self.modo == CacheConfig.Modo.REFRESCAR:
+            return None
+        
+        ahora = self._reloj()
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT datos FROM respuestas WHERE clave = ? AND expira > ?", (clave, ahora)
+            ).fetchone()
+            
+            if fila is None:
+                self.fallos += 1
+                return None
+            
+            self.aciertos += 1
+            self._conexion.execute(
+                "UPDATE respuestas SET ultimo_acceso = ? WHERE clave = ?", (ahora, clave)
+            )
+            self._conexion.commit()
+        
+        return json.loads(fila[0])
+    
+    def guardar(self, clave: str, endpoint: Optional[str], datos: Dict[str, Any]):
+        """
+        Guarda una respuesta exitosa con el TTL de su endpoint
+        
+        Args:
+            clave: Clave de la petición (ver generar_clave)
+            endpoint: Nombre lógico del endpoint
+            datos: Datos JSON de la respuesta
+        """
+        ttl = self.ttls.get(endpoint)
+        if not ttl:
+            return
+        
+        ahora = self._reloj()
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO respuestas (clave, endpoint, datos, creado, expira, ultimo_acceso) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (clave, endpoint, json.dumps(datos, ensure_ascii=False), ahora, ahora + ttl, ahora)
+            )
+            self.escrituras += 1
+            self._escrituras_desde_limpieza += 1
+            
+            # Contar entradas en cada escritura sería caro: se revisa por lotes
+            if self._escrituras_desde_limpieza >= max(1, self.max_entradas // 100):
+                self._escrituras_desde_limpieza = 0
+                self._expulsar_exceso()
+            
+            self._conexion.commit()
+    
+    def es_no_encontrado(self, radicado: str) -> bool:
+        """
+        Indica si el radicado se registró como no encontrado y sigue vigente
+        
+        Args:
+            radicado: Número de radicación
+            
+        Returns:
+            True si se puede omitir la consulta
+        """
+        if self.modo == CacheConfig.Modo.REFRESCAR or not self.ttl_negativo:
+            return False
+        
+        if self._bloom is not None and radicado not in self._bloom:
+            return False
+        
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT 1 FROM no_encontrados WHERE radicado = ? AND expira > ?", (radicado, self._reloj())
+            ).fetchone()
+            if fila is not None:
+                self.no_encontrados_evitados += 1
+        
+        return fila is not None
+    
+    def registrar_no_encontrado(self, radicado: str):
+        """
+        Recuerda un radicado que la API no encontró durante ttl_negativo
+        
+        Args:
+            radicado: Número de radicación
+        """
+        if not self.ttl_negativo:
+            return
+        
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO no_encontrados (radicado, expira) VALUES (?, ?)",
+                (radicado, self._reloj() + self.ttl_negativo)
+            )
+            self._conexion.commit()
+            if self._bloom is not None:
+                self._bloom.agregar(radicado)
+    
+    def obtener_privado(self, radicado: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Busca un proceso privado vigente
+        
+        Args:
+            radicado: Número de radicación
+            
+        Returns:
+            Tupla (proceso_basico, debe_revalidarse) o None si no hay entrada vigente
+        """
+        if self.modo == CacheConfig.Modo.REFRESCAR or not self.ttl_privados:
+            return None
+        
+        ahora = self._reloj()
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT proceso_basico, creado FROM privados WHERE radicado = ? AND expira > ?",
+                (radicado, ahora)
+            ).fetchone()
+            if fila is None:
+                return None
+            self.privados_evitados += 1
+        
+        return json.loads(fila[0]), ahora - fila[1] > self.revalidar_privados_despues
+    
+    def guardar_privado(self, radicado: str, proceso_basico: Dict[str, Any]):
+        """
+        Guarda el registro básico de un proceso privado durante ttl_privados
+        
+        Args:
+            radicado: Número de radicación
+            proceso_basico: Datos de la consulta por radicación
+        """
+        if not self.ttl_privados:
+            return
+        
+        ahora = self._reloj()
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO privados (radicado, proceso_basico, creado, expira) VALUES (?, ?, ?, ?)",
+                (radicado, json.dumps(proceso_basico, ensure_ascii=False), ahora, ahora + self.ttl_privados)
+            )
+            self._conexion.commit()
+    
+    def invalidar_privado(self, radicado: str):
+        """Elimina la entrada de un proceso privado"""
+        with self._lock:
+            self._conexion.execute("DELETE FROM privados WHERE radicado = ?", (radicado,))
+            self._conexion.commit()
+    
+    def _expulsar_exceso(self):
+        """Elimina expiradas y, si sigue sobrando, las menos usadas (requiere el lock)"""
+        ahora = self._reloj()
+        cursor = self._conexion.execute("DELETE FROM respuestas WHERE expira <= ?", (ahora,))
+        self.expulsiones += cursor.rowcount
+        self._conexion.execute("DELETE FROM no_encontrados WHERE expira <= ?", (ahora,))
+        self._conexion.execute("DELETE FROM privados WHERE expira <= ?", (ahora,))
+        
+        total = self._conexion.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+        exceso = total - self.max_entradas
+        if exceso > 0:
+            cursor = self._conexion.execute(
+                "DELETE FROM respuestas WHERE clave IN "
+                "(SELECT clave FROM respuestas ORDER BY ultimo_acceso LIMIT ?)", (exceso,)
+            )
+            self.expulsiones += cursor.rowcount
+            logger.debug(f"Caché: {cursor.rowcount} entradas expulsadas por tamaño")
+    
+    def limpiar(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._conexion.execute("DELETE FROM respuestas")
+            self._conexion.execute("DELETE FROM no_encontrados")
+            self._conexion.execute("DELETE FROM privados")
+            self._conexion.commit()
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene contadores de uso de la caché
+        
+        Returns:
+            Diccionario con aciertos, fallos, escrituras y expulsiones
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'modo': self.modo,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / consultas * 100, 1) if consultas else 0.0,
+            'escrituras': self.escrituras,
+            'expulsiones': self.expulsiones,
+            'no_encontrados_evitados': self.no_encontrados_evitados,
+            'privados_evitados': self.privados_evitados
+        }
+    
+    def close(self):
+        """Cierra la conexión SQLite"""
+        with self._lock:
+            self._conexion.close()
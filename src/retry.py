@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Políticas de reintento para las peticiones a la API de la Rama Judicial
+
+Backoff exponencial con tope y full jitter, respetando Retry-After cuando
+el servidor lo envía.
+"""
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    """Política de reintentos para un endpoint"""
+    max_reintentos: int = 3
+    espera_base: float = 1.0  # segundos
+    espera_maxima: float = 30.0  # segundos
+    reintentar_429: bool = True
+    max_retry_after: float = 120.0  # Retry-After mayor a esto se recorta
+    
+    def debe_reintentar(self, response, intento: int) -> bool:
+        """
+        Decide si una respuesta fallida merece otro intento
+        
+        Args:
+            response: APIResponse del intento
+            intento: Número de reintentos ya realizados (0 = primer intento)
+            
+        Returns:
+            True si se debe reintentar
+        """
+        if response.success or not response.transitorio:
+            return False
+        
+        if response.status_code == 429 and not self.reintentar_429:
+            return False
+        
+        return intento < self.max_reintentos
+    
+    def calcular_espera(self, intento: int, retry_after: Optional[float] = None,
+                        aleatorio: Callable[[], float] = random.random) -> float:
+        """
+        Calcula la espera antes del siguiente intento
+        
+        Full jitter: un valor uniforme entre 0 y el backoff exponencial con
+        tope. Si el servidor indicó Retry-After se espera al menos eso.
+        
+        Args:
+            intento: Número de reintentos ya realizados (0 = primer intento)
+            retry_after: Segundos indicados por el servidor (opcional)
+            aleatorio: Generador uniforme en [0, 1)
+            
+        Returns:
+            Segundos a esperar
+        """
+        tope = min(self.espera_maxima, self.espera_base * (2 ** intento))
+        espera = aleatorio() * tope
+        
+        if retry_after is not None:
+            espera = max(espera, min(retry_after, self.max_retry_after))
+        
+        return espera
+
+
+def parsear_retry_after(valor: Optional[str], ahora: Callable[[], float] = time.time) -> Optional[float]:
+    """
+    Interpreta la cabecera Retry-After (segundos o fecha HTTP)
+    
+    Args:
+        valor: Valor de la cabecera
+        ahora: Función con el tiempo actual (epoch)
+        
+    Returns:
+        Segundos a esperar o None si no hay cabecera válida
+    """
+    if not valor:
+        return None
+    
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    
+    try:
+        fecha = parsedate_to_datetime(valor)
+        return max(0.0, fecha.timestamp() - ahora())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        logger.debug(f"Retry-After no reconocido: {valor}")
+        return None
+
+
+def crear_politicas_reintento() -> Dict[str, RetryPolicy]:
+    """
+    Construye las políticas por endpoint desde la configuración
+    
+    Los valores de APIConfig.RETRY_POLICIES sobrescriben los generales
+    (MAX_RETRIES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX) para cada endpoint.
+    
+    Returns:
+        Diccionario endpoint -> RetryPolicy
+    """
+    politicas = {}
+    
+    for endpoint in (APIConfig.Endpoint.RADICACION, APIConfig.Endpoint.DETALLE,
+                     APIConfig.Endpoint.ACTUACIONES):
+        opciones = {
+            'max_reintentos': APIConfig.MAX_RETRIES,
+            'espera_base': APIConfig.RETRY_BACKOFF_BASE,
+            'espera_maxima': APIConfig.RETRY_BACKOFF_MAX,
+        }
+        opciones.update(APIConfig.RETRY_POLICIES.get(endpoint, {}))
+        politicas[endpoint] = RetryPolicy(**opciones)
+    
+    return politicas
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal de ejecución para reanudar lotes interrumpidos
+
+Cada ejecución escribe un archivo JSONL de solo anexado con una línea por
+radicado terminado, en el momento en que termina. Si el lote se cae, se
+interrumpe con Ctrl-C o pierde la red, main.py --resume <run-id> lee el
+journal, consulta solo los radicados que faltan (o que fallaron) y vuelve a
+generar la salida completa sin gastar de nuevo el rate limit.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+try:
+    from config import FileConfig, JournalConfig, ProcessConfig
+    from data_processor import ProcesoInfo
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import FileConfig, JournalConfig, ProcessConfig
+    from data_processor import ProcesoInfo
+
+
+logger = logging.getLogger(__name__)
+
+_CAMPOS_PROCESO = {campo.name for campo in fields(ProcesoInfo)}
+
+# Un run-id es un nombre de archivo simple: sin separadores, '..' ni rutas absolutas
+_RUN_ID_VALIDO = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+class RunJournal:
+    """Registro JSONL de los radicados terminados en una ejecución"""
+    
+    def __init__(self, run_id: Optional[str] = None, directorio: Optional[Path] = None):
+        """
+        Args:
+            run_id: Identificador de la ejecución (default: uno nuevo con la
+                fecha y hora actuales)
+            directorio: Directorio de los journals (default: JournalConfig.DIRECTORIO)
+            
+        Raises:
+            ValueError: Si run_id no es un identificador simple (letras,
+                números, '_' y '-'), p. ej. una ruta
+        """
+        if run_id and not _RUN_ID_VALIDO.fullmatch(run_id):
+            raise ValueError(f"Run-id no válido: {run_id!r} (solo letras, números, '_' y '-')")
+        
+        self.directorio = directorio or JournalConfig.DIRECTORIO
+        self.run_id = run_id or datetime.now().strftime(FileConfig.OUTPUT_DATETIME_FORMAT)
+        self.ruta = self.directorio / f"{self.run_id}.jsonl"
+        self.cabecera: Optional[dict] = None
+        self.registrados = 0
+        self._archivo = None
+        self._lock = threading.Lock()
+    
+    def existe(self) -> bool:
+        """Indica si la ejecución ya tiene journal"""
+        return self.ruta.exists()
+    
+    def abrir(self, archivo_entrada: Path, total: int):
+        """
+        Abre el journal para anexar; si es nuevo escribe la cabecera
+        
+        Args:
+            archivo_entrada: Excel de radicados de la ejecución
+            total: Radicados de la entrada
+        """
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        nuevo = not self.ruta.exists()
+        incompleta = not nuevo and self._termina_sin_salto()
+        self._archivo = open(self.ruta, 'a', encoding='utf-8')
+        if incompleta:
+            # Línea cortada por una caída: se termina para no pegarle la siguiente
+            self._archivo.write('\n')
+        if nuevo:
+            self._escribir({
+                'tipo': 'inicio',
+                'run_id': self.run_id,
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'archivo_entrada': str(archivo_entrada),
+                'radicados': total,
+            })
+        logger.info(f"Journal de la ejecución {self.run_id}: {self.ruta}")
+    
+    def registrar(self, proceso: ProcesoInfo):
+        """
+        Anexa el resultado de un radicado (seguro entre hilos)
+        
+        Args:
+            proceso: Resultado procesado del radicado
+        """
+        self._escribir({'tipo': 'resultado', 'proceso': asdict(proceso)}, resultado=True)
+    
+    def cargar(self) -> Dict[str, ProcesoInfo]:
+        """
+        Lee los resultados registrados
+        
+        Una última línea incompleta (caída a mitad de escritura) se ignora.
+        Si un radicado aparece varias veces gana el último registro.
+        
+        Returns:
+            Diccionario radicado -> ProcesoInfo
+        """
+        resultados: Dict[str, ProcesoInfo] = {}
+        if not self.ruta.exists():
+            return resultados
+        
+        with open(self.ruta, encoding='utf-8') as archivo:
+            for numero, linea in enumerate(archivo, 1):
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    logger.warning(f"Línea {numero} del journal {self.ruta.name} incompleta, se ignora")
+                    continue
+                
+                if registro.get('tipo') == 'inicio':
+                    self.cabecera = registro
+                elif registro.get('tipo') == 'resultado':
+                    datos = {clave: valor for clave, valor in registro['proceso'].items()
+                             if clave in _CAMPOS_PROCESO}
+                    resultados[datos['radicado']] = ProcesoInfo(**datos)
+        
+        logger.info(f"Journal {self.run_id}: {len(resultados)} radicados registrados")
+        return resultados
+    
+    def fallidos(self) -> Set[str]:
+        """
+        Obtiene los radicados cuyo último resultado registrado es FAILED
+        
+        Recorre el journal sin cargar los resultados en memoria.
+        
+        Returns:
+            Conjunto de radicados fallidos
+        """
+        fallidos: Set[str] = set()
+        if not self.ruta.exists():
+            return fallidos
+        
+        with open(self.ruta, encoding='utf-8') as archivo:
+            for linea in archivo:
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    continue
+                if registro.get('tipo') != 'resultado':
+                    continue
+                proceso = registro['proceso']
+                if proceso.get('status') == ProcessConfig.Status.FAILED:
+                    fallidos.add(proceso['radicado'])
+                else:
+                    fallidos.discard(proceso['radicado'])
+        return fallidos
+    
+    def cerrar(self):
+        """Cierra el archivo del journal"""
+        with self._lock:
+            if self._archivo:
+                self._archivo.close()
+                self._archivo = None
+    
+    def _termina_sin_salto(self) -> bool:
+        with open(self.ruta, 'rb') as archivo:
+            archivo.seek(0, 2)
+            if archivo.tell() == 0:
+                return False
+            archivo.seek(-1, 2)
+            return archivo.read(1) != b'\n'
+    
+    def _escribir(self, registro: dict, resultado: bool = False):
+        linea = json.dumps(registro, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._archivo.write(linea)
+            # Cada línea llega al sistema operativo al escribirla: sobrevive a una caída del proceso
+            self._archivo.flush()
+            if resultado:
+                self.registrados += 1
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cerrar()
+
+
+def ultimo_journal(excluir: Optional[str] = None, directorio: Optional[Path] = None) -> Optional[RunJournal]:
+    """
+    Obtiene el journal de la ejecución más reciente
+    
+    Args:
+        excluir: Run-id a no tener en cuenta (p. ej. el de la ejecución en curso)
+        directorio: Directorio de los journals (default: JournalConfig.DIRECTORIO)
+        
+    Returns:
+        RunJournal de la última ejecución, o None si no hay ninguna
+    """
+    directorio = directorio or JournalConfig.DIRECTORIO
+    if not directorio.exists():
+        return None
+    
+    candidatos = [archivo for archivo in directorio.glob("*.jsonl") if archivo.stem != excluir]
+    if not candidatos:
+        return None
+    return RunJournal(max(candidatos, key=lambda archivo: archivo.stat().st_mtime).stem, directorio)
+
+
+def listar_ejecuciones(limite: int = 5, directorio: Optional[Path] = None) -> List[str]:
+    """
+    Lista los run-id con journal, de la ejecución más reciente a la más antigua
+    
+    Args:
+        limite: Máximo de run-id a devolver
+        directorio: Directorio de los journals (default: JournalConfig.DIRECTORIO)
+        
+    Returns:
+        Run-id disponibles para --resume
+    """
+    directorio = directorio or JournalConfig.DIRECTORIO
+    if not directorio.exists():
+        return []
+    
+    archivos = sorted(directorio.glob("*.jsonl"), key=lambda archivo: archivo.stat().st_mtime, reverse=True)
+    return [archivo.stem for archivo in archivos[:limite]]
+
+
+def limpiar_journals_antiguos(dias_antiguedad: Optional[int] = None, directorio: Optional[Path] = None) -> int:
+    """
+    Elimina journals más antiguos que el número de días especificado
+    
+    Args:
+        dias_antiguedad: Días de antigüedad (default: JournalConfig.DIAS_RETENCION)
+        directorio: Directorio de los journals (default: JournalConfig.DIRECTORIO)
+        
+    Returns:
+        Número de archivos eliminados
+    """
+    directorio = directorio or JournalConfig.DIRECTORIO
+    dias_antiguedad = JournalConfig.DIAS_RETENCION if dias_antiguedad is None else dias_antiguedad
+    if not directorio.exists():
+        return 0
+    
+    tiempo_limite = time.time() - dias_antiguedad * 24 * 60 * 60
+    eliminados = 0
+    for archivo in directorio.glob("*.jsonl"):
+        if archivo.stat().st_mtime < tiempo_limite:
+            archivo.unlink()
+            eliminados += 1
+            logger.debug(f"Journal antiguo eliminado: {archivo}")
+    return eliminados
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificador central del ritmo de las peticiones a la API
+
+Es el único punto donde se espera antes de enviar: combina el piso de
+cortesía (intervalo mínimo entre dos peticiones cualesquiera, compartido
+entre hilos) con el rate limiter, y cuenta cuánto tiempo se pasa esperando
+frente a cuánto consultando. En modo "presupuesto completo" el piso se
+omite y el rate limiter es el único límite.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from config import APIConfig
+    from rate_limiter import RateLimiter
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+    from rate_limiter import RateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestScheduler:
+    """Turnos de envío de todas las peticiones del cliente"""
+    
+    class Modo:
+        """Modos de ritmo"""
+        CORTESIA = "cortesia"  # Piso de cortesía y rate limit
+        PRESUPUESTO_COMPLETO = "presupuesto_completo"  # Solo el rate limit
+    
+    def __init__(self, limitador: Optional[RateLimiter] = None, intervalo_minimo: Optional[float] = None,
+                 modo: Optional[str] = None, reloj: Callable[[], float] = time.monotonic,
+                 dormir: Optional[Callable[[float], None]] = None):
+        """
+        Args:
+            limitador: Rate limiter de las peticiones (None = sin rate limit)
+            intervalo_minimo: Piso de cortesía en segundos
+                (default: APIConfig.MIN_REQUEST_INTERVAL)
+            modo: Modo de ritmo (default: APIConfig.SCHEDULER_MODE)
+            reloj: Función que devuelve el tiempo actual en segundos
+            dormir: Función usada para esperar (default: time.sleep)
+            
+        Raises:
+            ValueError: Si el modo no es válido
+        """
+        self.modo = modo or APIConfig.SCHEDULER_MODE
+        if self.modo not in (self.Modo.CORTESIA, self.Modo.PRESUPUESTO_COMPLETO):
+            raise ValueError(f"Modo de planificación desconocido: {self.modo}")
+        
+        self.limitador = limitador
+        self.intervalo_minimo = APIConfig.MIN_REQUEST_INTERVAL if intervalo_minimo is None else intervalo_minimo
+        if self.modo == self.Modo.PRESUPUESTO_COMPLETO:
+            if limitador is not None:
+                self.intervalo_minimo = 0.0
+            else:
+                logger.warning("Modo presupuesto completo sin rate limit: se mantiene el piso de cortesía")
+        
+        self._reloj = reloj
+        self._dormir = dormir
+        self._lock = threading.Lock()
+        self._siguiente_turno = 0.0
+        self.peticiones = 0
+        self.tiempo_consultando = 0.0
+        self.esperas: Dict[str, float] = {}
+    
+    def esperar_turno(self) -> float:
+        """
+        Bloquea el hilo hasta que pueda enviar la siguiente petición
+        
+        Returns:
+            Segundos esperados (piso de cortesía + rate limit)
+        """
+        esperado = 0.0
+        if self.intervalo_minimo > 0:
+            with self._lock:
+                ahora = self._reloj()
+                turno = max(ahora, self._siguiente_turno)
+                self._siguiente_turno = turno + self.intervalo_minimo
+            esperado += self.esperar(turno - ahora, 'cortesia')
+        
+        if self.limitador is not None:
+            espera = self.limitador.adquirir()
+            self._registrar_espera(espera, 'rate_limit')
+            esperado += espera
+        
+        return esperado
+    
+    def esperar(self, segundos: float, motivo: str) -> float:
+        """
+        Espera fuera de turno (p. ej. el backoff de un reintento) y la contabiliza
+        
+        Args:
+            segundos: Tiempo a esperar
+            motivo: Causa de la espera para las estadísticas
+            
+        Returns:
+            Segundos esperados
+        """
+        if segundos <= 0:
+            return 0.0
+        (self._dormir or time.sleep)(segundos)
+        self._registrar_espera(segundos, motivo)
+        return segundos
+    
+    def registrar_peticion(self, segundos: float):
+        """
+        Registra el tiempo que tardó una petición en la red
+        
+        Args:
+            segundos: Duración de la petición
+        """
+        with self._lock:
+            self.peticiones += 1
+            self.tiempo_consultando += segundos
+    
+    def _registrar_espera(self, segundos: float, motivo: str):
+        if segundos > 0:
+            with self._lock:
+                self.esperas[motivo] = self.esperas.get(motivo, 0.0) + segundos
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene el tiempo esperando frente al tiempo consultando
+        
+        Los tiempos son la suma de todos los hilos, así que con concurrencia
+        pueden superar la duración de la ejecución.
+        
+        Returns:
+            Diccionario con modo, peticiones, tiempos y espera por motivo
+        """
+        with self._lock:
+            esperando = sum(self.esperas.values())
+            total = esperando + self.tiempo_consultando
+            estadisticas = {
+                'modo': self.modo,
+                'piso_cortesia': f"{self.intervalo_minimo:.2f}s",
+                'peticiones': self.peticiones,
+                'tiempo_consultando': f"{self.tiempo_consultando:.1f}s",
+                'tiempo_esperando': f"{esperando:.1f}s",
+                'porcentaje_espera': f"{esperando / total * 100:.1f}%" if total else "0.0%",
+            }
+            for motivo, segundos in sorted(self.esperas.items()):
+                estadisticas[f'espera_{motivo}'] = f"{segundos:.1f}s"
+        return estadisticas
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coalescencia de llamadas duplicadas en vuelo (single-flight)
+
+Si varios hilos piden lo mismo a la vez, solo el primero ejecuta la
+llamada y los demás esperan y reciben su mismo resultado.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Vuelo:
+    """Llamada en curso y su resultado"""
+    __slots__ = ('listo', 'resultado', 'error')
+    
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Comparte una sola ejecución entre llamadas simultáneas con la misma clave"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vuelos: Dict[Hashable, _Vuelo] = {}
+        self.compartidas = 0
+    
+    def ejecutar(self, clave: Hashable, funcion: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Ejecuta la función o se une a una ejecución en curso con la misma clave
+        
+        Args:
+            clave: Identifica llamadas equivalentes
+            funcion: Llamada a ejecutar si no hay una en curso
+            
+        Returns:
+            Tupla (resultado, compartido); compartido es True si el resultado
+            viene de la ejecución de otro hilo
+            
+        Raises:
+            La misma excepción que lanzó la ejecución compartida
+        """
+        with self._lock:
+            vuelo = self._vuelos.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+            else:
+                self.compartidas += 1
+        
+        if not lider:
+            logger.debug(f"Llamada coalescida con una en vuelo: {clave}")
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado, True
+        
+        try:
+            vuelo.resultado = funcion()
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._vuelos[clave]
+            vuelo.listo.set()
+        
+        return vuelo.resultado, False
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estado persistente por radicado para la sincronización incremental
+
+Guarda el último resultado completo de cada proceso junto con su
+fechaUltimaActuacion, de modo que una ejecución posterior pueda
+reutilizarlo si la fecha no cambió. También guarda cuándo se actualizó y
+con qué frecuencia registra actuaciones, que usa el priorizador de
+radicados (src/priority.py).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    from config import StateConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import StateConfig
+
+
+logger = logging.getLogger(__name__)
+
+# Radicados por consulta IN (el límite de variables de SQLite es 999 en versiones antiguas)
+_LOTE_CONSULTA = 500
+
+
+class ProcessStateStore:
+    """Último resultado conocido de cada radicado, en SQLite"""
+    
+    def __init__(self, ruta: Optional[Path] = None, reloj: Callable[[], float] = time.time):
+        """
+        Args:
+            ruta: Archivo SQLite (default: StateConfig.RUTA)
+            reloj: Función que devuelve el tiempo actual (epoch)
+        """
+        self.ruta = Path(ruta or StateConfig.RUTA)
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS estados (
+                radicado TEXT PRIMARY KEY,
+                id_proceso INTEGER,
+                fecha_ultima_actuacion TEXT,
+                resultado TEXT NOT NULL,
+                ultimo_status TEXT,
+                actualizado_en REAL NOT NULL,
+                actuaciones_por_mes REAL
+            )
+        """)
+        columnas = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(estados)")}
+        if 'actuaciones_por_mes' not in columnas:
+            # Estado creado por una versión anterior: la frecuencia se completa al actualizar cada radicado
+            self._conexion.execute("ALTER TABLE estados ADD COLUMN actuaciones_por_mes REAL")
+        self._conexion.commit()
+        logger.info(f"Estado de procesos en {self.ruta}")
+    
+    def obtener(self, radicado: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene el último estado guardado de un radicado
+        
+        Args:
+            radicado: Número de radicación
+            
+        Returns:
+            Diccionario con id_proceso, fecha_ultima_actuacion, resultado,
+            ultimo_status y actualizado_en, o None si no hay estado
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT id_proceso, fecha_ultima_actuacion, resultado, ultimo_status, actualizado_en "
+                "FROM estados WHERE radicado = ?", (radicado,)
+            ).fetchone()
+        
+        if fila is None:
+            return None
+        
+        return {
+            'id_proceso': fila[0],
+            'fecha_ultima_actuacion': fila[1],
+            'resultado': json.loads(fila[2]),
+            'ultimo_status': fila[3],
+            'actualizado_en': fila[4]
+        }
+    
+    def guardar(self, radicado: str, resultado: Dict[str, Any]):
+        """
+        Guarda el resultado completo de una consulta
+        
+        Args:
+            radicado: Número de radicación
+            resultado: Diccionario devuelto por consultar_proceso_completo
+        """
+        proceso_basico = resultado.get('proceso_basico') or {}
+        ahora = self._reloj()
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO estados "
+                "(radicado, id_proceso, fecha_ultima_actuacion, resultado, ultimo_status, actualizado_en, "
+                "actuaciones_por_mes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (radicado, resultado.get('id_proceso'), proceso_basico.get('fechaUltimaActuacion'),
+                 json.dumps(resultado, ensure_ascii=False), resultado.get('status'), ahora,
+                 calcular_actuaciones_por_mes(resultado, ahora))
+            )
+            self._conexion.commit()
+    
+    def marcar_vigente(self, radicado: str):
+        """
+        Registra que una consulta confirmó el estado guardado (sin actuaciones nuevas)
+        
+        Args:
+            radicado: Número de radicación
+        """
+        with self._lock:
+            self._conexion.execute("UPDATE estados SET actualizado_en = ? WHERE radicado = ?",
+                                   (self._reloj(), radicado))
+            self._conexion.commit()
+    
+    def obtener_actividad(self, radicados: Iterable[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+        """
+        Obtiene cuándo se actualizó cada radicado y su frecuencia de actuaciones,
+        sin leer los resultados guardados
+        
+        Args:
+            radicados: Números de radicación
+            
+        Returns:
+            Diccionario radicado -> (actualizado_en, actuaciones_por_mes) de los
+            radicados con estado; la frecuencia es None si aún no se calculó
+        """
+        radicados = list(radicados)
+        actividad = {}
+        with self._lock:
+            for inicio in range(0, len(radicados), _LOTE_CONSULTA):
+                lote = radicados[inicio:inicio + _LOTE_CONSULTA]
+                filas = self._conexion.execute(
+                    "SELECT radicado, actualizado_en, actuaciones_por_mes FROM estados "
+                    f"WHERE radicado IN ({','.join('?' * len(lote))})", lote
+                )
+                for radicado, actualizado_en, por_mes in filas:
+                    actividad[radicado] = (actualizado_en, por_mes)
+        return actividad
+    
+    def eliminar(self, radicado: str):
+        """Elimina el estado de un radicado"""
+        with self._lock:
+            self._conexion.execute("DELETE FROM estados WHERE radicado = ?", (radicado,))
+            self._conexion.commit()
+    
+    def close(self):
+        """Cierra la conexión SQLite"""
+        with self._lock:
+            self._conexion.close()
+
+
+def calcular_actuaciones_por_mes(resultado: Dict[str, Any], ahora: float) -> Optional[float]:
+    """
+    Calcula la frecuencia histórica de actuaciones de un proceso
+    
+    Args:
+        resultado: Diccionario devuelto por consultar_proceso_completo
+        ahora: Tiempo actual (epoch)
+        
+    Returns:
+        Actuaciones por mes desde la más antigua hasta ahora (0.0 si no tiene
+        actuaciones), o None si el resultado no trae actuaciones
+    """
+    actuaciones = (resultado.get('actuaciones') or {}).get('actuaciones')
+    if actuaciones is None:
+        return None
+    
+    fechas = []
+    for actuacion in actuaciones:
+        try:
+            fechas.append(datetime.strptime((actuacion.get('fechaActuacion') or '')[:10], "%Y-%m-%d").timestamp())
+        except ValueError:
+            continue
+    if not fechas:
+        return 0.0
+    
+    # Al menos un mes, para que un proceso con una sola actuación reciente no parezca muy activo
+    meses = max((ahora - min(fechas)) / (30 * 24 * 60 * 60), 1.0)
+    return len(fechas) / meses
+
+
+class ProcessIndex:
+    """
+    Índice persistente radicado -> idProceso
+    
+    El idProceso de un radicado no cambia una vez asignado, así que con el
+    índice se puede ir directo a detalle y actuaciones sin la consulta por
+    radicación. Se guarda también el último proceso_basico conocido porque
+    el procesamiento lo necesita (sujetos procesales, departamento).
+    """
+    
+    def __init__(self, ruta: Optional[Path] = None, revalidar_despues: Optional[float] = None,
+                 reloj: Callable[[], float] = time.time):
+        """
+        Args:
+            ruta: Archivo SQLite (default: StateConfig.RUTA)
+            revalidar_despues: Segundos tras los cuales una entrada se vuelve a
+                verificar con la consulta por radicación
+                (default: StateConfig.INDICE_REVALIDAR_DIAS)
+            reloj: Función que devuelve el tiempo actual (epoch)
+        """
+        self.ruta = Path(ruta or StateConfig.RUTA)
+        self.revalidar_despues = (StateConfig.INDICE_REVALIDAR_DIAS * 86400
+                                  if revalidar_despues is None else revalidar_despues)
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        
+        self.aciertos = 0
+        self.vencidas = 0
+        self.invalidadas = 0
+        
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS indice_procesos (
+                radicado TEXT PRIMARY KEY,
+                id_proceso INTEGER NOT NULL,
+                proceso_basico TEXT NOT NULL,
+                verificado_en REAL NOT NULL
+            )
+        """)
+        self._conexion.commit()
+        
+        # Copia en memoria para no tocar disco en cada búsqueda
+        self._memoria: Dict[str, Dict[str, Any]] = {}
+        for radicado, id_proceso, proceso_basico, verificado_en in self._conexion.execute(
+                "SELECT radicado, id_proceso, proceso_basico, verificado_en FROM indice_procesos"):
+            self._memoria[radicado] = {
+                'id_proceso': id_proceso,
+                'proceso_basico': json.loads(proceso_basico),
+                'verificado_en': verificado_en
+            }
+        logger.info(f"Índice de procesos cargado: {len(self._memoria)} radicados")
+    
+    def buscar(self, radicado: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca un radicado con entrada vigente
+        
+        Args:
+            radicado: Número de radicación
+            
+        Returns:
+            Diccionario con id_proceso y proceso_basico, o None si no está o
+            debe revalidarse
+        """
+        with self._lock:
+            entrada = self._memoria.get(radicado)
+            if entrada is None:
+                return None
+            
+            if self._reloj() - entrada['verificado_en'] > self.revalidar_despues:
+                self.vencidas += 1
+                return None
+            
+            self.aciertos += 1
+            return {'id_proceso': entrada['id_proceso'], 'proceso_basico': dict(entrada['proceso_basico'])}
+    
+    def guardar(self, radicado: str, id_proceso: int, proceso_basico: Dict[str, Any]):
+        """
+        Registra (o revalida) el idProceso de un radicado
+        
+        Args:
+            radicado: Número de radicación
+            id_proceso: ID del proceso
+            proceso_basico: Datos de la consulta por radicación
+        """
+        ahora = self._reloj()
+        with self._lock:
+            self._memoria[radicado] = {
+                'id_proceso': id_proceso,
+                'proceso_basico': dict(proceso_basico),
+                'verificado_en': ahora
+            }
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO indice_procesos (radicado, id_proceso, proceso_basico, verificado_en) "
+                "VALUES (?, ?, ?, ?)",
+                (radicado, id_proceso, json.dumps(proceso_basico, ensure_ascii=False), ahora)
+            )
+            self._conexion.commit()
+    
+    def invalidar(self, radicado: str):
+        """
+        Elimina la entrada de un radicado (p. ej. cuando su idProceso da 404)
+        
+        Args:
+            radicado: Número de radicación
+        """
+        with self._lock:
+            if self._memoria.pop(radicado, None) is not None:
+                self.invalidadas += 1
+            self._conexion.execute("DELETE FROM indice_procesos WHERE radicado = ?", (radicado,))
+            self._conexion.commit()
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """
+        Obtiene contadores de uso del índice
+        
+        Returns:
+            Diccionario con tamaño, aciertos, vencidas e invalidadas
+        """
+        return {
+            'radicados_indexados': len(self._memoria),
+            'aciertos': self.aciertos,
+            'vencidas': self.vencidas,
+            'invalidadas': self.invalidadas
+        }
+    
+    def close(self):
+        """Cierra la conexión SQLite"""
+        with self._lock:
+            self._conexion.close()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transporte HTTP del cliente de la Rama Judicial
+
+Abrir conexión TCP + TLS con el puerto 448 del portal es una parte
+apreciable de cada petición, así que el transporte mantiene un pool de
+conexiones persistentes compartido entre hilos, con keep-alive TCP, y
+puede abrirlas por adelantado antes de empezar el lote.
+
+requests.Session no es seguro entre hilos: RequestsTransport crea una
+sesión por hilo, todas montadas sobre el mismo adaptador (el pool de
+urllib3 sí lo es). Con APIConfig.HTTP2 se usa httpx, cuyo cliente es
+seguro entre hilos y multiplexa las peticiones sobre HTTP/2.
+"""
+
+import logging
+import socket
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from config import APIConfig
+except ModuleNotFoundError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from config import APIConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+def _opciones_socket() -> List[tuple]:
+    """Opciones de socket con keep-alive TCP para detectar conexiones muertas del pool"""
+    opciones = list(HTTPConnection.default_socket_options)
+    if not APIConfig.HTTP_TCP_KEEPALIVE:
+        return opciones
+    
+    opciones.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        opciones += [
+            (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4),
+        ]
+    return opciones
+
+
+class _AdaptadorKeepAlive(HTTPAdapter):
+    """HTTPAdapter cuyas conexiones activan keep-alive TCP"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = _opciones_socket()
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _Transporte(ABC):
+    """Operaciones comunes de los transportes"""
+    
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Envía una petición con la interfaz de requests.Session.request
+        
+        Args:
+            method: Método HTTP
+            url: URL de la petición
+            **kwargs: Opciones de requests (timeout, params, headers...)
+            
+        Returns:
+            Respuesta de requests
+        """
+    
+    def precalentar(self, url: str, conexiones: int) -> int:
+        """
+        Abre conexiones al servidor antes de empezar el lote
+        
+        Hace peticiones HEAD simultáneas para que el handshake TCP + TLS
+        ocurra ahora y las conexiones queden en el pool. Los errores solo se
+        registran: el lote abrirá las conexiones al usarlas.
+        
+        Args:
+            url: URL del servidor
+            conexiones: Número de conexiones a abrir
+            
+        Returns:
+            Conexiones abiertas con éxito
+        """
+        if conexiones < 1:
+            return 0
+        
+        def abrir(_) -> bool:
+            try:
+                self.request('HEAD', url, timeout=(APIConfig.CONNECT_TIMEOUT, APIConfig.CONNECT_TIMEOUT),
+                             allow_redirects=False)
+                return True
+            except requests.exceptions.RequestException as e:
+                logger.debug(f"No se pudo precalentar la conexión a {url}: {e}")
+                return False
+        
+        with ThreadPoolExecutor(max_workers=conexiones, thread_name_prefix="precalentar") as pool:
+            abiertas = sum(pool.map(abrir, range(conexiones)))
+        
+        logger.info(f"Conexiones precalentadas: {abiertas}/{conexiones}")
+        return abiertas
+
+
+class RequestsTransport(_Transporte):
+    """Una sesión requests por hilo sobre un pool de conexiones compartido"""
+    
+    def __init__(self, tamano_pool: Optional[int] = None, headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            tamano_pool: Conexiones persistentes por host
+                (default: APIConfig.HTTP_POOL_SIZE)
+            headers: Headers de todas las peticiones (default: APIConfig.HEADERS)
+        """
+        self.tamano_pool = tamano_pool or APIConfig.HTTP_POOL_SIZE
+        self.headers = dict(APIConfig.HEADERS if headers is None else headers)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sesiones: List[requests.Session] = []
+        self._adaptador = self._crear_adaptador()
+    
+    def _crear_adaptador(self) -> HTTPAdapter:
+        return _AdaptadorKeepAlive(pool_connections=self.tamano_pool, pool_maxsize=self.tamano_pool)
+    
+    def _sesion(self) -> requests.Session:
+        """Sesión del hilo actual (se crea al primer uso)"""
+        sesion = getattr(self._local, 'sesion', None)
+        if sesion is None:
+            sesion = requests.Session()
+            sesion.headers.update(self.headers)
+            with self._lock:
+                sesion.mount('https://', self._adaptador)
+                sesion.mount('http://', self._adaptador)
+                self._sesiones.append(sesion)
+            self._local.sesion = sesion
+        return sesion
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Envía una petición con la sesión del hilo actual"""
+        return self._sesion().request(method=method, url=url, **kwargs)
+    
+    def ajustar_pool(self, tamano_pool: int):
+        """
+        Cambia el número de conexiones persistentes por host
+        
+        Args:
+            tamano_pool: Conexiones por host
+        """
+        with self._lock:
+            anterior = self._adaptador
+            self.tamano_pool = tamano_pool
+            self._adaptador = self._crear_adaptador()
+            for sesion in self._sesiones:
+                sesion.mount('https://', self._adaptador)
+                sesion.mount('http://', self._adaptador)
+        anterior.close()
+    
+    def close(self):
+        """Cierra las sesiones y sus conexiones"""
+        with self._lock:
+            for sesion in self._sesiones:
+                sesion.close()
+            self._sesiones.clear()
+            self._adaptador.close()
+        self._local = threading.local()
+
+
+class HttpxTransport(_Transporte):
+    """Cliente httpx compartido, con HTTP/2 si está disponible"""
+    
+    def __init__(self, tamano_pool: Optional[int] = None, headers: Optional[Dict[str, str]] = None,
+                 http2: bool = True):
+        """
+        Args:
+            tamano_pool: Conexiones persistentes por host
+                (default: APIConfig.HTTP_POOL_SIZE)
+            headers: Headers de todas las peticiones (default: APIConfig.HEADERS)
+            http2: Si negociar HTTP/2 (requiere el paquete h2)
+            
+        Raises:
+            ImportError: Si httpx (o h2 con http2=True) no está instalado
+        """
+        if httpx is None:
+            raise ImportError("httpx no está instalado (pip install httpx[http2])")
+        
+        self.tamano_pool = tamano_pool or APIConfig.HTTP_POOL_SIZE
+        self.headers = dict(APIConfig.HEADERS if headers is None else headers)
+        self.http2 = http2
+        self._cliente = self._crear_cliente()
+    
+    def _crear_cliente(self):
+        limites = httpx.Limits(max_connections=self.tamano_pool, max_keepalive_connections=self.tamano_pool)
+        return httpx.Client(http2=self.http2, limits=limites, headers=self.headers)
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Envía una petición con la interfaz de requests
+        
+        El timeout (conexión, lectura) se traduce a httpx y las excepciones
+        de httpx a las de requests, que son las que maneja el cliente.
+        """
+        timeout = kwargs.pop('timeout', httpx.USE_CLIENT_DEFAULT)
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        kwargs['follow_redirects'] = kwargs.pop('allow_redirects', True)
+        
+        try:
+            respuesta = self._cliente.request(method, url, timeout=timeout, **kwargs)
+        except httpx.ReadTimeout as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+        
+        return self._a_respuesta_requests(respuesta)
+    
+    @staticmethod
+    def _a_respuesta_requests(respuesta) -> requests.Response:
+        """Convierte una respuesta de httpx en requests.Response"""
+        convertida = requests.Response()
+        convertida.status_code = respuesta.status_code
+        convertida.headers = CaseInsensitiveDict(respuesta.headers)
+        convertida._content = respuesta.content
+        convertida.encoding = respuesta.encoding
+        convertida.reason = respuesta.reason_phrase
+        convertida.url = str(respuesta.url)
+        return convertida
+    
+    def ajustar_pool(self, tamano_pool: int):
+        """
+        Cambia el número de conexiones persistentes por host
+        
+        Args:
+            tamano_pool: Conexiones por host
+        """
+        anterior = self._cliente
+        self.tamano_pool = tamano_pool
+        self._cliente = self._crear_cliente()
+        anterior.close()
+    
+    def close(self):
+        """Cierra el cliente y sus conexiones"""
+        self._cliente.close()
+
+
+def crear_transporte(tamano_pool: Optional[int] = None) -> _Transporte:
+    """
+    Crea el transporte según la configuración
+    
+    Args:
+        tamano_pool: Conexiones persistentes por host
+            (default: APIConfig.HTTP_POOL_SIZE)
+            
+    Returns:
+        HttpxTransport si APIConfig.HTTP2 y httpx está instalado, si no
+        RequestsTransport
+    """
+    if APIConfig.HTTP2:
+        try:
+            transporte = HttpxTransport(tamano_pool)
+            logger.info("Transporte HTTP/2 (httpx)")
+            return transporte
+        except ImportError as e:
+            logger.warning(f"HTTP/2 no disponible ({e}); se usa requests con HTTP/1.1")
+    
+    return RequestsTransport(tamano_pool)
@@ -6,15 +6,668 @@ Tests para el módulo api_client
 
 import pytest
 import sys
+import asyncio
+import threading
+import time
 from pathlib import Path
 
+import requests
+
 # Agregar src al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-# TODO: Completar tests para api_client
+import api_client
+from api_client import (APIResponse, AsyncRamaJudicialClient, CircuitoAbiertoError, RamaJudicialClient,
+                        RateLimitedClient, detener_antes_de, detener_en_conocidas)
+from latency import LatencyTracker
+from rate_limiter import TokenBucketLimiter
+from state_store import ProcessIndex, ProcessStateStore
+from retry import RetryPolicy
+
+
+class ClienteLento(RamaJudicialClient):
+    """Cliente que simula latencia de red sin hacer peticiones reales"""
+    
+    def __init__(self, latencia: float = 0.05):
+        super().__init__()
+        self.latencia = latencia
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+        self._lock = threading.Lock()
+    
+    def consultar_proceso_completo(self, numero_radicacion, paralelo=None):
+        with self._lock:
+            self.en_vuelo += 1
+            self.max_en_vuelo = max(self.max_en_vuelo, self.en_vuelo)
+        time.sleep(self.latencia)
+        with self._lock:
+            self.en_vuelo -= 1
+        if numero_radicacion.endswith("0"):
+            return None
+        return {'radicado': numero_radicacion}
+
+
+def test_consultar_lote_respeta_concurrencia_y_entrega_todo():
+    """El lote entrega todos los resultados sin superar la concurrencia"""
+    cliente = ClienteLento()
+    radicados = [f"1100131030012024{i:05d}" for i in range(12)]
+    
+    async def consultar():
+        with AsyncRamaJudicialClient(max_concurrencia=3, cliente=cliente) as async_client:
+            return [r async for r in async_client.consultar_lote(radicados)]
+    
+    resultados = asyncio.run(consultar())
+    
+    assert sorted(indice for indice, _, _ in resultados) == list(range(12))
+    assert cliente.max_en_vuelo <= 3
+    fallidos = [radicado for _, radicado, datos in resultados if datos is None]
+    assert fallidos == [r for r in radicados if r.endswith("0")]
+
+
+def test_consultar_lote_solapa_peticiones():
+    """Las consultas concurrentes tardan menos que la suma de latencias"""
+    cliente = ClienteLento(latencia=0.1)
+    radicados = [f"1100131030012024{i:05d}" for i in range(1, 9)]
+    
+    async def consultar():
+        async with AsyncRamaJudicialClient(max_concurrencia=4, cliente=cliente) as async_client:
+            return [r async for r in async_client.consultar_lote(radicados)]
+    
+    inicio = time.monotonic()
+    asyncio.run(consultar())
+    assert time.monotonic() - inicio < 0.8 * 0.1 * len(radicados)
+
+
+def test_max_concurrencia_invalida():
+    """La concurrencia debe ser positiva"""
+    with pytest.raises(ValueError):
+        AsyncRamaJudicialClient(max_concurrencia=0, cliente=ClienteLento())
+
+
+class ClienteSimulado(RamaJudicialClient):
+    """Cliente con endpoints simulados para probar consultar_proceso_completo"""
+    
+    def __init__(self, latencia: float = 0.1, **kwargs):
+        super().__init__(**kwargs)
+        self.latencia = latencia
+        self.llamadas = []
+        self.fecha_ultima_actuacion = "2024-01-31T00:00:00"
+    
+    def consultar_por_radicacion(self, numero_radicacion):
+        self.llamadas.append('radicacion')
+        return APIResponse(success=True, data={'idProceso': 123, 'esPrivado': False,
+                                               'fechaUltimaActuacion': self.fecha_ultima_actuacion})
+    
+    def obtener_detalle_proceso(self, id_proceso):
+        self.llamadas.append('detalle')
+        time.sleep(self.latencia)
+        return APIResponse(success=True, data={'despacho': 'JUZGADO 001'})
+    
+    def obtener_actuaciones_proceso(self, id_proceso, pagina=1):
+        self.llamadas.append('actuaciones')
+        time.sleep(self.latencia)
+        return APIResponse(success=True, data={'actuaciones': []})
+
+
+def test_consulta_completa_paralela_solapa_detalle_y_actuaciones():
+    """En modo paralelo detalle y actuaciones se piden a la vez"""
+    with ClienteSimulado(latencia=0.2, detalle_paralelo=True) as cliente:
+        inicio = time.monotonic()
+        resultado = cliente.consultar_proceso_completo("11001310300120240000100")
+        duracion = time.monotonic() - inicio
+    
+    assert resultado['status'] == 'SUCCESS'
+    assert resultado['detalle'] == {'despacho': 'JUZGADO 001'}
+    assert resultado['actuaciones'] == {'actuaciones': []}
+    assert sorted(cliente.llamadas) == ['actuaciones', 'detalle', 'radicacion']
+    assert duracion < 0.35
+
+
+def test_consulta_completa_secuencial_por_defecto():
+    """Sin la opción se conserva el flujo secuencial"""
+    cliente = ClienteSimulado(latencia=0)
+    assert cliente.detalle_paralelo is False
+    
+    cliente.consultar_proceso_completo("11001310300120240000100", paralelo=False)
+    assert cliente.llamadas == ['radicacion', 'detalle', 'actuaciones']
+
+
+def crear_respuesta(status_code: int, contenido: bytes = b'{}', headers: dict = None) -> requests.Response:
+    """Construye una respuesta HTTP sin red"""
+    respuesta = requests.Response()
+    respuesta.status_code = status_code
+    respuesta._content = contenido
+    respuesta.headers.update(headers or {})
+    return respuesta
+
+
+class SesionFalsa:
+    """Sesión que devuelve respuestas (o lanza excepciones) en orden"""
+    
+    def __init__(self, respuestas):
+        self.respuestas = list(respuestas)
+        self.peticiones = 0
+    
+    def request(self, method, url, **kwargs):
+        self.peticiones += 1
+        respuesta = self.respuestas.pop(0)
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+    
+    def close(self):
+        pass
+
+
+def test_reintenta_fallos_transitorios_con_retry_after(monkeypatch):
+    """Un 503 con Retry-After y un timeout se reintentan hasta obtener respuesta"""
+    esperas = []
+    monkeypatch.setattr(api_client.time, 'sleep', esperas.append)
+    
+    cliente = RamaJudicialClient(politicas_reintento={'detalle': RetryPolicy(max_reintentos=3)})
+    cliente.session = SesionFalsa([
+        crear_respuesta(503, headers={'Retry-After': '7'}),
+        requests.exceptions.Timeout(),
+        crear_respuesta(200, b'{"despacho": "JUZGADO"}'),
+    ])
+    
+    response = cliente.obtener_detalle_proceso(1)
+    
+    assert response.success
+    assert response.data == {'despacho': 'JUZGADO'}
+    assert response.intentos == 3
+    assert esperas[0] >= 7
+    assert cliente.obtener_estadisticas()['reintentos'] == {
+        'reintentos_realizados': 2, 'peticiones_recuperadas': 1
+    }
+
+
+def test_no_reintenta_404_ni_agota_mas_de_lo_permitido(monkeypatch):
+    """Los 404 fallan de inmediato y los 500 se rinden al agotar la política"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    politica = RetryPolicy(max_reintentos=2)
+    
+    cliente = RamaJudicialClient(politicas_reintento={'detalle': politica})
+    cliente.session = SesionFalsa([crear_respuesta(404)])
+    assert cliente.obtener_detalle_proceso(1).status_code == 404
+    assert cliente.session.peticiones == 1
+    
+    cliente.session = SesionFalsa([crear_respuesta(500)] * 3)
+    response = cliente.obtener_detalle_proceso(1)
+    assert not response.success and response.transitorio
+    assert cliente.session.peticiones == 3
+
+
+def test_cada_reintento_cuenta_para_el_rate_limit(monkeypatch):
+    """Los reintentos pasan por el limitador igual que el primer intento"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    limitador = TokenBucketLimiter(6000, burst=10)
+    
+    cliente = RateLimitedClient(limiter=limitador,
+                                politicas_reintento={'detalle': RetryPolicy(max_reintentos=2)})
+    cliente.session = SesionFalsa([crear_respuesta(429), crear_respuesta(429), crear_respuesta(200)])
+    
+    assert cliente.obtener_detalle_proceso(1).success
+    assert limitador._tokens == pytest.approx(7, abs=0.1)
+
+
+class ClientePaginado(RamaJudicialClient):
+    """Cliente con un proceso de 5 páginas de 3 actuaciones cada una"""
+    
+    def __init__(self, paginas=5, por_pagina=3, con_paginacion=True, **kwargs):
+        super().__init__(**kwargs)
+        self.paginas = paginas
+        self.por_pagina = por_pagina
+        self.con_paginacion = con_paginacion
+        self.paginas_pedidas = []
+        self._lock_paginas = threading.Lock()
+    
+    def obtener_actuaciones_proceso(self, id_proceso, pagina=1):
+        with self._lock_paginas:
+            self.paginas_pedidas.append(pagina)
+        if pagina > self.paginas:
+            return APIResponse(success=True, data={'actuaciones': []})
+        
+        inicio = (pagina - 1) * self.por_pagina
+        actuaciones = [
+            {'idRegActuacion': n, 'fechaActuacion': f"2024-01-{31 - n:02d}T00:00:00"}
+            for n in range(inicio, inicio + self.por_pagina)
+        ]
+        data = {'actuaciones': actuaciones}
+        if self.con_paginacion:
+            data['paginacion'] = {'cantidadPaginas': self.paginas, 'pagina': pagina}
+        return APIResponse(success=True, data=data)
+
+
+def test_iterar_actuaciones_recorre_todas_las_paginas():
+    """El generador entrega las actuaciones de todas las páginas en orden"""
+    cliente = ClientePaginado()
+    ids = [a['idRegActuacion'] for a in cliente.iterar_actuaciones(1, prefetch=2)]
+    
+    assert ids == list(range(15))
+    assert sorted(cliente.paginas_pedidas) == [1, 2, 3, 4, 5]
+
+
+def test_iterar_actuaciones_sin_paginacion_termina_en_pagina_vacia():
+    """Sin total de páginas se avanza hasta encontrar una página vacía"""
+    cliente = ClientePaginado(paginas=2, con_paginacion=False)
+    assert len(list(cliente.iterar_actuaciones(1, prefetch=3))) == 6
+    assert cliente.paginas_pedidas == [1, 2, 3]
+
+
+def test_iterar_actuaciones_es_perezoso_con_condicion_de_parada():
+    """La condición de parada evita pedir las páginas siguientes"""
+    cliente = ClientePaginado()
+    ids = [a['idRegActuacion'] for a in cliente.iterar_actuaciones(
+        1, detener_si=detener_en_conocidas([4, 5]), prefetch=0)]
+    
+    assert ids == [0, 1, 2, 3]
+    assert cliente.paginas_pedidas == [1, 2]
+    
+    cliente = ClientePaginado()
+    fechas = [a['fechaActuacion'][:10] for a in cliente.iterar_actuaciones(
+        1, detener_si=detener_antes_de("2024-01-30"), prefetch=0)]
+    assert fechas == ["2024-01-31", "2024-01-30"]
+    assert cliente.paginas_pedidas == [1]
+
+
+def test_consulta_completa_con_todas_las_actuaciones():
+    """La consulta completa puede unir todas las páginas en una respuesta"""
+    cliente = ClientePaginado(paginas=3, todas_las_actuaciones=True)
+    response = cliente._obtener_actuaciones(1)
+    
+    assert response.success
+    assert len(response.data['actuaciones']) == 9
+    assert response.data['paginacion']['cantidadPaginas'] == 3
+
+
+class ClientePaginadoCompleto(ClientePaginado):
+    """Cliente paginado con radicación y detalle simulados y algo de latencia por página"""
+    
+    def consultar_por_radicacion(self, numero_radicacion):
+        return APIResponse(success=True, data={'idProceso': 123, 'esPrivado': False})
+    
+    def obtener_detalle_proceso(self, id_proceso):
+        return APIResponse(success=True, data={'despacho': 'JUZGADO 001'})
+    
+    def obtener_actuaciones_proceso(self, id_proceso, pagina=1):
+        time.sleep(0.01)
+        return super().obtener_actuaciones_proceso(id_proceso, pagina)
+
+
+def test_detalle_paralelo_con_todas_las_actuaciones_no_se_bloquea():
+    """Con más radicados en vuelo que hilos del pool, las páginas por adelantado no bloquean la consulta"""
+    cliente = ClientePaginadoCompleto(paginas=6, por_pagina=10, detalle_paralelo=True, todas_las_actuaciones=True)
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(cliente.consultar_proceso_completo("1")), daemon=True)
+             for _ in range(api_client.APIConfig.MAX_CONCURRENT_REQUESTS * 2)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(timeout=10)
+    
+    assert not any(hilo.is_alive() for hilo in hilos)
+    assert all(len(resultado['actuaciones']['actuaciones']) == 60 for resultado in resultados)
+    cliente.close()
+
+
+class ClienteConHistorial(ClientePaginadoCompleto):
+    """Proceso cuyas actuaciones (de la más reciente a la más antigua) cambian entre consultas"""
+    
+    def __init__(self, historial, **kwargs):
+        super().__init__(**kwargs)
+        self.historial = historial
+    
+    def consultar_por_radicacion(self, numero_radicacion):
+        return APIResponse(success=True, data={'idProceso': 123, 'esPrivado': False,
+                                               'fechaUltimaActuacion': self.historial[0]['fechaActuacion']})
+    
+    def obtener_actuaciones_proceso(self, id_proceso, pagina=1):
+        with self._lock_paginas:
+            self.paginas_pedidas.append(pagina)
+        inicio = (pagina - 1) * self.por_pagina
+        paginas = -(-len(self.historial) // self.por_pagina)
+        return APIResponse(success=True, data={
+            'actuaciones': self.historial[inicio:inicio + self.por_pagina],
+            'paginacion': {'cantidadPaginas': paginas, 'pagina': pagina}
+        })
+
+
+def test_todas_las_actuaciones_se_detiene_en_las_guardadas(tmp_path):
+    """Con estado guardado solo se piden las páginas con actuaciones nuevas"""
+    historial = [{'idRegActuacion': n, 'fechaActuacion': f"2024-01-{31 - n:02d}T00:00:00"} for n in range(15)]
+    cliente = ClienteConHistorial(historial, estado=ProcessStateStore(tmp_path / "estado.sqlite3"),
+                                  todas_las_actuaciones=True)
+    cliente.consultar_proceso_completo("1")
+    assert sorted(cliente.paginas_pedidas) == [1, 2, 3, 4, 5]
+    
+    cliente.paginas_pedidas.clear()
+    cliente.historial = [{'idRegActuacion': n, 'fechaActuacion': "2024-02-0{n}T00:00:00".format(n=n - 99)}
+                         for n in (104, 103, 102, 101)] + historial
+    resultado = cliente.consultar_proceso_completo("1")
+    
+    assert sorted(cliente.paginas_pedidas) == [1, 2]
+    assert resultado['actuaciones']['actuaciones'] == cliente.historial
+    assert resultado['actuaciones_completas']
+    cliente.close()
+
+
+def test_consulta_incremental_reutiliza_estado_sin_cambios(tmp_path, monkeypatch):
+    """Si fechaUltimaActuacion no cambió solo se consulta la radicación"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    radicado = "11001310300120240000100"
+    estado = ProcessStateStore(tmp_path / "estado.sqlite3")
+    cliente = ClienteSimulado(latencia=0, estado=estado)
+    
+    primero = cliente.consultar_proceso_completo(radicado)
+    cliente.llamadas.clear()
+    segundo = cliente.consultar_proceso_completo(radicado)
+    
+    assert cliente.llamadas == ['radicacion']
+    assert segundo['sin_cambios']
+    assert segundo['detalle'] == primero['detalle']
+    assert segundo['actuaciones'] == primero['actuaciones']
+    
+    cliente.llamadas.clear()
+    cliente.fecha_ultima_actuacion = "2024-02-15T00:00:00"
+    tercero = cliente.consultar_proceso_completo(radicado)
+    
+    assert cliente.llamadas == ['radicacion', 'detalle', 'actuaciones']
+    assert 'sin_cambios' not in tercero
+    assert cliente.obtener_estadisticas()['sincronizacion'] == {
+        'procesos_sin_cambios': 1, 'procesos_actualizados': 2
+    }
+
+
+def test_indice_salta_radicacion_y_revalida_con_404(tmp_path, monkeypatch):
+    """Con idProceso indexado se va directo a detalle; un 404 fuerza la consulta por radicación"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    radicado = "11001310300120240000100"
+    indice = ProcessIndex(tmp_path / "estado.sqlite3")
+    cliente = ClienteSimulado(latencia=0, indice=indice)
+    
+    cliente.consultar_proceso_completo(radicado)
+    cliente.llamadas.clear()
+    resultado = cliente.consultar_proceso_completo(radicado)
+    
+    assert cliente.llamadas == ['detalle', 'actuaciones']
+    assert resultado['id_proceso'] == 123
+    assert resultado['proceso_basico']['idProceso'] == 123
+    
+    indice.guardar(radicado, 999, {'idProceso': 999, 'esPrivado': False})
+    detalle_original = cliente.obtener_detalle_proceso
+    
+    def detalle_con_404(id_proceso):
+        if id_proceso == 999:
+            cliente.llamadas.append('detalle')
+            return APIResponse(success=False, status_code=404, error="Recurso no encontrado")
+        return detalle_original(id_proceso)
+    
+    cliente.obtener_detalle_proceso = detalle_con_404
+    cliente.llamadas.clear()
+    resultado = cliente.consultar_proceso_completo(radicado)
+    
+    assert cliente.llamadas == ['detalle', 'radicacion', 'detalle', 'actuaciones']
+    assert resultado['id_proceso'] == 123
+    assert indice.buscar(radicado)['id_proceso'] == 123
+    assert cliente.obtener_estadisticas()['indice_procesos']['invalidadas'] == 1
+
+
+class SesionLenta:
+    """Sesión que tarda en responder y cuenta las peticiones"""
+    
+    def __init__(self, latencia: float = 0.1):
+        self.latencia = latencia
+        self.peticiones = 0
+        self._lock = threading.Lock()
+    
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.peticiones += 1
+        time.sleep(self.latencia)
+        return crear_respuesta(200, b'{"despacho": "JUZGADO"}')
+    
+    def close(self):
+        pass
+
+
+def test_peticiones_identicas_simultaneas_se_coalescen():
+    """Dos radicados con el mismo idProceso comparten la petición de detalle en vuelo"""
+    cliente = RamaJudicialClient()
+    cliente.session = SesionLenta()
+    respuestas = []
+    
+    hilos = [threading.Thread(target=lambda: respuestas.append(cliente.obtener_detalle_proceso(7)))
+             for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert cliente.session.peticiones == 1
+    assert all(r.success and r.data == {'despacho': 'JUZGADO'} for r in respuestas)
+    assert cliente.obtener_estadisticas()['coalescencia']['peticiones_compartidas'] == 2
+
+
+def test_consultar_lote_coalesce_radicados_repetidos():
+    """Un radicado repetido en el lote se consulta una sola vez"""
+    radicados = ["11001310300120240000100", "11001310300120240000100", "11001310300120240000200"]
+    
+    async def consultar(cliente):
+        return [resultado async for resultado in cliente.consultar_lote(radicados)]
+    
+    lento = ClienteLento(latencia=0.1)
+    with AsyncRamaJudicialClient(max_concurrencia=3, cliente=lento) as cliente:
+        resultados = asyncio.run(consultar(cliente))
+        estadisticas = cliente.obtener_estadisticas()
+    
+    assert sorted(indice for indice, _, _ in resultados) == [0, 1, 2]
+    assert lento.max_en_vuelo == 2
+    assert estadisticas['coalescencia']['consultas_compartidas'] == 1
+
+
+class ClienteConCaida(RamaJudicialClient):
+    """Cliente cuyo circuito está abierto en la primera consulta de cada radicado"""
+    
+    def __init__(self):
+        super().__init__()
+        self.intentos = {}
+    
+    def consultar_proceso_completo(self, numero_radicacion, paralelo=None):
+        self.intentos[numero_radicacion] = self.intentos.get(numero_radicacion, 0) + 1
+        if self.intentos[numero_radicacion] == 1:
+            raise CircuitoAbiertoError('radicacion', 0)
+        return {'radicado': numero_radicacion}
+
+
+def test_consultar_lote_reencola_con_circuito_abierto():
+    """Los radicados rechazados por el circuito se reintentan tras la pausa en vez de fallar"""
+    radicados = ["11001310300120240000101", "11001310300120240000102"]
+    
+    async def consultar(cliente, **opciones):
+        return [resultado async for resultado in cliente.consultar_lote(radicados, **opciones)]
+    
+    with AsyncRamaJudicialClient(max_concurrencia=2, cliente=ClienteConCaida()) as cliente:
+        resultados = asyncio.run(consultar(cliente))
+    
+    assert sorted(resultados) == [(0, radicados[0], {'radicado': radicados[0]}),
+                                  (1, radicados[1], {'radicado': radicados[1]})]
+    
+    with AsyncRamaJudicialClient(max_concurrencia=2, cliente=ClienteConCaida()) as cliente:
+        resultados = asyncio.run(consultar(cliente, max_pausa_total=0))
+    
+    assert [resultado for _, _, resultado in resultados] == [None, None]
+
+
+class SesionQueRegistraTimeouts(SesionFalsa):
+    """Sesión que además guarda el timeout de cada petición"""
+    
+    def __init__(self, respuestas):
+        super().__init__(respuestas)
+        self.timeouts = []
+    
+    def request(self, method, url, **kwargs):
+        self.timeouts.append(kwargs.get('timeout'))
+        return super().request(method, url, **kwargs)
+
+
+def test_timeouts_separados_y_plazo_por_radicado(monkeypatch):
+    """Conexión y lectura tienen timeouts distintos y el plazo del radicado corta los reintentos"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    monkeypatch.setattr(api_client.APIConfig, 'CONNECT_TIMEOUT', 2)
+    monkeypatch.setattr(api_client.APIConfig, 'REQUEST_TIMEOUT', 30)
+    
+    cliente = RamaJudicialClient(politicas_reintento={'radicacion': RetryPolicy(max_reintentos=3)})
+    cliente.session = SesionQueRegistraTimeouts([crear_respuesta(200, b'{"despacho": "JUZGADO"}')])
+    assert cliente.obtener_detalle_proceso(1).success
+    assert cliente.session.timeouts == [(2, 30)]
+    
+    # Un plazo menor que el backoff impide reintentar y acota el timeout de lectura
+    monkeypatch.setattr(api_client.APIConfig, 'RADICADO_TIME_BUDGET', 3)
+    cliente.session = SesionQueRegistraTimeouts([crear_respuesta(503, headers={'Retry-After': '10'})] * 4)
+    
+    assert cliente.consultar_proceso_completo('11001310300120240000100') is None
+    assert cliente.session.peticiones == 1
+    conexion, lectura = cliente.session.timeouts[0]
+    assert conexion == 2 and lectura <= 3
+    cliente.close()
+
+
+class LimitadorSaturado:
+    """Limitador que hace esperar cada petición un tiempo fijo"""
+    
+    def __init__(self, espera):
+        self.espera = espera
+    
+    def adquirir(self):
+        time.sleep(self.espera)
+        return self.espera
+    
+    def registrar_respuesta(self, status_code, latencia):
+        pass
+    
+    def obtener_estadisticas(self):
+        return {}
+
+
+def test_espera_del_rate_limit_no_consume_el_plazo(monkeypatch):
+    """Con el limitador saturado las peticiones salen con su timeout completo y la consulta termina"""
+    monkeypatch.setattr(api_client.APIConfig, 'RADICADO_TIME_BUDGET', 0.5)
+    monkeypatch.setattr(api_client.APIConfig, 'REQUEST_TIMEOUT', 30)
+    monkeypatch.setattr(api_client.APIConfig, 'ADAPTIVE_READ_TIMEOUT', False)
+    monkeypatch.setattr(api_client.APIConfig, 'MIN_REQUEST_INTERVAL', 0)
+    
+    cliente = RateLimitedClient(limiter=LimitadorSaturado(0.3))
+    cliente.session = SesionQueRegistraTimeouts([
+        crear_respuesta(200, b'{"procesos": [{"idProceso": 1, "esPrivado": false}]}'),
+        crear_respuesta(200, b'{"despacho": "JUZGADO"}'),
+        crear_respuesta(200, b'{"actuaciones": []}'),
+    ])
+    
+    resultado = cliente.consultar_proceso_completo('11001310300120240000100')
+    
+    assert resultado['status'] == 'SUCCESS'
+    assert cliente.plazos_agotados == 0
+    assert all(lectura > 0.4 for _, lectura in cliente.session.timeouts)
+    cliente.close()
+
+
+def test_timeout_de_lectura_crece_si_las_peticiones_agotan_el_timeout(monkeypatch):
+    """Cada ReadTimeout entra en la ventana como muestra y el timeout adaptativo crece"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    monkeypatch.setattr(api_client.APIConfig, 'READ_TIMEOUT_MIN', 1)
+    monkeypatch.setattr(api_client.APIConfig, 'READ_TIMEOUT_P99_FACTOR', 3)
+    monkeypatch.setattr(api_client.APIConfig, 'REQUEST_TIMEOUT', 30)
+    monkeypatch.setattr(api_client.APIConfig, 'ADAPTIVE_READ_TIMEOUT', True)
+    
+    cliente = RamaJudicialClient(politicas_reintento={'detalle': RetryPolicy(max_reintentos=0)})
+    cliente.latencias = LatencyTracker(ventana=20, min_muestras=10)
+    for _ in range(10):
+        cliente.latencias.registrar('detalle', 0.01)
+    cliente.session = SesionQueRegistraTimeouts([requests.exceptions.ReadTimeout()] * 5)
+    
+    for id_proceso in range(5):
+        assert not cliente.obtener_detalle_proceso(id_proceso).success
+    assert [lectura for _, lectura in cliente.session.timeouts] == [1, 3, 9, 27, 30]
+    cliente.close()
+
+
+class SesionConColaLenta(SesionFalsa):
+    """Sesión cuya primera petición queda colgada hasta que se libera"""
+    
+    def __init__(self):
+        super().__init__([])
+        self.liberar = threading.Event()
+        self._lock = threading.Lock()
+    
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.peticiones += 1
+            primera = self.peticiones == 1
+        if primera:
+            self.liberar.wait(5)
+            return crear_respuesta(200, b'{"despacho": "LENTO"}')
+        return crear_respuesta(200, b'{"despacho": "RAPIDO"}')
+
+
+def test_cobertura_usa_la_primera_respuesta_y_respeta_presupuesto(monkeypatch):
+    """Una petición más lenta que el p95 se duplica y gana la copia, dentro del presupuesto"""
+    monkeypatch.setattr(api_client.APIConfig, 'HEDGE_BUDGET_PERCENT', 100)
+    cliente = RamaJudicialClient(cobertura=True)
+    for _ in range(cliente.latencias.min_muestras):
+        cliente.latencias.registrar('detalle', 0.01)
+    cliente.session = SesionConColaLenta()
+    
+    inicio = time.monotonic()
+    response = cliente.obtener_detalle_proceso(1)
+    assert time.monotonic() - inicio < 2
+    assert response.data == {'despacho': 'RAPIDO'}
+    assert cliente.session.peticiones == 2
+    assert cliente.obtener_estadisticas()['coberturas'] == {
+        'peticiones_cubribles': 1, 'coberturas_enviadas': 1, 'coberturas_ganadoras': 1
+    }
+    cliente.session.liberar.set()
+    
+    # Sin presupuesto no se envían copias
+    monkeypatch.setattr(api_client.APIConfig, 'HEDGE_BUDGET_PERCENT', 0)
+    cliente.session = SesionConColaLenta()
+    cliente.session.liberar.set()
+    assert cliente.obtener_detalle_proceso(2).data == {'despacho': 'LENTO'}
+    assert cliente.session.peticiones == 1
+    cliente.close()
+
+
+def test_cobertura_no_cuenta_la_espera_del_turno(monkeypatch):
+    """Una original que espera al limitador no dispara copias, y su pool crece con la concurrencia"""
+    monkeypatch.setattr(api_client.APIConfig, 'HEDGE_BUDGET_PERCENT', 100)
+    monkeypatch.setattr(api_client.APIConfig, 'MIN_REQUEST_INTERVAL', 0)
+    cliente = RateLimitedClient(limiter=LimitadorSaturado(0.2), cobertura=True)
+    for _ in range(cliente.latencias.min_muestras):
+        cliente.latencias.registrar('detalle', 0.01)
+    cliente.session = SesionFalsa([crear_respuesta(200, b'{"despacho": "JUZGADO"}')] * 3)
+    
+    for id_proceso in range(3):
+        assert cliente.obtener_detalle_proceso(id_proceso).success
+    assert cliente.session.peticiones == 3
+    assert cliente.obtener_estadisticas()['coberturas']['coberturas_enviadas'] == 0
+    
+    cliente.close()
+    
+    cliente = RamaJudicialClient(cobertura=True)
+    cliente.limitar_peticiones_en_vuelo(20)
+    assert cliente._obtener_pool_originales()._max_workers >= 20
+    cliente.close()
 
-def test_api_client_example():
-    """Test de ejemplo"""
-    assert True, "Test de ejemplo - completar implementación"
 
-# TODO: Agregar más tests específicos
+def test_fallo_transitorio_de_la_consulta_completa(monkeypatch):
+    """Un 5xx agotado marca el fallo como transitorio; un 400 no"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    cliente = RamaJudicialClient(politicas_reintento={'radicacion': RetryPolicy(max_reintentos=1)})
+    
+    cliente.session = SesionFalsa([crear_respuesta(503)] * 2)
+    assert cliente.consultar_proceso_completo("11001310300120230012300") is None
+    assert cliente.fallo_transitorio()
+    
+    cliente.session = SesionFalsa([crear_respuesta(400)])
+    assert cliente.consultar_proceso_completo("11001310300120230012300") is None
+    assert not cliente.fallo_transitorio()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo circuit_breaker
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+import requests
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import api_client
+from api_client import APIResponse, CircuitoAbiertoError, RamaJudicialClient
+from circuit_breaker import CircuitBreaker
+from retry import RetryPolicy
+
+
+class RelojFalso:
+    """Reloj controlable para probar el enfriamiento"""
+    
+    def __init__(self):
+        self.ahora = 0.0
+    
+    def __call__(self) -> float:
+        return self.ahora
+
+
+CAIDA = APIResponse(success=False, error="Timeout en la petición", transitorio=True)
+OK = APIResponse(success=True, data={}, status_code=200)
+
+
+def test_abre_tras_umbral_y_cierra_con_prueba_exitosa():
+    """Cerrado -> abierto tras N fallos -> semiabierto tras el enfriamiento -> cerrado"""
+    reloj = RelojFalso()
+    circuito = CircuitBreaker('detalle', umbral_fallos=3, enfriamiento=60, reloj=reloj)
+    
+    for _ in range(3):
+        assert circuito.permitir()
+        circuito.registrar_resultado(CAIDA)
+    
+    assert circuito.estado == CircuitBreaker.ABIERTO
+    assert not circuito.permitir()
+    assert circuito.segundos_para_reintentar() == 60
+    
+    reloj.ahora += 60
+    assert circuito.permitir()
+    assert circuito.estado == CircuitBreaker.SEMIABIERTO
+    assert not circuito.permitir()  # Solo una petición de prueba
+    
+    circuito.registrar_resultado(OK)
+    assert circuito.estado == CircuitBreaker.CERRADO
+    assert circuito.obtener_estadisticas() == {'estado': 'cerrado', 'aperturas': 1, 'rechazadas': 2}
+
+
+def test_prueba_fallida_reabre_y_404_o_429_no_cuentan():
+    """Una prueba fallida reabre; respuestas del servidor (404, 429) no abren el circuito"""
+    reloj = RelojFalso()
+    circuito = CircuitBreaker('detalle', umbral_fallos=2, enfriamiento=10, reloj=reloj)
+    
+    for _ in range(5):
+        circuito.registrar_resultado(APIResponse(success=False, status_code=404))
+        circuito.registrar_resultado(APIResponse(success=False, status_code=429, transitorio=True))
+    assert circuito.estado == CircuitBreaker.CERRADO
+    
+    circuito.registrar_resultado(CAIDA)
+    circuito.registrar_resultado(CAIDA)
+    reloj.ahora += 10
+    assert circuito.permitir()
+    circuito.registrar_resultado(CAIDA)
+    assert circuito.estado == CircuitBreaker.ABIERTO
+    assert circuito.segundos_para_reintentar() == 10
+
+
+def test_cliente_deja_de_enviar_con_circuito_abierto(monkeypatch):
+    """Con el circuito abierto el cliente lanza CircuitoAbiertoError sin tocar la red"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    peticiones = []
+    
+    def caida(*args, **kwargs):
+        peticiones.append(1)
+        raise requests.exceptions.ConnectionError()
+    
+    cliente = RamaJudicialClient(politicas_reintento={'detalle': RetryPolicy(max_reintentos=10)})
+    cliente.circuitos['detalle'] = CircuitBreaker('detalle', umbral_fallos=3, enfriamiento=60)
+    monkeypatch.setattr(cliente.session, 'request', caida)
+    
+    with pytest.raises(CircuitoAbiertoError) as error:
+        cliente.obtener_detalle_proceso(1)
+    
+    assert len(peticiones) == 3
+    assert error.value.endpoint == 'detalle'
+    assert cliente.obtener_estadisticas()['circuitos']['detalle']['estado'] == 'abierto'
@@ -11,10 +11,20 @@ from pathlib import Path
 # Agregar src al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-# TODO: Completar tests para data_processor
+from data_processor import ProcesosProcessor
 
-def test_data_processor_example():
-    """Test de ejemplo"""
-    assert True, "Test de ejemplo - completar implementación"
 
-# TODO: Agregar más tests específicos
+def test_proceso_no_encontrado_se_clasifica_y_cuenta():
+    """Un resultado NOT_FOUND se procesa como no encontrado, no como fallido"""
+    processor = ProcesosProcessor()
+    proceso = processor.procesar_datos_proceso({
+        'radicado': '11001310300120240000100', 'es_privado': False, 'proceso_basico': None,
+        'detalle': None, 'actuaciones': None, 'status': 'NOT_FOUND'
+    })
+    processor.estadisticas.incrementar(proceso.status)
+    
+    assert proceso.status == 'NOT_FOUND'
+    assert proceso.radicado == '11001310300120240000100'
+    assert 'NO ENCONTRADO' in processor.formatear_resultado_proceso(proceso)
+    assert processor.estadisticas.no_encontrados == 1
+    assert processor.estadisticas.fallidos == 0
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo fake_server
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import api_client
+from api_client import RamaJudicialClient
+from config import APIConfig
+from fake_server import EscenarioSimulado, ServidorSimulado
+from retry import RetryPolicy
+
+
+RADICADOS = [f"1100131030012024{numero:07d}" for numero in range(40)]
+
+
+@pytest.fixture(autouse=True)
+def sin_pausas(monkeypatch):
+    """Elimina las pausas entre peticiones y los backoffs del cliente"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+
+
+def crear_cliente(servidor: ServidorSimulado, **kwargs) -> RamaJudicialClient:
+    cliente = RamaJudicialClient(**kwargs)
+    cliente.base_url = servidor.base_url
+    return cliente
+
+
+def test_consulta_completa_contra_servidor_simulado():
+    """El cliente recorre radicación, detalle y todas las páginas de actuaciones"""
+    escenario = EscenarioSimulado(actuaciones_promedio=30, actuaciones_por_pagina=10)
+    with ServidorSimulado(escenario) as servidor:
+        cliente = crear_cliente(servidor, todas_las_actuaciones=True)
+        resultado = cliente.consultar_proceso_completo(RADICADOS[0])
+        cliente.close()
+    
+    assert resultado['status'] == 'SUCCESS'
+    assert resultado['id_proceso'] == ServidorSimulado.id_proceso(RADICADOS[0])
+    actuaciones = resultado['actuaciones']['actuaciones']
+    assert len(actuaciones) == actuaciones[0]['cant']
+    assert servidor.peticiones['actuaciones'] == resultado['actuaciones']['paginacion']['cantidadPaginas']
+    fechas = [actuacion['fechaActuacion'] for actuacion in actuaciones]
+    assert fechas == sorted(fechas, reverse=True)
+
+
+def test_proporciones_de_privados_y_no_encontrados_deterministas():
+    """Los radicados privados y no encontrados salen en la proporción pedida y siempre los mismos"""
+    escenario = EscenarioSimulado(proporcion_privados=0.3, proporcion_no_encontrados=0.2)
+    with ServidorSimulado(escenario) as servidor:
+        cliente = crear_cliente(servidor)
+        estados = [cliente.consultar_proceso_completo(radicado)['status'] for radicado in RADICADOS]
+        repetidos = [cliente.consultar_proceso_completo(radicado)['status'] for radicado in RADICADOS]
+        cliente.close()
+    
+    assert estados == repetidos
+    assert 0 < estados.count('NOT_FOUND') < len(RADICADOS) / 2
+    assert 0 < estados.count('PRIVATE') < len(RADICADOS) / 2
+
+
+def test_errores_inyectados_se_reintentan():
+    """Los 429 y 500 inyectados se recuperan con la política de reintentos"""
+    escenario = EscenarioSimulado(tasa_429=0.2, tasa_500=0.2, semilla=7)
+    politicas = {endpoint: RetryPolicy(max_reintentos=10) for endpoint in
+                 (APIConfig.Endpoint.RADICACION, APIConfig.Endpoint.DETALLE, APIConfig.Endpoint.ACTUACIONES)}
+    
+    with ServidorSimulado(escenario) as servidor:
+        cliente = crear_cliente(servidor, politicas_reintento=politicas)
+        for circuito in cliente.circuitos.values():
+            circuito.umbral_fallos = 1000
+        estados = [cliente.consultar_proceso_completo(radicado)['status'] for radicado in RADICADOS[:10]]
+        cliente.close()
+    
+    assert estados == ['SUCCESS'] * 10
+    assert servidor.errores_inyectados > 0
+    assert cliente.reintentos_realizados == servidor.errores_inyectados
+
+
+def test_respuestas_grabadas_tienen_prioridad(tmp_path):
+    """Una ruta grabada se sirve tal cual en lugar de los datos sintéticos"""
+    grabaciones = tmp_path / "grabaciones.json"
+    grabaciones.write_text('{"/Proceso/Detalle/5": {"despacho": "GRABADO"}}', encoding='utf-8')
+    
+    with ServidorSimulado(EscenarioSimulado.cargar_grabaciones(grabaciones)) as servidor:
+        cliente = crear_cliente(servidor)
+        assert cliente.obtener_detalle_proceso(5).data == {'despacho': 'GRABADO'}
+        assert cliente.obtener_detalle_proceso(6).data['idRegProceso'] == 6
+        cliente.close()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo json_decoder
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+import requests
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import json_decoder
+from api_client import RamaJudicialClient
+from data_processor import ProcesosProcessor
+from json_decoder import crear_decodificador, decodificar_json, proyectar_actuaciones
+
+
+PAGINA_ACTUACIONES = {
+    'actuaciones': [
+        {'idRegActuacion': 2, 'fechaActuacion': '2024-03-01T00:00:00', 'actuacion': 'Auto  admite',
+         'anotacion': 'Se admite la demanda', 'llaveProceso': 'X' * 200, 'conDocumentos': False},
+        {'idRegActuacion': 1, 'fechaActuacion': '2024-01-01T00:00:00', 'actuacion': 'Radicación',
+         'anotacion': '', 'cant': 1},
+    ],
+    'paginacion': {'cantidadRegistros': 2, 'cantidadPaginas': 1}
+}
+
+
+def test_decodificador_segun_configuracion(monkeypatch):
+    """auto usa orjson solo si está instalado y json siempre usa la biblioteca estándar"""
+    assert crear_decodificador("json") is decodificar_json
+    
+    monkeypatch.setattr(json_decoder, 'orjson', None)
+    assert crear_decodificador("auto") is decodificar_json
+    assert crear_decodificador("orjson") is decodificar_json
+    
+    with pytest.raises(ValueError):
+        crear_decodificador("simdjson")
+
+
+def test_decodificadores_equivalentes():
+    """Ambos decodificadores devuelven lo mismo y fallan con JSONDecodeError"""
+    contenido = json.dumps(PAGINA_ACTUACIONES, ensure_ascii=False).encode('utf-8')
+    assert crear_decodificador("auto")(contenido) == decodificar_json(contenido) == PAGINA_ACTUACIONES
+    
+    with pytest.raises(json.JSONDecodeError):
+        crear_decodificador("auto")(b'<html>')
+
+
+def test_proyeccion_conserva_lo_que_usa_el_procesamiento():
+    """La proyección quita campos sin cambiar el resultado procesado"""
+    proyectado = proyectar_actuaciones(PAGINA_ACTUACIONES)
+    
+    assert set(proyectado['actuaciones'][0]) == {'idRegActuacion', 'fechaActuacion', 'actuacion', 'anotacion'}
+    assert proyectado['paginacion'] == PAGINA_ACTUACIONES['paginacion']
+    assert proyectar_actuaciones({'procesos': []}) == {'procesos': []}
+    
+    procesador = ProcesosProcessor()
+    for extraer in (procesador.extraer_ultima_actuacion, procesador.extraer_anotaciones):
+        assert extraer(proyectado) == extraer(PAGINA_ACTUACIONES)
+
+
+class SesionActuaciones:
+    """Sesión que devuelve siempre la misma página de actuaciones"""
+    
+    def request(self, method, url, **kwargs):
+        respuesta = requests.Response()
+        respuesta.status_code = 200
+        respuesta._content = json.dumps(PAGINA_ACTUACIONES).encode('utf-8')
+        return respuesta
+    
+    def close(self):
+        pass
+
+
+def test_cliente_proyecta_solo_actuaciones():
+    """El cliente proyecta las actuaciones y deja intactos los demás endpoints"""
+    cliente = RamaJudicialClient()
+    cliente.session = SesionActuaciones()
+    cliente.proyectar_respuestas = True
+    
+    assert 'llaveProceso' not in cliente.obtener_actuaciones_proceso(1).data['actuaciones'][0]
+    assert 'llaveProceso' in cliente.obtener_detalle_proceso(1).data['actuaciones'][0]
+    cliente.close()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo latency
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import APIConfig
+from latency import LatencyTracker
+
+
+def test_percentiles_requieren_muestras_minimas():
+    """Sin suficientes muestras no hay percentil y el timeout es el máximo"""
+    latencias = LatencyTracker(ventana=100, min_muestras=10)
+    for _ in range(9):
+        latencias.registrar('detalle', 0.5)
+    
+    assert latencias.percentil('detalle', 99) is None
+    assert latencias.timeout_lectura('detalle') == APIConfig.REQUEST_TIMEOUT
+    assert latencias.timeout_lectura(None) == APIConfig.REQUEST_TIMEOUT
+
+
+def test_timeout_lectura_sigue_el_p99_con_limites(monkeypatch):
+    """El timeout es factor × p99, acotado entre el mínimo y el máximo"""
+    monkeypatch.setattr(APIConfig, 'READ_TIMEOUT_P99_FACTOR', 3)
+    monkeypatch.setattr(APIConfig, 'READ_TIMEOUT_MIN', 5)
+    monkeypatch.setattr(APIConfig, 'REQUEST_TIMEOUT', 30)
+    latencias = LatencyTracker(ventana=100, min_muestras=10)
+    
+    for segundos in [1.0] * 98 + [4.0, 4.0]:
+        latencias.registrar('detalle', segundos)
+    assert latencias.percentil('detalle', 50) == 1.0
+    assert latencias.percentil('detalle', 99) == 4.0
+    assert latencias.timeout_lectura('detalle') == 12.0
+    
+    for _ in range(100):
+        latencias.registrar('radicacion', 0.2)
+        latencias.registrar('actuaciones', 20.0)
+    assert latencias.timeout_lectura('radicacion') == 5
+    assert latencias.timeout_lectura('actuaciones') == 30
+    assert set(latencias.obtener_estadisticas()) == {'detalle', 'radicacion', 'actuaciones'}
+
+
+def test_ventana_descarta_muestras_antiguas():
+    """Solo cuentan las últimas latencias de la ventana"""
+    latencias = LatencyTracker(ventana=10, min_muestras=5)
+    for _ in range(10):
+        latencias.registrar('detalle', 9.0)
+    for _ in range(10):
+        latencias.registrar('detalle', 0.1)
+    
+    assert latencias.percentil('detalle', 99) == 0.1
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo pipeline
+"""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_processor import EstadisticasProcesamiento, ProcesoInfo
+from file_manager import EscritorExcel
+from main import SalidaOrdenada
+from pipeline import Etapa, Pipeline, Reintento
+
+
+def test_resultados_en_orden_de_entrada():
+    """Con varios hilos que terminan desordenados el sumidero recibe el orden de la entrada"""
+    def lenta(valor):
+        time.sleep(random.random() * 0.005)
+        return valor * 2
+    
+    recibidos = []
+    pipeline = Pipeline([Etapa("doble", lenta, 8), Etapa("texto", str, 2)], tamano_cola=4)
+    
+    assert pipeline.ejecutar(range(200), recibidos.append) is True
+    assert recibidos == [str(valor * 2) for valor in range(200)]
+    assert pipeline.procesados == {"doble": 200, "texto": 200}
+
+
+def test_contrapresion_limita_elementos_en_vuelo():
+    """La lectura se detiene mientras el sumidero no consume"""
+    leidos = []
+    
+    def entradas():
+        for valor in range(300):
+            leidos.append(valor)
+            yield valor
+    
+    def sumidero(valor):
+        time.sleep(0.001)
+        assert len(leidos) - valor <= pipeline.max_en_vuelo + 1
+    
+    pipeline = Pipeline([Etapa("identidad", lambda valor: valor, 4)], tamano_cola=2)
+    assert pipeline.ejecutar(entradas(), sumidero) is True
+    assert len(leidos) == 300
+
+
+def test_error_en_etapa_cancela_y_se_propaga():
+    """La primera excepción de una etapa detiene el pipeline y sale de ejecutar"""
+    def fallar_en_50(valor):
+        if valor == 50:
+            raise RuntimeError("fallo")
+        return valor
+    
+    recibidos = []
+    pipeline = Pipeline([Etapa("falla", fallar_en_50, 3)], tamano_cola=2)
+    
+    with pytest.raises(RuntimeError):
+        pipeline.ejecutar(range(10000), recibidos.append)
+    assert pipeline.cancelado.is_set()
+    assert 50 not in recibidos
+    assert recibidos == sorted(recibidos)
+
+
+def test_cancelar_entrega_lo_terminado():
+    """Cancelar desde otro hilo corta la entrada y devuelve False"""
+    recibidos = []
+    pipeline = Pipeline([Etapa("lenta", lambda valor: time.sleep(0.001) or valor, 2)], tamano_cola=2)
+    threading.Timer(0.05, pipeline.cancelar).start()
+    
+    assert pipeline.ejecutar(range(100000), recibidos.append) is False
+    assert 0 < len(recibidos) < 100000
+    assert recibidos == sorted(recibidos)
+
+
+def test_reintento_diferido_no_bloquea_la_etapa():
+    """Un elemento diferido vuelve a la etapa más tarde y conserva su lugar en la salida"""
+    intentos = {}
+    
+    def consulta(entrada):
+        valor, intento = entrada if isinstance(entrada, tuple) else (entrada, 1)
+        intentos[valor] = intento
+        if valor == 3 and intento < 3:
+            return Reintento((valor, intento + 1), 0.05)
+        return valor
+    
+    recibidos = []
+    pipeline = Pipeline([Etapa("consulta", consulta, 1)], tamano_cola=2)
+    inicio = time.monotonic()
+    
+    assert pipeline.ejecutar(range(10), recibidos.append) is True
+    assert time.monotonic() - inicio >= 0.1
+    assert recibidos == list(range(10))
+    assert intentos[3] == 3
+    assert pipeline.reintentos == {"consulta": 2}
+    assert pipeline.procesados == {"consulta": 10}
+
+
+def test_reintento_diferido_no_detiene_la_entrega_sin_orden():
+    """Sin orden, los demás resultados pasan aunque superen max_en_vuelo"""
+    demas_entregados = threading.Event()
+    
+    def consulta(entrada):
+        valor, intento = entrada if isinstance(entrada, tuple) else (entrada, 1)
+        if valor == 0:
+            if intento == 1:
+                return Reintento((valor, 2), 0.01)
+            # Con entrega ordenada los demás esperarían a este y el evento no llegaría
+            demas_entregados.wait(5)
+        return valor
+    
+    recibidos = []
+    
+    def sumidero(valor):
+        recibidos.append(valor)
+        if len(recibidos) == 9:
+            demas_entregados.set()
+    
+    pipeline = Pipeline([Etapa("consulta", consulta, 2)], tamano_cola=1, max_en_vuelo=2, ordenado=False)
+    
+    assert pipeline.ejecutar(range(10), sumidero) is True
+    assert sorted(recibidos[:9]) == list(range(1, 10)) and recibidos[9] == 0
+    assert pipeline.reintentos == {"consulta": 1}
+
+
+def test_etapa_sin_trabajadores_no_es_valida():
+    with pytest.raises(ValueError):
+        Pipeline([Etapa("vacia", str, 0)])
+
+
+def test_salida_ordenada_copia_repetidos(tmp_path):
+    """Cada fila de la entrada recibe su resultado, incluidos los repetidos, llegue en el orden que llegue"""
+    from openpyxl import load_workbook
+    
+    estadisticas = EstadisticasProcesamiento()
+    salida = SalidaOrdenada(["A", "B", "A", "C", "B"], EscritorExcel(tmp_path / "salida.xlsx"), estadisticas)
+    salida.agregar(ProcesoInfo(radicado="C", status="FAILED"))
+    salida.agregar(ProcesoInfo(radicado="A", status="SUCCESS", departamento="ANTIOQUIA"))
+    salida.agregar(ProcesoInfo(radicado="B", status="PRIVATE"))
+    assert salida.filas == 0
+    ruta = salida.cerrar()
+    
+    filas = list(load_workbook(ruta).active.iter_rows(min_row=2, values_only=True))
+    assert [(fila[0], fila[1], fila[-1]) for fila in filas] == [
+        (1, "A", "SUCCESS"), (2, "B", "PRIVATE"), (3, "A", "SUCCESS"), (4, "C", "FAILED"), (5, "B", "PRIVATE")
+    ]
+    assert (estadisticas.exitosos, estadisticas.privados, estadisticas.fallidos) == (2, 2, 1)
+    assert salida.departamentos == {"ANTIOQUIA": 2, "Sin departamento": 3}
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo priority
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from data_processor import ProcesoInfo
+from priority import PriorizadorRadicados
+from run_journal import RunJournal, ultimo_journal
+from state_store import ProcessStateStore
+
+DIA = 24 * 60 * 60
+
+
+def resultado_con_actuaciones(fechas):
+    return {'id_proceso': 1, 'status': 'SUCCESS',
+            'actuaciones': {'actuaciones': [{'fechaActuacion': f"{fecha}T00:00:00"} for fecha in fechas]}}
+
+
+def test_orden_por_fallidos_prioridad_y_actuaciones_esperadas(tmp_path):
+    """Fallidos, prioridad explícita, nunca actualizados y actuaciones esperadas, en ese orden"""
+    ahora = [1_700_000_000.0]
+    estado = ProcessStateStore(tmp_path / "estado.sqlite3", reloj=lambda: ahora[0])
+    # Activo (muchas actuaciones) y quieto (una sola), actualizados el mismo día
+    estado.guardar("activo", resultado_con_actuaciones(["2023-11-01", "2023-11-05", "2023-11-10"]))
+    estado.guardar("quieto", resultado_con_actuaciones(["2020-01-01"]))
+    # Sin actuaciones conocidas pero actualizado hace más tiempo
+    ahora[0] -= 10 * DIA
+    estado.guardar("viejo", {'id_proceso': 2, 'status': 'SUCCESS', 'actuaciones': {'actuaciones': []}})
+    ahora[0] += 20 * DIA
+    
+    priorizador = PriorizadorRadicados(estado, prioridades={"urgente": 5}, fallidos={"fallido"},
+                                       reloj=lambda: ahora[0])
+    ordenados = priorizador.ordenar(["quieto", "viejo", "activo", "nuevo", "urgente", "fallido"])
+    
+    assert ordenados == ["fallido", "urgente", "nuevo", "activo", "quieto", "viejo"]
+    assert priorizador.resumen == {'fallidos_anteriores': 1, 'con_prioridad_explicita': 1,
+                                   'sin_actualizacion_previa': 3}
+
+
+def test_sin_criterios_conserva_el_orden_de_la_entrada():
+    assert PriorizadorRadicados().ordenar(["C", "A", "B"]) == ["C", "A", "B"]
+
+
+def test_fallidos_de_la_ultima_ejecucion(tmp_path):
+    """Cuenta el último resultado de cada radicado y omite la ejecución en curso"""
+    with RunJournal("20240101_000000", tmp_path) as anterior:
+        anterior.abrir(Path("PROCESOS.xlsx"), 2)
+        anterior.registrar(ProcesoInfo(radicado="A", status="FAILED"))
+        anterior.registrar(ProcesoInfo(radicado="B", status="FAILED"))
+        anterior.registrar(ProcesoInfo(radicado="A", status="SUCCESS"))
+    with RunJournal("20240102_000000", tmp_path) as actual:
+        actual.abrir(Path("PROCESOS.xlsx"), 2)
+    
+    journal = ultimo_journal(excluir="20240102_000000", directorio=tmp_path)
+    assert journal.run_id == "20240101_000000"
+    assert journal.fallidos() == {"B"}
+    assert ultimo_journal(directorio=tmp_path / "no_existe") is None
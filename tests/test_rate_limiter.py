@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo rate_limiter
+"""
+
+import pytest
+import sys
+import asyncio
+import threading
+import multiprocessing
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import APIConfig
+from rate_limiter import (SlidingWindowLimiter, TokenBucketLimiter, SharedTokenBucketLimiter,
+                          AIMDController, crear_limitador)
+
+
+class RelojFalso:
+    """Reloj controlable para probar los limitadores sin esperar"""
+    
+    def __init__(self):
+        self.ahora = 1000.0
+    
+    def __call__(self):
+        return self.ahora
+    
+    def dormir(self, segundos):
+        self.ahora += segundos
+
+
+def test_ventana_deslizante_no_permite_rafaga_tras_esperar():
+    """Tras esperar solo se libera el hueco de la petición más antigua"""
+    reloj = RelojFalso()
+    limitador = SlidingWindowLimiter(3, periodo=60, reloj=reloj, dormir=reloj.dormir)
+    
+    esperas = []
+    for _ in range(3):
+        esperas.append(limitador.adquirir())
+        reloj.ahora += 10
+    
+    assert esperas == [0, 0, 0]
+    # Cuarta petición en t=30: espera hasta t=60 (60s tras la primera)
+    assert limitador.adquirir() == pytest.approx(30)
+    # La quinta debe esperar a la segunda (t=10 + 60), no salir en ráfaga
+    assert limitador.reservar() == pytest.approx(10)
+
+
+def test_token_bucket_respeta_burst_y_tasa():
+    """El token bucket permite la ráfaga configurada y luego espacia"""
+    reloj = RelojFalso()
+    limitador = TokenBucketLimiter(30, burst=2, reloj=reloj, dormir=reloj.dormir)
+    
+    assert limitador.reservar() == 0
+    assert limitador.reservar() == 0
+    # 30/min = un token cada 2 segundos; las reservas se encadenan
+    assert limitador.reservar() == pytest.approx(2)
+    assert limitador.reservar() == pytest.approx(4)
+
+
+def test_limitadores_seguros_entre_hilos():
+    """Reservas concurrentes nunca conceden el mismo turno dos veces"""
+    reloj = RelojFalso()
+    limitador = SlidingWindowLimiter(5, periodo=60, reloj=reloj)
+    esperas = []
+    lock = threading.Lock()
+    
+    def reservar():
+        espera = limitador.reservar()
+        with lock:
+            esperas.append(espera)
+    
+    hilos = [threading.Thread(target=reservar) for _ in range(20)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert sorted(esperas) == [0] * 5 + [60] * 5 + [120] * 5 + [180] * 5
+
+
+def test_adquirir_async_no_bloquea():
+    """La variante asíncrona espera con asyncio.sleep"""
+    limitador = TokenBucketLimiter(6000, burst=1)
+    
+    async def adquirir():
+        return await asyncio.gather(*(limitador.adquirir_async() for _ in range(3)))
+    
+    esperas = asyncio.run(adquirir())
+    assert esperas[0] == 0
+    assert max(esperas) > 0
+
+
+def test_crear_limitador_tipo_invalido():
+    """Un tipo desconocido es un error de configuración"""
+    assert isinstance(crear_limitador("token_bucket", 15, 3), TokenBucketLimiter)
+    with pytest.raises(ValueError):
+        crear_limitador("desconocido", 15)
+
+
+def test_limitador_compartido_no_admite_tasa_adaptativa(tmp_path, monkeypatch):
+    """Con el presupuesto compartido la tasa adaptativa es un error de configuración"""
+    monkeypatch.setattr(APIConfig, 'RATE_LIMIT_SHARED_FILE', tmp_path / "rate_limit.json")
+    with pytest.raises(ValueError, match="compartido"):
+        crear_limitador("shared_token_bucket", 15, adaptativo=True)
+    assert isinstance(crear_limitador("shared_token_bucket", 15, adaptativo=False), SharedTokenBucketLimiter)
+    with pytest.raises(ValueError):
+        AIMDController(SharedTokenBucketLimiter(15, ruta_estado=tmp_path / "otro.json"),
+                       tasa_inicial=15, minimo=5, maximo=30)
+
+
+def test_token_bucket_compartido_entre_instancias(tmp_path):
+    """Dos limitadores sobre el mismo archivo consumen del mismo presupuesto"""
+    reloj = RelojFalso()
+    ruta = tmp_path / "rate_limit.json"
+    proceso_a = SharedTokenBucketLimiter(60, burst=2, ruta_estado=ruta, reloj=reloj)
+    proceso_b = SharedTokenBucketLimiter(60, burst=2, ruta_estado=ruta, reloj=reloj)
+    
+    assert proceso_a.reservar() == 0
+    assert proceso_b.reservar() == 0
+    # La ráfaga ya se consumió entre ambos: 60/min = un token por segundo
+    assert proceso_a.reservar() == pytest.approx(1)
+    assert proceso_b.reservar() == pytest.approx(2)
+    
+    reloj.ahora += 10
+    assert proceso_b.reservar() == 0
+
+
+def _reservar_en_proceso(ruta, cantidad, cola):
+    limitador = SharedTokenBucketLimiter(600, burst=1, ruta_estado=ruta)
+    cola.put([limitador.reservar() for _ in range(cantidad)])
+
+
+def test_token_bucket_compartido_entre_procesos(tmp_path):
+    """Procesos reales reservando a la vez nunca obtienen el mismo turno"""
+    ruta = tmp_path / "rate_limit.json"
+    cola = multiprocessing.Queue()
+    procesos = [multiprocessing.Process(target=_reservar_en_proceso, args=(ruta, 5, cola))
+                for _ in range(3)]
+    for proceso in procesos:
+        proceso.start()
+    esperas = sorted(espera for _ in procesos for espera in cola.get(timeout=30))
+    for proceso in procesos:
+        proceso.join()
+    
+    # 600/min = un turno cada 0.1s: 15 reservas ocupan ~1.4s de presupuesto
+    assert len(esperas) == 15
+    assert esperas[0] == 0
+    assert esperas[-1] >= 1.2
+
+
+def crear_controlador(reloj, tasa_inicial=20):
+    bucket = TokenBucketLimiter(tasa_inicial, burst=1, reloj=reloj)
+    return AIMDController(bucket, tasa_inicial=tasa_inicial, minimo=5, maximo=30,
+                          incremento=2, factor_reduccion=0.5, enfriamiento=30, reloj=reloj)
+
+
+def test_aimd_reduce_ante_429_con_enfriamiento():
+    """Un 429 recorta la tasa a la mitad; otro dentro del enfriamiento no"""
+    reloj = RelojFalso()
+    controlador = crear_controlador(reloj)
+    
+    controlador.registrar_respuesta(429, 0.5)
+    assert controlador.tasa == 10
+    assert controlador.limiter.requests_per_minute == 10
+    
+    controlador.registrar_respuesta(503, 0.5)
+    assert controlador.tasa == 10
+    
+    reloj.ahora += 31
+    controlador.registrar_respuesta(None, 30.0)
+    assert controlador.tasa == 5
+    reloj.ahora += 31
+    controlador.registrar_respuesta(429, 0.5)
+    assert controlador.tasa == 5  # Piso
+
+
+def test_aimd_aumenta_tras_respuestas_sanas():
+    """Un minuto de respuestas sanas suma el incremento hasta el techo"""
+    reloj = RelojFalso()
+    controlador = crear_controlador(reloj, tasa_inicial=28)
+    
+    for _ in range(28):
+        controlador.registrar_respuesta(200, 0.5)
+    assert controlador.tasa == 30
+    
+    for _ in range(100):
+        controlador.registrar_respuesta(200, 0.5)
+    assert controlador.tasa == 30
+    
+    estadisticas = controlador.obtener_estadisticas()
+    assert estadisticas['aumentos'] == 1
+    assert estadisticas['decisiones'][-1]['motivo'] == "respuestas_sanas"
+
+
+def test_aimd_reduce_si_la_latencia_crece():
+    """Una latencia sostenida muy superior a la línea base cuenta como congestión"""
+    reloj = RelojFalso()
+    controlador = crear_controlador(reloj)
+    
+    for _ in range(15):
+        controlador.registrar_respuesta(200, 0.5)
+    for _ in range(5):
+        controlador.registrar_respuesta(200, 5.0)
+    
+    assert controlador.reducciones == 1
+    assert controlador.historial[-1]['motivo'] == "latencia"
+
+
+def test_ventana_deslizante_ajusta_tasa():
+    """La ventana deslizante cambia su capacidad al ajustar la tasa"""
+    reloj = RelojFalso()
+    limitador = SlidingWindowLimiter(4, periodo=60, reloj=reloj)
+    for _ in range(4):
+        limitador.reservar()
+    
+    limitador.ajustar_tasa(2)
+    assert limitador.max_peticiones == 2
+    assert limitador.reservar() == pytest.approx(60)
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo response_cache
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+import requests
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import api_client
+from api_client import RamaJudicialClient
+from config import CacheConfig, FileConfig, StateConfig, load_env_config, load_ini_config
+from response_cache import BloomFilter, ResponseCache
+
+
+class RelojFalso:
+    """Reloj controlable para probar expiraciones"""
+    
+    def __init__(self, inicio: float = 1000.0):
+        self.ahora = inicio
+    
+    def __call__(self) -> float:
+        return self.ahora
+
+
+class SesionContadora:
+    """Sesión que responde siempre 200 y cuenta las peticiones"""
+    
+    def __init__(self):
+        self.peticiones = 0
+    
+    def request(self, method, url, **kwargs):
+        self.peticiones += 1
+        respuesta = requests.Response()
+        respuesta.status_code = 200
+        respuesta._content = b'{"despacho": "JUZGADO"}'
+        return respuesta
+    
+    def close(self):
+        pass
+
+
+def test_clave_normaliza_orden_de_parametros():
+    """Los mismos parámetros en distinto orden generan la misma clave"""
+    clave_a = ResponseCache.generar_clave('get', 'http://api/x', {'a': 1, 'b': 'dos'})
+    clave_b = ResponseCache.generar_clave('GET', 'http://api/x', {'b': 'dos', 'a': '1'})
+    
+    assert clave_a == clave_b
+    assert clave_a != ResponseCache.generar_clave('GET', 'http://api/x', {'a': 2, 'b': 'dos'})
+
+
+def test_ttl_por_endpoint(tmp_path):
+    """Cada endpoint expira según su TTL y los endpoints sin TTL no se guardan"""
+    reloj = RelojFalso()
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttls={'detalle': 100, 'actuaciones': 10, 'otro': 0},
+                          reloj=reloj)
+    
+    cache.guardar('d', 'detalle', {'x': 1})
+    cache.guardar('a', 'actuaciones', {'x': 2})
+    cache.guardar('o', 'otro', {'x': 3})
+    
+    reloj.ahora += 50
+    assert cache.obtener('d') == {'x': 1}
+    assert cache.obtener('a') is None
+    assert cache.obtener('o') is None
+    
+    estadisticas = cache.obtener_estadisticas()
+    assert estadisticas['aciertos'] == 1
+    assert estadisticas['fallos'] == 2
+    assert estadisticas['escrituras'] == 2
+
+
+def test_expulsion_lru_por_tamano(tmp_path):
+    """Al superar el tamaño se expulsan las entradas menos usadas"""
+    reloj = RelojFalso()
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_entradas=3, ttls={'detalle': 1000}, reloj=reloj)
+    
+    for clave in ('a', 'b', 'c'):
+        reloj.ahora += 1
+        cache.guardar(clave, 'detalle', {'clave': clave})
+    
+    reloj.ahora += 1
+    cache.obtener('a')
+    reloj.ahora += 1
+    cache.guardar('d', 'detalle', {'clave': 'd'})
+    
+    assert cache.obtener('b') is None
+    assert cache.obtener('a') == {'clave': 'a'}
+    assert cache.obtener('d') == {'clave': 'd'}
+    assert cache.obtener_estadisticas()['expulsiones'] == 1
+
+
+def test_persiste_entre_instancias(tmp_path):
+    """Una ejecución posterior reutiliza lo guardado por la anterior"""
+    ruta = tmp_path / "cache.sqlite3"
+    cache = ResponseCache(ruta, ttls={'detalle': 1000})
+    cache.guardar('d', 'detalle', {'x': 1})
+    cache.close()
+    
+    assert ResponseCache(ruta).obtener('d') == {'x': 1}
+
+
+def test_cliente_sirve_desde_cache_y_modos(tmp_path):
+    """El cliente evita la red con caché; --refresh la ignora y --cache-only no sale a la red"""
+    ruta = tmp_path / "cache.sqlite3"
+    
+    cliente = RamaJudicialClient(cache=ResponseCache(ruta))
+    cliente.session = SesionContadora()
+    assert cliente.obtener_detalle_proceso(1).success
+    response = cliente.obtener_detalle_proceso(1)
+    assert response.desde_cache and response.data == {'despacho': 'JUZGADO'}
+    assert cliente.session.peticiones == 1
+    assert cliente.obtener_estadisticas()['cache']['aciertos'] == 1
+    cliente.close()
+    
+    cliente = RamaJudicialClient(cache=ResponseCache(ruta, modo=CacheConfig.Modo.REFRESCAR))
+    cliente.session = SesionContadora()
+    assert not cliente.obtener_detalle_proceso(1).desde_cache
+    assert cliente.session.peticiones == 1
+    cliente.close()
+    
+    cliente = RamaJudicialClient(cache=ResponseCache(ruta, modo=CacheConfig.Modo.SOLO_CACHE))
+    cliente.session = SesionContadora()
+    assert cliente.obtener_detalle_proceso(1).desde_cache
+    assert not cliente.obtener_detalle_proceso(2).success
+    assert cliente.session.peticiones == 0
+    cliente.close()
+
+
+def test_cache_negativa_con_ttl_y_bloom(tmp_path):
+    """Los no encontrados se recuerdan durante su TTL, también tras reabrir con filtro de Bloom"""
+    ruta = tmp_path / "cache.sqlite3"
+    reloj = RelojFalso()
+    
+    cache = ResponseCache(ruta, ttl_negativo=100, reloj=reloj)
+    cache.registrar_no_encontrado('999')
+    assert cache.es_no_encontrado('999')
+    assert not cache.es_no_encontrado('123')
+    cache.close()
+    
+    cache = ResponseCache(ruta, ttl_negativo=100, usar_bloom=True, reloj=reloj)
+    assert cache.es_no_encontrado('999')
+    assert cache.obtener_estadisticas()['no_encontrados_evitados'] == 1
+    
+    reloj.ahora += 101
+    assert not cache.es_no_encontrado('999')
+    assert not ResponseCache(ruta, ttl_negativo=100, modo=CacheConfig.Modo.REFRESCAR).es_no_encontrado('999')
+
+
+def test_bloom_sin_falsos_negativos():
+    """Todo elemento agregado está en el filtro y los ausentes casi nunca"""
+    bloom = BloomFilter(1000, tasa_falsos_positivos=0.01)
+    for numero in range(1000):
+        bloom.agregar(f"radicado-{numero}")
+    
+    assert all(f"radicado-{numero}" in bloom for numero in range(1000))
+    falsos_positivos = sum(f"otro-{numero}" in bloom for numero in range(10000))
+    assert falsos_positivos < 300
+
+
+class SesionSinProcesos(SesionContadora):
+    """Sesión cuya consulta por radicación no devuelve procesos"""
+    
+    def request(self, method, url, **kwargs):
+        self.peticiones += 1
+        respuesta = requests.Response()
+        respuesta.status_code = 200
+        respuesta._content = b'{"procesos": []}'
+        return respuesta
+
+
+def test_cliente_clasifica_no_encontrado_y_lo_omite_despues(tmp_path):
+    """Un radicado sin procesos queda NOT_FOUND y la siguiente ejecución no lo consulta"""
+    ruta = tmp_path / "cache.sqlite3"
+    
+    cliente = RamaJudicialClient(cache=ResponseCache(ruta, ttls={'radicacion': 0}))
+    cliente.session = SesionSinProcesos()
+    resultado = cliente.consultar_proceso_completo('11001310300120240000100')
+    assert resultado['status'] == 'NOT_FOUND'
+    assert cliente.session.peticiones == 1
+    cliente.close()
+    
+    cliente = RamaJudicialClient(cache=ResponseCache(ruta, ttls={'radicacion': 0}))
+    cliente.session = SesionSinProcesos()
+    assert cliente.consultar_proceso_completo('11001310300120240000100')['status'] == 'NOT_FOUND'
+    assert cliente.session.peticiones == 0
+    cliente.close()
+
+
+class SesionPrivada(SesionContadora):
+    """Sesión cuya consulta por radicación devuelve un proceso privado"""
+    
+    def __init__(self, privado: bool = True):
+        super().__init__()
+        self.privado = privado
+    
+    def request(self, method, url, **kwargs):
+        self.peticiones += 1
+        respuesta = requests.Response()
+        respuesta.status_code = 200
+        if self.privado:
+            respuesta._content = b'{"procesos": [{"idProceso": 5, "esPrivado": true, "despacho": "JUZGADO"}]}'
+        else:
+            respuesta._content = b'{"procesos": [{"idProceso": 5, "esPrivado": false}]}'
+        return respuesta
+
+
+def test_privados_se_reutilizan_y_revalidan_al_final(tmp_path, monkeypatch):
+    """Un privado se sirve de la caché y, si su entrada es vieja, se revisa en el carril final"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    ruta = tmp_path / "cache.sqlite3"
+    reloj = RelojFalso()
+    radicado = '11001310300120240000100'
+    
+    def crear_cliente(sesion):
+        cache = ResponseCache(ruta, ttls={'radicacion': 0, 'detalle': 0, 'actuaciones': 0},
+                              ttl_privados=1000, revalidar_privados_despues=100, reloj=reloj)
+        cliente = RamaJudicialClient(cache=cache)
+        cliente.session = sesion
+        return cliente
+    
+    cliente = crear_cliente(SesionPrivada())
+    assert cliente.consultar_proceso_completo(radicado)['status'] == 'PRIVATE'
+    assert cliente.consultar_proceso_completo(radicado)['proceso_basico']['despacho'] == 'JUZGADO'
+    assert cliente.session.peticiones == 1
+    assert list(cliente.revalidar_privados()) == []
+    cliente.close()
+    
+    reloj.ahora += 101
+    cliente = crear_cliente(SesionPrivada(privado=False))
+    assert cliente.consultar_proceso_completo(radicado)['status'] == 'PRIVATE'
+    assert cliente.session.peticiones == 0
+    
+    revalidados = list(cliente.revalidar_privados())
+    assert [radicado_revalidado for radicado_revalidado, _ in revalidados] == [radicado]
+    assert revalidados[0][1]['status'] == 'SUCCESS'
+    assert cliente.cache.obtener_privado(radicado) is None
+    assert cliente.obtener_estadisticas()['cache']['privados_revalidados'] == 1
+    cliente.close()
+
+
+def test_privado_viejo_se_revalida_en_linea(tmp_path, monkeypatch):
+    """Con revalidación en línea el privado viejo se consulta en la misma llamada"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    reloj = RelojFalso()
+    radicado = '11001310300120240000100'
+    
+    def crear_cliente(sesion):
+        cache = ResponseCache(tmp_path / "cache.sqlite3", ttls={'radicacion': 0, 'detalle': 0, 'actuaciones': 0},
+                              ttl_privados=1000, revalidar_privados_despues=100, reloj=reloj)
+        cliente = RamaJudicialClient(cache=cache)
+        cliente.session = sesion
+        cliente.revalidar_privados_en_linea = True
+        return cliente
+    
+    cliente = crear_cliente(SesionPrivada())
+    assert cliente.consultar_proceso_completo(radicado)['status'] == 'PRIVATE'
+    cliente.close()
+    
+    reloj.ahora += 101
+    cliente = crear_cliente(SesionPrivada(privado=False))
+    assert cliente.consultar_proceso_completo(radicado)['status'] == 'SUCCESS'
+    assert list(cliente.revalidar_privados()) == []
+    assert cliente.obtener_estadisticas()['cache']['privados_revalidados'] == 1
+    cliente.close()
+
+
+class SesionCaida(SesionContadora):
+    """Sesión que responde siempre 503"""
+    
+    def request(self, method, url, **kwargs):
+        self.peticiones += 1
+        respuesta = requests.Response()
+        respuesta.status_code = 503
+        return respuesta
+
+
+@pytest.mark.parametrize("en_linea", [True, False])
+def test_revalidacion_fallida_conserva_el_privado(tmp_path, monkeypatch, en_linea):
+    """Si la revalidación falla se devuelve el privado guardado y su entrada sigue en la caché"""
+    monkeypatch.setattr(api_client.time, 'sleep', lambda segundos: None)
+    reloj = RelojFalso()
+    radicado = '11001310300120240000100'
+    
+    def crear_cliente(sesion):
+        cache = ResponseCache(tmp_path / "cache.sqlite3", ttls={'radicacion': 0, 'detalle': 0, 'actuaciones': 0},
+                              ttl_privados=1000, revalidar_privados_despues=100, reloj=reloj)
+        cliente = RamaJudicialClient(cache=cache)
+        cliente.session = sesion
+        cliente.revalidar_privados_en_linea = en_linea
+        return cliente
+    
+    cliente = crear_cliente(SesionPrivada())
+    assert cliente.consultar_proceso_completo(radicado)['status'] == 'PRIVATE'
+    cliente.close()
+    
+    reloj.ahora += 101
+    cliente = crear_cliente(SesionCaida())
+    resultados = [cliente.consultar_proceso_completo(radicado)]
+    resultados += [resultado for _, resultado in cliente.revalidar_privados()]
+    
+    assert [resultado['status'] for resultado in resultados] == ['PRIVATE'] * (1 if en_linea else 2)
+    assert cliente.session.peticiones > 0
+    assert cliente.cache.obtener_privado(radicado) is not None
+    assert not cliente.fallo_transitorio()
+    cliente.close()
+
+
+def test_rutas_relativas_de_la_configuracion_van_a_la_raiz_del_proyecto(tmp_path, monkeypatch):
+    """Las rutas relativas no dependen del directorio actual y configurarlas no activa nada"""
+    for clase, atributo in [(CacheConfig, 'RUTA'), (CacheConfig, 'ENABLED'),
+                            (StateConfig, 'RUTA'), (StateConfig, 'INCREMENTAL')]:
+        monkeypatch.setattr(clase, atributo, getattr(clase, atributo))
+    monkeypatch.setattr(FileConfig, 'PROJECT_ROOT', tmp_path / "proyecto")
+    monkeypatch.chdir(tmp_path)
+    
+    ini = tmp_path / "config.ini"
+    ini.write_text("[CACHE]\nenabled = false\npath = cache/respuestas.sqlite3\n", encoding='utf-8')
+    load_ini_config(ini)
+    assert CacheConfig.RUTA == tmp_path / "proyecto" / "cache" / "respuestas.sqlite3"
+    
+    monkeypatch.setenv('RESPONSE_CACHE_PATH', str(tmp_path / "otra.sqlite3"))
+    monkeypatch.setenv('PROCESS_STATE_PATH', "estado.sqlite3")
+    load_env_config()
+    assert CacheConfig.RUTA == tmp_path / "otra.sqlite3"
+    assert StateConfig.RUTA == tmp_path / "proyecto" / "estado.sqlite3"
+    assert not CacheConfig.ENABLED and not StateConfig.INCREMENTAL
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo retry
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from api_client import APIResponse
+from retry import RetryPolicy, parsear_retry_after, crear_politicas_reintento
+
+
+def test_solo_se_reintentan_fallos_transitorios():
+    """Éxitos y fallos definitivos (404, JSON inválido) no se reintentan"""
+    politica = RetryPolicy(max_reintentos=2)
+    
+    assert not politica.debe_reintentar(APIResponse(success=True), 0)
+    assert not politica.debe_reintentar(APIResponse(success=False, status_code=404), 0)
+    assert politica.debe_reintentar(APIResponse(success=False, status_code=503, transitorio=True), 1)
+    assert not politica.debe_reintentar(APIResponse(success=False, status_code=503, transitorio=True), 2)
+
+
+def test_espera_exponencial_con_tope_y_jitter():
+    """El backoff crece exponencialmente hasta el tope y se escala por el jitter"""
+    politica = RetryPolicy(espera_base=1, espera_maxima=10)
+    
+    assert politica.calcular_espera(0, aleatorio=lambda: 0.999) == pytest.approx(1, abs=0.01)
+    assert politica.calcular_espera(3, aleatorio=lambda: 0.5) == pytest.approx(4)
+    assert politica.calcular_espera(10, aleatorio=lambda: 0.999) == pytest.approx(10, abs=0.01)
+    assert politica.calcular_espera(2, aleatorio=lambda: 0.0) == 0
+
+
+def test_retry_after_tiene_prioridad_con_tope():
+    """Retry-After fija la espera mínima, recortada a max_retry_after"""
+    politica = RetryPolicy(espera_base=1, max_retry_after=60)
+    
+    assert politica.calcular_espera(0, retry_after=20, aleatorio=lambda: 0.5) == 20
+    assert politica.calcular_espera(0, retry_after=600, aleatorio=lambda: 0.5) == 60
+
+
+def test_parsear_retry_after():
+    """Retry-After acepta segundos o fecha HTTP"""
+    assert parsear_retry_after("120") == 120
+    assert parsear_retry_after(None) is None
+    assert parsear_retry_after("mañana") is None
+    
+    ahora = 784111777.0  # Sun, 06 Nov 1994 08:49:37 GMT
+    assert parsear_retry_after("Sun, 06 Nov 1994 08:50:07 GMT", ahora=lambda: ahora) == 30
+
+
+def test_politicas_por_endpoint():
+    """Cada endpoint tiene su política con las sobrescrituras de config"""
+    politicas = crear_politicas_reintento()
+    
+    assert set(politicas) == {'radicacion', 'detalle', 'actuaciones'}
+    assert politicas['actuaciones'].max_reintentos == 2
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo run_journal
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api_client import CircuitoAbiertoError
+from config import FileConfig, JournalConfig, ProcessConfig, StateConfig
+from data_processor import ProcesoInfo
+from run_journal import RunJournal
+
+
+def test_registrar_y_cargar(tmp_path):
+    """Cada resultado se anexa al terminar y gana el último registro de un radicado"""
+    with RunJournal("prueba", tmp_path) as journal:
+        journal.abrir(Path("PROCESOS.xlsx"), 2)
+        journal.registrar(ProcesoInfo(radicado="A", status="FAILED"))
+        journal.registrar(ProcesoInfo(radicado="B", status="PRIVATE", es_privado=True))
+        journal.registrar(ProcesoInfo(radicado="A", status="SUCCESS", juzgado="JUZGADO 1"))
+    
+    journal = RunJournal("prueba", tmp_path)
+    registrados = journal.cargar()
+    assert registrados["A"] == ProcesoInfo(radicado="A", status="SUCCESS", juzgado="JUZGADO 1")
+    assert registrados["B"].es_privado
+    assert journal.cabecera["radicados"] == 2
+
+
+def test_linea_cortada_por_una_caida(tmp_path):
+    """La línea incompleta se ignora y los registros siguientes no se pegan a ella"""
+    with RunJournal("caida", tmp_path) as journal:
+        journal.abrir(Path("PROCESOS.xlsx"), 3)
+        journal.registrar(ProcesoInfo(radicado="A"))
+    with open(journal.ruta, 'a', encoding='utf-8') as archivo:
+        archivo.write('{"tipo": "resultado", "proceso": {"radi')
+    
+    with RunJournal("caida", tmp_path) as journal:
+        journal.abrir(Path("PROCESOS.xlsx"), 3)
+        journal.registrar(ProcesoInfo(radicado="C"))
+    
+    assert set(RunJournal("caida", tmp_path).cargar()) == {"A", "C"}
+
+
+class ClienteFalso:
+    """Cliente API que registra los radicados consultados"""
+    
+    def __init__(self, fallidos=(), transitorios=None, privados=()):
+        self.consultados = []
+        self.fallidos = set(fallidos)
+        self.transitorios = dict(transitorios or {})  # Radicado -> fallos transitorios antes de responder
+        self.privados = set(privados)  # Privados de la caché que el carril final encuentra públicos
+        self._fallo = threading.local()
+    
+    def consultar_proceso_completo(self, radicado):
+        self.consultados.append(radicado)
+        self._fallo.transitorio = self.transitorios.get(radicado, 0) > 0
+        if self._fallo.transitorio:
+            self.transitorios[radicado] -= 1
+            return None
+        if radicado in self.fallidos:
+            return None
+        return {'radicado': radicado, 'status': 'PRIVATE' if radicado in self.privados else 'SUCCESS'}
+    
+    def fallo_transitorio(self):
+        return self._fallo.transitorio
+    
+    def revalidar_privados(self):
+        for radicado in sorted(self.privados):
+            yield radicado, {'radicado': radicado, 'status': 'SUCCESS'}
+
+
+@pytest.fixture
+def orquestador_en(tmp_path, monkeypatch):
+    """Crea orquestadores que escriben en tmp_path con un cliente falso"""
+    from main import ConsultaProcesosOrchestrator
+    
+    monkeypatch.setattr(FileConfig, 'PROJECT_ROOT', tmp_path)
+    monkeypatch.setattr(FileConfig, 'OUTPUT_DIR', tmp_path / "output")
+    monkeypatch.setattr(FileConfig, 'EXCEL_INPUT_FILE', tmp_path / "PROCESOS.xlsx")
+    monkeypatch.setattr(JournalConfig, 'DIRECTORIO', tmp_path / "journal")
+    
+    def crear(cliente, reanudar=None):
+        orquestador = ConsultaProcesosOrchestrator(usar_rate_limiting=False, confirmar=False, reanudar=reanudar)
+        orquestador.api_client = cliente
+        orquestador.processor.procesar_datos_proceso = lambda datos: ProcesoInfo(radicado=datos['radicado'],
+                                                                                status=datos['status'])
+        return orquestador
+    return crear
+
+
+def test_reanudar_solo_consulta_lo_pendiente(orquestador_en, capsys):
+    """Al reanudar se toman del journal los terminados y se reintentan los fallidos"""
+    from openpyxl import load_workbook
+    
+    radicados = ["A", "B", "C", "A"]
+    primera = orquestador_en(ClienteFalso(fallidos={"B"}))
+    assert primera.preparar_journal(radicados)
+    primera.consultar_procesos(radicados[:2])  # la ejecución se corta tras A y B
+    primera.journal.cerrar()
+    
+    segunda_cliente = ClienteFalso()
+    segunda = orquestador_en(segunda_cliente, reanudar=primera.journal.run_id)
+    assert segunda.preparar_journal(radicados)
+    archivo_excel = segunda.consultar_procesos(radicados)
+    segunda.journal.cerrar()
+    
+    assert segunda_cliente.consultados == ["B", "C"]
+    filas = list(load_workbook(archivo_excel).active.iter_rows(min_row=2, values_only=True))
+    assert [(fila[1], fila[-1]) for fila in filas] == [("A", "SUCCESS"), ("B", "SUCCESS"),
+                                                       ("C", "SUCCESS"), ("A", "SUCCESS")]
+    assert segunda.processor.estadisticas.exitosos == 4
+
+
+def test_reanudar_sin_journal(orquestador_en, capsys):
+    """Un run-id desconocido o con forma de ruta es un error claro y no crea archivos"""
+    with RunJournal("anterior", JournalConfig.DIRECTORIO) as journal:
+        journal.abrir(Path("PROCESOS.xlsx"), 1)
+    
+    assert not orquestador_en(ClienteFalso(), reanudar="no_existe").preparar_journal(["A"])
+    assert "Ejecuciones recientes: anterior" in capsys.readouterr().out
+    
+    for run_id in ["../fuera", "/tmp/fuera", "a/b", "..", "a\\b"]:
+        with pytest.raises(ValueError):
+            RunJournal(run_id, JournalConfig.DIRECTORIO)
+        assert not orquestador_en(ClienteFalso(), reanudar=run_id).preparar_journal(["A"])
+        assert "Run-id no válido" in capsys.readouterr().out
+    assert not (FileConfig.PROJECT_ROOT / "fuera.jsonl").exists()
+
+
+def test_reintentos_diferidos_de_fallos_transitorios(orquestador_en, monkeypatch, capsys):
+    """Los fallos transitorios se reintentan hasta el máximo y se cuentan aparte de la primera pasada"""
+    from openpyxl import load_workbook
+    
+    monkeypatch.setattr(ProcessConfig, 'DEFERRED_RETRIES', 2)
+    monkeypatch.setattr(ProcessConfig, 'DEFERRED_RETRY_DELAY', 0.01)
+    cliente = ClienteFalso(fallidos={"D"}, transitorios={"B": 1, "C": 5})
+    orquestador = orquestador_en(cliente)
+    
+    archivo_excel = orquestador.consultar_procesos(["A", "B", "C", "D"])
+    
+    assert sorted(cliente.consultados) == ["A", "B", "B", "C", "C", "C", "D"]
+    filas = list(load_workbook(archivo_excel).active.iter_rows(min_row=2, values_only=True))
+    assert [(fila[1], fila[-1]) for fila in filas] == [("A", "SUCCESS"), ("B", "SUCCESS"),
+                                                       ("C", "FAILED"), ("D", "FAILED")]
+    assert orquestador.reintentos_diferidos == 3
+    assert orquestador.resultado_intentos == {'primera_pasada': 1, 'tras_reintento': 1,
+                                              'fallidos_tras_reintento': 1}
+
+
+def test_priorizar_consulta_en_orden_de_prioridad_y_escribe_en_orden_de_entrada(orquestador_en, monkeypatch):
+    """La prioridad cambia el orden de consulta, no el de las filas del Excel"""
+    from openpyxl import load_workbook
+    
+    monkeypatch.setattr(ProcessConfig, 'PRIORITY_SCHEDULING', True)
+    monkeypatch.setattr(StateConfig, 'RUTA', FileConfig.PROJECT_ROOT / "sin_estado.sqlite3")
+    cliente = ClienteFalso()
+    orquestador = orquestador_en(cliente)
+    orquestador.file_manager.excel_reader.prioridades = {"C": 2, "B": 1}
+    
+    archivo_excel = orquestador.consultar_procesos(["A", "B", "C", "A", "D"])
+    
+    assert cliente.consultados[:2] == ["C", "B"]
+    filas = list(load_workbook(archivo_excel).active.iter_rows(min_row=2, values_only=True))
+    assert [(fila[0], fila[1]) for fila in filas] == [(1, "A"), (2, "B"), (3, "C"), (4, "A"), (5, "D")]
+
+
+def test_privados_revalidados_al_final_reemplazan_su_fila(orquestador_en, capsys):
+    """El carril final de privados corre tras la consulta y su resultado queda en el Excel"""
+    from openpyxl import load_workbook
+    
+    orquestador = orquestador_en(ClienteFalso(privados={"B"}))
+    archivo_excel = orquestador.consultar_procesos(["A", "B", "C", "B"])
+    
+    filas = list(load_workbook(archivo_excel).active.iter_rows(min_row=2, values_only=True))
+    assert [(fila[1], fila[-1]) for fila in filas] == [("A", "SUCCESS"), ("B", "SUCCESS"),
+                                                       ("C", "SUCCESS"), ("B", "SUCCESS")]
+    assert orquestador.processor.estadisticas.privados == 0
+    assert "Privados de la caché revalidados: 1" in capsys.readouterr().out
+
+
+class ClienteCircuitoAbierto:
+    """Cliente API cuyo circuito está siempre abierto; cancela el pipeline al primer rechazo"""
+    
+    def __init__(self):
+        self.orquestador = None
+    
+    def revalidar_privados(self):
+        return iter(())
+    
+    def consultar_proceso_completo(self, radicado):
+        threading.Timer(0.1, self.orquestador._cancelado.set).start()
+        raise CircuitoAbiertoError('radicacion', 600)
+    
+    def fallo_transitorio(self):
+        return False
+
+
+def test_cancelar_durante_la_pausa_por_circuito_abierto(orquestador_en, capsys):
+    """Cancelar el pipeline corta la pausa del circuito en vez de esperarla completa"""
+    cliente = ClienteCircuitoAbierto()
+    orquestador = cliente.orquestador = orquestador_en(cliente)
+    inicio = time.monotonic()
+    
+    assert orquestador.consultar_procesos(["A", "B"]) is None
+    assert time.monotonic() - inicio < 5
+    assert "Consulta interrumpida" in capsys.readouterr().out
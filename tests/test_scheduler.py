@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo scheduler
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rate_limiter import SlidingWindowLimiter
+from scheduler import RequestScheduler
+
+
+class RelojFalso:
+    """Reloj controlable para probar el planificador sin esperar"""
+    
+    def __init__(self):
+        self.ahora = 1000.0
+    
+    def __call__(self):
+        return self.ahora
+    
+    def dormir(self, segundos):
+        self.ahora += segundos
+
+
+def test_piso_de_cortesia_entre_peticiones():
+    """Solo se espera lo que falta para cumplir el intervalo mínimo"""
+    reloj = RelojFalso()
+    planificador = RequestScheduler(intervalo_minimo=2, modo="cortesia", reloj=reloj, dormir=reloj.dormir)
+    
+    assert planificador.esperar_turno() == 0
+    assert planificador.esperar_turno() == 2
+    reloj.ahora += 0.5  # la petición tardó medio segundo
+    assert planificador.esperar_turno() == 1.5
+    reloj.ahora += 10
+    assert planificador.esperar_turno() == 0
+
+
+def test_presupuesto_completo_solo_respeta_el_rate_limit():
+    """Sin piso, las peticiones salen tan rápido como el limitador permite"""
+    reloj = RelojFalso()
+    limitador = SlidingWindowLimiter(3, periodo=60, reloj=reloj, dormir=reloj.dormir)
+    planificador = RequestScheduler(limitador, intervalo_minimo=2, modo="presupuesto_completo",
+                                    reloj=reloj, dormir=reloj.dormir)
+    
+    assert [planificador.esperar_turno() for _ in range(3)] == [0, 0, 0]
+    assert planificador.esperar_turno() == 60
+    assert planificador.obtener_estadisticas()['espera_rate_limit'] == "60.0s"
+
+
+def test_presupuesto_completo_sin_limitador_mantiene_el_piso():
+    planificador = RequestScheduler(intervalo_minimo=2, modo="presupuesto_completo")
+    assert planificador.intervalo_minimo == 2
+
+
+def test_estadisticas_de_espera_frente_a_consulta():
+    reloj = RelojFalso()
+    planificador = RequestScheduler(intervalo_minimo=1, modo="cortesia", reloj=reloj, dormir=reloj.dormir)
+    
+    for _ in range(2):
+        planificador.esperar_turno()
+        planificador.registrar_peticion(1.0)
+    planificador.esperar(2, 'reintento')
+    
+    estadisticas = planificador.obtener_estadisticas()
+    assert estadisticas['peticiones'] == 2
+    assert estadisticas['tiempo_consultando'] == "2.0s"
+    assert estadisticas['tiempo_esperando'] == "3.0s"
+    assert estadisticas['espera_cortesia'] == "1.0s"
+    assert estadisticas['espera_reintento'] == "2.0s"
+    assert estadisticas['porcentaje_espera'] == "60.0%"
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        RequestScheduler(modo="rapido")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo single_flight
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from single_flight import SingleFlight
+
+
+def test_llamadas_simultaneas_comparten_una_ejecucion():
+    """Solo un hilo ejecuta la función; los demás reciben su resultado"""
+    vuelos = SingleFlight()
+    ejecuciones = []
+    resultados = []
+    
+    def lenta():
+        ejecuciones.append(1)
+        time.sleep(0.1)
+        return {'idProceso': 123}
+    
+    def consultar():
+        resultados.append(vuelos.ejecutar('clave', lenta))
+    
+    hilos = [threading.Thread(target=consultar) for _ in range(5)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert len(ejecuciones) == 1
+    assert [resultado for resultado, _ in resultados] == [{'idProceso': 123}] * 5
+    assert sorted(compartido for _, compartido in resultados) == [False] + [True] * 4
+    assert vuelos.compartidas == 4
+
+
+def test_claves_distintas_y_llamadas_sucesivas_no_se_comparten():
+    """Solo se coalescen llamadas con la misma clave que coinciden en el tiempo"""
+    vuelos = SingleFlight()
+    
+    assert vuelos.ejecutar('a', lambda: 1) == (1, False)
+    assert vuelos.ejecutar('a', lambda: 2) == (2, False)
+    assert vuelos.ejecutar('b', lambda: 3) == (3, False)
+    assert vuelos.compartidas == 0
+
+
+def test_error_se_propaga_a_los_que_esperan():
+    """Si la ejecución falla, todos los que esperaban reciben la excepción"""
+    vuelos = SingleFlight()
+    errores = []
+    
+    def falla():
+        time.sleep(0.1)
+        raise RuntimeError("sin conexión")
+    
+    def consultar():
+        try:
+            vuelos.ejecutar('clave', falla)
+        except RuntimeError as e:
+            errores.append(str(e))
+    
+    hilos = [threading.Thread(target=consultar) for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert errores == ["sin conexión"] * 3
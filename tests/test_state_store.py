@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo state_store
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from state_store import ProcessIndex, ProcessStateStore
+
+
+def test_guarda_y_recupera_estado_entre_instancias(tmp_path):
+    """El estado sobrevive entre ejecuciones y expone la fecha de la última actuación"""
+    ruta = tmp_path / "estado.sqlite3"
+    resultado = {
+        'radicado': '11001310300120240000100',
+        'id_proceso': 123,
+        'proceso_basico': {'fechaUltimaActuacion': '2024-01-31T00:00:00'},
+        'detalle': {'despacho': 'JUZGADO 001'},
+        'actuaciones': {'actuaciones': [{'actuacion': 'Auto'}]},
+        'status': 'SUCCESS'
+    }
+    
+    estado = ProcessStateStore(ruta, reloj=lambda: 1000.0)
+    estado.guardar(resultado['radicado'], resultado)
+    estado.close()
+    
+    guardado = ProcessStateStore(ruta).obtener(resultado['radicado'])
+    assert guardado['id_proceso'] == 123
+    assert guardado['fecha_ultima_actuacion'] == '2024-01-31T00:00:00'
+    assert guardado['ultimo_status'] == 'SUCCESS'
+    assert guardado['actualizado_en'] == 1000.0
+    assert guardado['resultado'] == resultado
+
+
+def test_radicado_desconocido_o_eliminado(tmp_path):
+    """Sin estado guardado se devuelve None"""
+    estado = ProcessStateStore(tmp_path / "estado.sqlite3")
+    assert estado.obtener('desconocido') is None
+    
+    estado.guardar('r', {'id_proceso': 1, 'status': 'SUCCESS'})
+    estado.eliminar('r')
+    assert estado.obtener('r') is None
+
+
+def test_indice_persiste_y_vence_para_revalidar(tmp_path):
+    """El índice se recarga en memoria y las entradas viejas se piden revalidar"""
+    ruta = tmp_path / "estado.sqlite3"
+    reloj = [1000.0]
+    
+    indice = ProcessIndex(ruta, revalidar_despues=100, reloj=lambda: reloj[0])
+    indice.guardar('r', 123, {'idProceso': 123, 'departamento': 'BOGOTÁ'})
+    indice.close()
+    
+    indice = ProcessIndex(ruta, revalidar_despues=100, reloj=lambda: reloj[0])
+    assert indice.buscar('r') == {'id_proceso': 123,
+                                  'proceso_basico': {'idProceso': 123, 'departamento': 'BOGOTÁ'}}
+    
+    reloj[0] += 101
+    assert indice.buscar('r') is None
+    
+    indice.invalidar('r')
+    assert ProcessIndex(ruta).buscar('r') is None
+    assert indice.obtener_estadisticas() == {
+        'radicados_indexados': 0, 'aciertos': 1, 'vencidas': 1, 'invalidadas': 1
+    }
+
+
+def test_actividad_y_migracion_de_estado_anterior(tmp_path):
+    """Un estado sin la columna de frecuencia se migra y la frecuencia se calcula al guardar"""
+    import sqlite3
+    
+    ruta = tmp_path / "estado.sqlite3"
+    conexion = sqlite3.connect(str(ruta))
+    conexion.execute("CREATE TABLE estados (radicado TEXT PRIMARY KEY, id_proceso INTEGER, "
+                     "fecha_ultima_actuacion TEXT, resultado TEXT NOT NULL, ultimo_status TEXT, "
+                     "actualizado_en REAL NOT NULL)")
+    conexion.execute("INSERT INTO estados VALUES ('viejo', 1, NULL, '{}', 'SUCCESS', 10.0)")
+    conexion.commit()
+    conexion.close()
+    
+    ahora = [1_700_000_000.0]
+    estado = ProcessStateStore(ruta, reloj=lambda: ahora[0])
+    estado.guardar('nuevo', {'id_proceso': 2, 'status': 'SUCCESS', 'actuaciones': {'actuaciones': [
+        {'fechaActuacion': '2023-09-15T00:00:00'}, {'fechaActuacion': '2023-11-01T00:00:00'}]}})
+    ahora[0] += 100
+    estado.marcar_vigente('viejo')
+    
+    actividad = estado.obtener_actividad(['viejo', 'nuevo', 'desconocido'])
+    assert actividad['viejo'] == (ahora[0], None)
+    assert actividad['nuevo'][1] == pytest.approx(1.0, rel=0.1)
+    assert 'desconocido' not in actividad
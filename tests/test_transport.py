@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests para el módulo transport
+"""
+
+import pytest
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import transport
+from config import APIConfig
+from transport import RequestsTransport, crear_transporte
+
+
+class ManejadorJSON(BaseHTTPRequestHandler):
+    """Responde JSON a GET y vacío a HEAD, con keep-alive"""
+    protocol_version = "HTTP/1.1"
+    
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def do_GET(self):
+        cuerpo = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    """Servidor HTTP local en un puerto libre"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ManejadorJSON)
+    hilo = threading.Thread(target=httpd.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sesion_por_hilo_con_pool_compartido(servidor):
+    """Cada hilo usa su propia sesión, todas sobre el mismo adaptador"""
+    transporte = RequestsTransport(tamano_pool=4)
+    sesiones = []
+    
+    def consultar():
+        assert transporte.request('GET', servidor, timeout=(2, 2)).json() == {'ok': True}
+        sesiones.append(transporte._sesion())
+    
+    hilos = [threading.Thread(target=consultar) for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert len({id(sesion) for sesion in sesiones}) == 3
+    assert len({id(sesion.get_adapter(servidor)) for sesion in sesiones}) == 1
+    
+    transporte.ajustar_pool(8)
+    assert all(sesion.get_adapter(servidor) is transporte._adaptador for sesion in sesiones)
+    transporte.close()
+
+
+def test_precalentar_abre_conexiones(servidor):
+    """El precalentamiento deja conexiones en el pool y tolera servidores caídos"""
+    transporte = RequestsTransport(tamano_pool=4)
+    assert transporte.precalentar(servidor, 3) == 3
+    assert transporte.precalentar("http://127.0.0.1:9", 1) == 0
+    assert transporte.precalentar(servidor, 0) == 0
+    transporte.close()
+
+
+def test_opciones_socket_con_keepalive(monkeypatch):
+    """Las conexiones activan keep-alive TCP salvo que se desactive"""
+    monkeypatch.setattr(APIConfig, 'HTTP_TCP_KEEPALIVE', True)
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in transport._opciones_socket()
+    
+    monkeypatch.setattr(APIConfig, 'HTTP_TCP_KEEPALIVE', False)
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) not in transport._opciones_socket()
+
+
+def test_http2_sin_httpx_usa_requests(monkeypatch):
+    """Si httpx no está instalado se usa el transporte de requests"""
+    monkeypatch.setattr(APIConfig, 'HTTP2', True)
+    monkeypatch.setattr(transport, 'httpx', None)
+    
+    transporte = crear_transporte()
+    assert isinstance(transporte, RequestsTransport)
+    transporte.close()
+
+
+def test_transporte_sin_request_no_se_puede_crear():
+    """Un transporte que no implementa request falla al construirse, no en la primera petición"""
+    class TransporteIncompleto(transport._Transporte):
+        def close(self):
+            pass
+    
+    with pytest.raises(TypeError):
+        TransporteIncompleto()